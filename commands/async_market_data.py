@@ -0,0 +1,165 @@
+import asyncio
+import datetime
+import logging
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+try:
+    import aiohttp
+except ModuleNotFoundError:
+    aiohttp = None
+
+from commands.http_session import (
+    DEFAULT_CONNECT_TIMEOUT_SECONDS,
+    DEFAULT_READ_TIMEOUT_SECONDS,
+    DEFAULT_RETRIES,
+    DEFAULT_RETRY_BACKOFF_SECONDS,
+    RETRY_STATUS_CODES,
+    retry_delay,
+)
+
+logger = logging.getLogger(__name__)
+
+YAHOO_CHART_BASE_URL = "https://query1.finance.yahoo.com"
+DEFAULT_MAX_CONNECTIONS = 32
+KEEPALIVE_SECONDS = 30.0
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+
+def _finite_values(values):
+    return [value for value in values or () if value is not None]
+
+
+def parse_chart_snapshot(result):
+    """Return ``(last_price, previous_close)`` from a daily chart result."""
+    meta = result.get("meta") or {}
+    quote = ((result.get("indicators") or {}).get("quote") or [{}])[0]
+    closes = _finite_values(quote.get("close"))
+
+    last_price = meta.get("regularMarketPrice")
+    if last_price is None and closes:
+        last_price = closes[-1]
+    previous_close = closes[-2] if len(closes) > 1 else meta.get("previousClose")
+    if last_price is None:
+        return None, None
+    return float(last_price), None if previous_close is None else float(previous_close)
+
+
+def parse_chart_closes(result):
+    """Return ``(timestamps, prices)`` like ``close_series_to_lists``; ``(None, None)`` when empty."""
+    meta = result.get("meta") or {}
+    quote = ((result.get("indicators") or {}).get("quote") or [{}])[0]
+    try:
+        tz = ZoneInfo(meta.get("exchangeTimezoneName") or "UTC")
+    except ZoneInfoNotFoundError:
+        tz = datetime.timezone.utc
+
+    timestamps = []
+    prices = []
+    for epoch_seconds, close in zip(result.get("timestamp") or (), quote.get("close") or ()):
+        if close is None:
+            continue
+        timestamps.append(datetime.datetime.fromtimestamp(epoch_seconds, tz))
+        prices.append(float(close))
+    if not prices:
+        return None, None
+    return timestamps, prices
+
+
+class YahooChartClient:
+    """Async client for Yahoo's v8 chart endpoint, for quote paths that need no thread.
+
+    One keep-alive ``aiohttp`` session is created lazily on the running loop.
+    429/5xx responses are retried with the same jittered backoff as the
+    yfinance session; other failures return None so callers fall back the
+    same way they do for the threaded provider.
+    """
+
+    def __init__(
+        self,
+        base_url=YAHOO_CHART_BASE_URL,
+        connect_timeout_seconds=DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        read_timeout_seconds=DEFAULT_READ_TIMEOUT_SECONDS,
+        retries=DEFAULT_RETRIES,
+        backoff_seconds=DEFAULT_RETRY_BACKOFF_SECONDS,
+        max_connections=DEFAULT_MAX_CONNECTIONS,
+    ):
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for the async market data client.")
+        self.base_url = base_url.rstrip("/")
+        self.connect_timeout_seconds = float(connect_timeout_seconds)
+        self.read_timeout_seconds = float(read_timeout_seconds)
+        self.retries = max(0, int(retries))
+        self.backoff_seconds = float(backoff_seconds)
+        self.max_connections = max(1, int(max_connections))
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    keepalive_timeout=KEEPALIVE_SECONDS,
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=self.connect_timeout_seconds + self.read_timeout_seconds,
+                    connect=self.connect_timeout_seconds,
+                    sock_read=self.read_timeout_seconds,
+                ),
+                headers={"User-Agent": _USER_AGENT, "Accept": "application/json"},
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def fetch_chart(self, ticker: str, range_: str, interval: str):
+        """Return the first chart result for ``ticker`` or None."""
+        url = f"{self.base_url}/v8/finance/chart/{ticker}"
+        params = {"range": range_, "interval": interval, "includePrePost": "false"}
+        session = self._get_session()
+
+        for attempt in range(self.retries + 1):
+            delay = None
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status in RETRY_STATUS_CODES and attempt < self.retries:
+                        delay = retry_delay(attempt + 1, self.backoff_seconds, response.headers.get("Retry-After"))
+                    elif response.status != 200:
+                        return None
+                    else:
+                        payload = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                if attempt >= self.retries:
+                    logger.warning("Chart request for %s failed", ticker)
+                    return None
+                delay = retry_delay(attempt + 1, self.backoff_seconds)
+
+            if delay is not None:
+                # Sleep outside the response block so the connection goes back to the pool.
+                await asyncio.sleep(delay)
+                continue
+            results = ((payload or {}).get("chart") or {}).get("result") or []
+            return results[0] if results else None
+        return None
+
+    async def get_price_snapshot(self, ticker: str):
+        result = await self.fetch_chart(ticker, "5d", "1d")
+        if result is None:
+            return None, None
+        return parse_chart_snapshot(result)
+
+    async def get_latest_price(self, ticker: str):
+        last_price, _previous_close = await self.get_price_snapshot(ticker)
+        return last_price
+
+    async def get_price_history(self, ticker: str, period: str = "3mo", interval: str = "1d"):
+        result = await self.fetch_chart(ticker, period, interval)
+        if result is None:
+            return None, None
+        return parse_chart_closes(result)
@@ -0,0 +1,226 @@
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import pandas as pd
+except ModuleNotFoundError:
+    pd = None
+
+from commands.market_providers import OHLC_COLUMNS, slice_period
+
+# Periods ordered by how much history they need; ``ytd`` never exceeds ``1y``.
+PERIOD_ORDER = ("1d", "5d", "1mo", "3mo", "6mo", "ytd", "1y", "2y", "5y", "10y", "max")
+
+# How long stored bars may go without a successful fetch before they are
+# dropped for a full refetch.  Intraday limits follow how far back Yahoo
+# serves each interval, so a delta request past them would be refused.
+MAX_STORED_AGE_SECONDS = {
+    "1m": 7 * 86400,
+    "2m": 60 * 86400,
+    "5m": 60 * 86400,
+    "15m": 60 * 86400,
+    "30m": 60 * 86400,
+    "90m": 60 * 86400,
+    "60m": 730 * 86400,
+    "1h": 730 * 86400,
+}
+DEFAULT_MAX_STORED_AGE_SECONDS = 7 * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL,
+    PRIMARY KEY (ticker, interval, ts)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    period TEXT NOT NULL,
+    tz TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (ticker, interval)
+);
+"""
+
+
+def period_covers(stored_period, requested_period):
+    """Return True when bars fetched for ``stored_period`` include ``requested_period``."""
+    if stored_period not in PERIOD_ORDER or requested_period not in PERIOD_ORDER:
+        return False
+    return PERIOD_ORDER.index(stored_period) >= PERIOD_ORDER.index(requested_period)
+
+
+def max_stored_age(interval):
+    return MAX_STORED_AGE_SECONDS.get(interval, DEFAULT_MAX_STORED_AGE_SECONDS)
+
+
+class BarStore:
+    """SQLite store of OHLCV bars keyed by (ticker, interval).
+
+    Timestamps are stored as UTC epoch seconds alongside the source timezone
+    so reads give back the same exchange-local index the provider returned.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def clear(self):
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM bars")
+            connection.execute("DELETE FROM coverage")
+
+    def _key_lock(self, ticker: str, interval: str):
+        with self._lock:
+            return self._key_locks.setdefault((ticker, interval), threading.Lock())
+
+    def get_coverage(self, ticker: str, interval: str):
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT period, tz, fetched_at FROM coverage WHERE ticker = ? AND interval = ?",
+                (ticker, interval),
+            ).fetchone()
+        return row
+
+    def read(self, ticker: str, interval: str):
+        coverage = self.get_coverage(ticker, interval)
+        if coverage is None:
+            return None
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT ts, open, high, low, close, volume FROM bars "
+                "WHERE ticker = ? AND interval = ? ORDER BY ts",
+                (ticker, interval),
+            ).fetchall()
+        if not rows:
+            return None
+
+        frame = pd.DataFrame(rows, columns=("ts",) + OHLC_COLUMNS)
+        index = pd.to_datetime(frame.pop("ts"), unit="s", utc=True)
+        tz_name = coverage[1]
+        if tz_name:
+            index = index.dt.tz_convert(tz_name)
+        frame.index = pd.DatetimeIndex(index)
+        if frame["Volume"].isna().all():
+            frame = frame.drop(columns=["Volume"])
+        return frame
+
+    def write(self, ticker: str, interval: str, frame, period=None):
+        """Upsert bars from ``frame``; ``period`` records a full fetch of that window."""
+        if frame is None or frame.empty:
+            return
+
+        index = frame.index
+        tz_name = str(index.tz) if index.tz is not None else None
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        epoch_seconds = index.tz_convert("UTC").as_unit("s").asi8
+
+        volumes = frame["Volume"] if "Volume" in frame.columns else [None] * len(frame)
+        rows = [
+            (ticker, interval, int(ts), float(o), float(h), float(lo), float(c), None if v is None else float(v))
+            for ts, o, h, lo, c, v in zip(
+                epoch_seconds,
+                frame["Open"],
+                frame["High"],
+                frame["Low"],
+                frame["Close"],
+                volumes,
+            )
+        ]
+
+        with self._lock, self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO bars (ticker, interval, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if period is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO coverage (ticker, interval, period, tz, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (ticker, interval, period, tz_name, time.time()),
+                )
+            else:
+                connection.execute(
+                    "UPDATE coverage SET fetched_at = ? WHERE ticker = ? AND interval = ?",
+                    (time.time(), ticker, interval),
+                )
+
+    def prune(self, ticker: str, interval: str, keep_from):
+        """Drop bars older than ``keep_from`` so intraday series do not grow forever."""
+        if keep_from is None:
+            return
+        cutoff = int(pd.Timestamp(keep_from).tz_convert("UTC").timestamp())
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "DELETE FROM bars WHERE ticker = ? AND interval = ? AND ts < ?",
+                (ticker, interval, cutoff),
+            )
+
+    def get_history(self, provider, ticker: str, period: str, interval: str):
+        """Serve ``period`` from stored bars, fetching only bars after the last stored one.
+
+        Falls back to a full provider fetch when nothing is stored yet, the
+        stored window is shorter than ``period``, or the stored bars have gone
+        longer than ``max_stored_age(interval)`` without a successful fetch.
+        Concurrent calls for the same (ticker, interval) run one at a time, and
+        a call that waited on another one reuses the bars it just fetched.
+        """
+        ticker_key = ticker.upper().strip()
+        requested_at = time.time()
+        with self._key_lock(ticker_key, interval):
+            return self._get_history_locked(provider, ticker_key, period, interval, requested_at)
+
+    def _get_history_locked(self, provider, ticker_key, period, interval, requested_at):
+        coverage = self.get_coverage(ticker_key, interval)
+        stored = None
+        if (
+            coverage is not None
+            and period_covers(coverage[0], period)
+            and time.time() - coverage[2] <= max_stored_age(interval)
+        ):
+            stored = self.read(ticker_key, interval)
+
+        if stored is None:
+            frame = provider.get_ohlc_history(ticker_key, period=period, interval=interval)
+            if frame is not None:
+                self.write(ticker_key, interval, frame, period=period)
+            return frame
+
+        if coverage[2] > requested_at:
+            return slice_period(stored, period)
+
+        delta = provider.get_ohlc_history(
+            ticker_key,
+            period=period,
+            interval=interval,
+            start=stored.index[-1],
+        )
+        if delta is not None and not delta.empty:
+            self.write(ticker_key, interval, delta)
+            stored = self.read(ticker_key, interval)
+            kept = slice_period(stored, coverage[0])
+            if len(kept) < len(stored):
+                self.prune(ticker_key, interval, kept.index[0])
+                stored = kept
+
+        return slice_period(stored, period)
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and single-flight loading.
+
+    Concurrent ``get_or_load`` calls for the same key share one loader call;
+    followers wait on the leader's result instead of hitting upstream again.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, clock=time.monotonic):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def configure(self, ttl_seconds=None, max_entries=None):
+        with self._lock:
+            if ttl_seconds is not None:
+                self.ttl_seconds = float(ttl_seconds)
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+                self._evict_locked()
+
+    def _lookup_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store_locked(self, key, value, ttl_seconds):
+        ttl = self.ttl_seconds if ttl_seconds is None else float(ttl_seconds)
+        if ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        self._evict_locked()
+
+    def _evict_locked(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key):
+        """Return ``(hit, value)`` without loading on a miss."""
+        with self._lock:
+            hit, value = self._lookup_locked(key)
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            return hit, value
+
+    def set(self, key, value, ttl_seconds=None):
+        with self._lock:
+            self._store_locked(key, value, ttl_seconds)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_load(self, key, loader, ttl_seconds=None, cache_if=None):
+        """Return the cached value for ``key`` or load it exactly once.
+
+        ``cache_if`` can reject a loaded value (e.g. a failed lookup) so it is
+        returned to every waiting caller but not stored.
+        """
+        with self._lock:
+            hit, value = self._lookup_locked(key)
+            if hit:
+                self._hits += 1
+                return value
+
+            pending = self._in_flight.get(key)
+            is_leader = pending is None
+            if is_leader:
+                self._misses += 1
+                pending = Future()
+                self._in_flight[key] = pending
+            else:
+                self._coalesced += 1
+
+        if not is_leader:
+            return pending.result()
+
+        try:
+            value = loader()
+        except BaseException as error:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            pending.set_exception(error)
+            raise
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if cache_if is None or cache_if(value):
+                self._store_locked(key, value, ttl_seconds)
+        pending.set_result(value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,33 @@
+import threading
+
+
+class OperationCancelled(RuntimeError):
+    """Raised at a checkpoint once the command that started the work has given up."""
+
+
+class CancelToken:
+    """Thread-safe flag a timed-out command sets so its worker stops early.
+
+    Workers call ``raise_if_cancelled()`` between steps; code that waits, like
+    the chart render pool, polls ``cancelled`` instead.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled("operation cancelled")
+
+
+def raise_if_cancelled(cancel_token):
+    """Checkpoint helper that accepts ``None`` for callers without a token."""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
@@ -1,20 +1,12 @@
 import io
 
+from commands.cancellation import OperationCancelled, raise_if_cancelled
+from commands.chart_cache import ChartCache, build_chart_cache_key
+from commands.chart_render import CHART_FIGSIZE, CHART_THEMES, DEFAULT_THEME, mpf, plt, render_chart_png
+from commands.downsample import downsample_ohlc
 from commands.formatting import format_error
 from commands.market_data import get_company_name, get_ohlc_history
-
-try:
-    import matplotlib
-
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-except (ModuleNotFoundError, ImportError):
-    plt = None
-
-try:
-    import mplfinance as mpf
-except (ModuleNotFoundError, ImportError):
-    mpf = None
+from commands.tracing import span
 
 
 PERIOD_TO_INTERVAL = {
@@ -29,11 +21,67 @@ PERIOD_TO_INTERVAL = {
     "max": "1mo",
 }
 DEFAULT_PERIOD = "1d"
+# A 10in-wide chart cannot resolve more than a few hundred distinct candles.
+CANDLES_PER_INCH = 24
+MAX_CHART_CANDLES = int(CHART_FIGSIZE[0] * CANDLES_PER_INCH)
+
+
+def _datetime_format_for(period: str, interval: str):
+    if interval.endswith("m") or interval.endswith("h"):
+        # Intraday data needs time on the x-axis; otherwise every tick shows the same date.
+        if period == "1d":
+            return "%H:%M"
+        return "%b %d %H:%M"
+    if interval.endswith("d") or interval.endswith("wk"):
+        return "%b %d"
+    # Monthly-ish / fallback.
+    return "%Y-%m"
+
+
+PERIOD_TO_DATETIME_FORMAT = {
+    period: _datetime_format_for(period, interval)
+    for period, interval in PERIOD_TO_INTERVAL.items()
+}
 
+CHART_CACHE = ChartCache()
+
+
+def configure_chart_cache(
+    max_entries=None,
+    intraday_ttl_seconds=None,
+    daily_ttl_seconds=None,
+    disk_dir=None,
+):
+    CHART_CACHE.configure(
+        max_entries=max_entries,
+        intraday_ttl_seconds=intraday_ttl_seconds,
+        daily_ttl_seconds=daily_ttl_seconds,
+        disk_dir=disk_dir,
+    )
 
-def generate_stock_chart(ticker: str, period: str = DEFAULT_PERIOD):
+
+def get_chart_cache_stats():
+    return CHART_CACHE.stats()
+
+
+def generate_stock_chart(
+    ticker: str,
+    period: str = DEFAULT_PERIOD,
+    theme: str = DEFAULT_THEME,
+    renderer=None,
+    cancel_token=None,
+):
+    """Fetch chart data and render it.
+
+    ``renderer(ohlc, title, datetime_format, theme)`` returns PNG bytes; it defaults to
+    rendering in the calling thread (see ``ProcessChartRenderer`` for the
+    process-pool alternative). With a ``cancel_token`` the renderer also gets
+    ``cancel_token=`` and ``OperationCancelled`` is raised between steps once
+    it is cancelled.
+    """
     ticker_key = ticker.upper().strip()
     period_key = period.lower().strip()
+    theme_key = theme.lower().strip()
     valid_periods = ", ".join(PERIOD_TO_INTERVAL.keys())
 
     if period_key not in PERIOD_TO_INTERVAL:
@@ -42,6 +90,13 @@ def generate_stock_chart(ticker: str, period: str = DEFAULT_PERIOD):
             f"Invalid period '{period}'. Valid periods: {valid_periods}",
         )
 
+    if theme_key not in CHART_THEMES:
+        valid_themes = ", ".join(CHART_THEMES.keys())
+        return None, None, None, format_error(
+            "Chart",
+            f"Invalid theme '{theme}'. Valid themes: {valid_themes}",
+        )
+
     if plt is None:
         return None, None, None, format_error(
             "Chart",
@@ -54,24 +109,25 @@ def generate_stock_chart(ticker: str, period: str = DEFAULT_PERIOD):
             "Chart rendering is unavailable. Install mplfinance.",
         )
 
-    ohlc = get_ohlc_history(
-        ticker_key,
-        period=period_key,
-        interval=PERIOD_TO_INTERVAL[period_key],
-    )
-    if ohlc is None or ohlc.empty:
-        return None, None, None, format_error(
-            "Chart",
-            f"Could not retrieve chart data for ticker {ticker_key}.",
+    with span("chart.fetch", phase="fetch"):
+        ohlc = get_ohlc_history(
+            ticker_key,
+            period=period_key,
+            interval=PERIOD_TO_INTERVAL[period_key],
+            cancel_token=cancel_token,
         )
+        if ohlc is None or ohlc.empty:
+            return None, None, None, format_error(
+                "Chart",
+                f"Could not retrieve chart data for ticker {ticker_key}.",
+            )
 
-    company_name = get_company_name(ticker_key)
+        company_name = get_company_name(ticker_key)
     if company_name.strip().upper() == ticker_key:
         display_name = ticker_key
     else:
         display_name = f"{company_name} ({ticker_key})"
 
-    figure = None
     try:
         close_prices = ohlc["Close"].astype(float).tolist()
         first_price = close_prices[0]
@@ -82,77 +138,38 @@ def generate_stock_chart(ticker: str, period: str = DEFAULT_PERIOD):
             change_percent = (change_amount / first_price) * 100
         sign = "+" if change_amount >= 0 else "-"
 
-        market_colors = mpf.make_marketcolors(
-            up="#26a69a",
-            down="#ef5350",
-            edge={"up": "#26a69a", "down": "#ef5350"},
-            wick={"up": "#26a69a", "down": "#ef5350"},
-            volume="inherit",
-        )
-        style = mpf.make_mpf_style(
-            base_mpf_style="nightclouds",
-            marketcolors=market_colors,
-            facecolor="#0D1117",
-            figcolor="#0D1117",
-            gridcolor="#30363D",
-            gridstyle="--",
-            rc={
-                "axes.labelcolor": "#C9D1D9",
-                "xtick.color": "#C9D1D9",
-                "ytick.color": "#C9D1D9",
-                "axes.edgecolor": "#30363D",
-                "text.color": "#F0F6FC",
-                "font.size": 10,
-            },
-        )
-
         interval = PERIOD_TO_INTERVAL[period_key]
-        if interval.endswith("m") or interval.endswith("h"):
-            # Intraday data needs time on the x-axis; otherwise every tick shows the same date.
-            datetime_format = "%H:%M"
-            if period_key != "1d":
-                datetime_format = "%b %d %H:%M"
-        elif interval.endswith("d") or interval.endswith("wk"):
-            datetime_format = "%b %d"
-        else:
-            # Monthly-ish / fallback.
-            datetime_format = "%Y-%m"
-
-        figure, _axes = mpf.plot(
-            ohlc,
-            type="candle",
-            style=style,
-            volume=False,
-            figsize=(10, 4.8),
-            returnfig=True,
-            xrotation=0,
-            datetime_format=datetime_format,
-            tight_layout=True,
-            title=f"{display_name} ({period_key})",
-        )
-
+        filename = f"{ticker_key}_{period_key}_{theme_key}_chart.png"
+        # The caption is rebuilt per request; only the image is cached. The
+        # title shows the company name, so the first render after the name
+        # loads misses once.
         caption = (
             f"**{display_name} Chart ({period_key})**\n"
             f"Last Price: ${last_price:.2f}\n"
             f"Change: {sign}${abs(change_amount):.2f} ({sign}{abs(change_percent):.2f}%)"
         )
-
-        image_stream = io.BytesIO()
-        figure.savefig(
-            image_stream,
-            format="png",
-            dpi=150,
-            facecolor=figure.get_facecolor(),
-            bbox_inches="tight",
-        )
-        image_stream.seek(0)
-        filename = f"{ticker_key}_{period_key}_dark_chart.png"
-        return image_stream, filename, caption, None
+        cache_key = build_chart_cache_key(ticker_key, period_key, ohlc, display_name, theme_key)
+        png_bytes = CHART_CACHE.get(cache_key)
+        if png_bytes is not None:
+            return io.BytesIO(png_bytes), filename, caption, None
+
+        raise_if_cancelled(cancel_token)
+        render_kwargs = {"cancel_token": cancel_token} if cancel_token is not None else {}
+        with span("chart.render", phase="render"):
+            png_bytes = (renderer or render_chart_png)(
+                downsample_ohlc(ohlc, MAX_CHART_CANDLES),
+                f"{display_name} ({period_key})",
+                PERIOD_TO_DATETIME_FORMAT[period_key],
+                theme_key,
+                **render_kwargs,
+            )
+
+        CHART_CACHE.set(cache_key, png_bytes, CHART_CACHE.ttl_for_interval(interval))
+        return io.BytesIO(png_bytes), filename, caption, None
+    except OperationCancelled:
+        raise
     except Exception:
         return None, None, None, format_error(
             "Chart",
             f"Could not build chart for ticker {ticker_key}.",
         )
-    finally:
-        if figure is not None:
-            plt.close(figure)
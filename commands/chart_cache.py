@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from commands.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHART_CACHE_MAX_ENTRIES = 64
+DEFAULT_INTRADAY_TTL_SECONDS = 60.0
+DEFAULT_DAILY_TTL_SECONDS = 6 * 3600.0
+DISK_PRUNE_EVERY_WRITES = 50
+
+
+def build_chart_cache_key(ticker: str, period: str, ohlc, *extra):
+    """Key a render by ticker, period and the timestamp + values of the last bar."""
+    last_timestamp = ohlc.index[-1]
+    last_bar = ohlc.iloc[-1]
+    bar_digest = hashlib.sha1(
+        repr([float(last_bar[column]) for column in ohlc.columns]).encode("utf-8")
+    ).hexdigest()[:16]
+    return (ticker, period, last_timestamp.isoformat(), bar_digest, len(ohlc)) + tuple(extra)
+
+
+class ChartCache:
+    """LRU of rendered chart PNGs with an optional disk tier.
+
+    Intraday charts change every few minutes, so they get a short TTL; daily
+    and longer charts only change when the last bar does and keep theirs longer.
+    """
+
+    def __init__(
+        self,
+        max_entries=DEFAULT_CHART_CACHE_MAX_ENTRIES,
+        intraday_ttl_seconds=DEFAULT_INTRADAY_TTL_SECONDS,
+        daily_ttl_seconds=DEFAULT_DAILY_TTL_SECONDS,
+        disk_dir=None,
+    ):
+        self.intraday_ttl_seconds = float(intraday_ttl_seconds)
+        self.daily_ttl_seconds = float(daily_ttl_seconds)
+        self.disk_dir = disk_dir
+        self._disk_writes = 0
+        self._memory = TTLCache(ttl_seconds=self.daily_ttl_seconds, max_entries=max_entries)
+
+    def configure(
+        self,
+        max_entries=None,
+        intraday_ttl_seconds=None,
+        daily_ttl_seconds=None,
+        disk_dir=None,
+    ):
+        if intraday_ttl_seconds is not None:
+            self.intraday_ttl_seconds = float(intraday_ttl_seconds)
+        if daily_ttl_seconds is not None:
+            self.daily_ttl_seconds = float(daily_ttl_seconds)
+        if disk_dir is not None:
+            self.disk_dir = disk_dir or None
+        self._memory.configure(ttl_seconds=self.daily_ttl_seconds, max_entries=max_entries)
+
+    def ttl_for_interval(self, interval: str):
+        if interval.endswith("m") or interval.endswith("h"):
+            return self.intraday_ttl_seconds
+        return self.daily_ttl_seconds
+
+    def _disk_paths(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        base = os.path.join(self.disk_dir, digest)
+        return f"{base}.png", f"{base}.json"
+
+    def get(self, key):
+        """Return the cached PNG bytes or None."""
+        hit, value = self._memory.get(key)
+        if hit:
+            return value
+        if not self.disk_dir:
+            return None
+
+        png_path, meta_path = self._disk_paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+            remaining = float(meta["expires_at"]) - time.time()
+            if remaining <= 0:
+                return None
+            with open(png_path, "rb") as png_file:
+                png_bytes = png_file.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        self._memory.set(key, png_bytes, ttl_seconds=remaining)
+        return png_bytes
+
+    def _write_atomic(self, path, data):
+        """Write ``data`` through a unique temp file so readers never see a partial entry."""
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.disk_dir, suffix=".tmp", delete=False) as temp_file:
+                temp_path = temp_file.name
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def set(self, key, png_bytes, ttl_seconds):
+        self._memory.set(key, png_bytes, ttl_seconds=ttl_seconds)
+        if not self.disk_dir:
+            return
+
+        png_path, meta_path = self._disk_paths(key)
+        meta = json.dumps({"expires_at": time.time() + ttl_seconds}).encode("utf-8")
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            # PNG first: the metadata file is what marks an entry as present.
+            self._write_atomic(png_path, png_bytes)
+            self._write_atomic(meta_path, meta)
+        except OSError:
+            logger.warning("Could not write chart cache entry to %s", self.disk_dir)
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % DISK_PRUNE_EVERY_WRITES == 0:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """Delete expired disk entries."""
+        if not self.disk_dir:
+            return
+
+        now = time.time()
+        try:
+            names = os.listdir(self.disk_dir)
+        except OSError:
+            return
+
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(self.disk_dir, name)
+            try:
+                with open(meta_path, "r", encoding="utf-8") as meta_file:
+                    expires_at = float(json.load(meta_file)["expires_at"])
+            except (OSError, ValueError, KeyError):
+                expires_at = 0.0
+            if expires_at > now:
+                continue
+            for path in (meta_path, f"{meta_path[:-len('.json')]}.png"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        self._memory.clear()
+
+    def stats(self):
+        return self._memory.stats()
@@ -0,0 +1,313 @@
+import io
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from commands.cancellation import OperationCancelled, raise_if_cancelled
+from commands.tracing import span
+
+try:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except (ModuleNotFoundError, ImportError):
+    plt = None
+
+try:
+    import mplfinance as mpf
+except (ModuleNotFoundError, ImportError):
+    mpf = None
+
+
+CHART_FIGSIZE = (10, 4.8)
+CHART_DPI = 150
+# How often a waiting render thread checks its cancel token.
+CANCEL_POLL_SECONDS = 0.1
+# Fixed margins for reused figures; ``bbox_inches="tight"`` would draw every chart twice.
+REUSED_FIGURE_MARGINS = {"left": 0.08, "right": 0.98, "top": 0.92, "bottom": 0.08}
+
+
+DEFAULT_THEME = "dark"
+
+# Theme name -> colors. Register themes at import time so spawned render
+# workers (which re-import this module) see the same set.
+CHART_THEMES = {}
+_STYLE_CACHE = {}
+
+
+def register_chart_theme(
+    name: str,
+    base_mpf_style: str,
+    up_color: str,
+    down_color: str,
+    background_color: str,
+    grid_color: str,
+    label_color: str,
+    text_color: str,
+):
+    theme_key = name.lower().strip()
+    CHART_THEMES[theme_key] = {
+        "base_mpf_style": base_mpf_style,
+        "up_color": up_color,
+        "down_color": down_color,
+        "background_color": background_color,
+        "grid_color": grid_color,
+        "label_color": label_color,
+        "text_color": text_color,
+    }
+    _STYLE_CACHE.pop(theme_key, None)
+
+
+register_chart_theme(
+    "dark",
+    base_mpf_style="nightclouds",
+    up_color="#26a69a",
+    down_color="#ef5350",
+    background_color="#0D1117",
+    grid_color="#30363D",
+    label_color="#C9D1D9",
+    text_color="#F0F6FC",
+)
+register_chart_theme(
+    "light",
+    base_mpf_style="yahoo",
+    up_color="#26a69a",
+    down_color="#ef5350",
+    background_color="#FFFFFF",
+    grid_color="#D0D7DE",
+    label_color="#57606A",
+    text_color="#1F2328",
+)
+
+
+def _build_style(theme):
+    market_colors = mpf.make_marketcolors(
+        up=theme["up_color"],
+        down=theme["down_color"],
+        edge={"up": theme["up_color"], "down": theme["down_color"]},
+        wick={"up": theme["up_color"], "down": theme["down_color"]},
+        volume="inherit",
+    )
+    return mpf.make_mpf_style(
+        base_mpf_style=theme["base_mpf_style"],
+        marketcolors=market_colors,
+        facecolor=theme["background_color"],
+        figcolor=theme["background_color"],
+        gridcolor=theme["grid_color"],
+        gridstyle="--",
+        rc={
+            "axes.labelcolor": theme["label_color"],
+            "xtick.color": theme["label_color"],
+            "ytick.color": theme["label_color"],
+            "axes.edgecolor": theme["grid_color"],
+            "text.color": theme["text_color"],
+            "font.size": 10,
+        },
+    )
+
+
+def get_chart_style(theme_name: str = DEFAULT_THEME):
+    """Return the mplfinance style for ``theme_name``, built once per process."""
+    style = _STYLE_CACHE.get(theme_name)
+    if style is None:
+        style = _build_style(CHART_THEMES[theme_name])
+        _STYLE_CACHE[theme_name] = style
+    return style
+
+
+class FigurePoolRenderer:
+    """Redraws into one pre-sized figure per (thread, theme) instead of building a new one.
+
+    Each render clears the axes, plots the candles into them and writes the PNG
+    into a reused buffer, skipping figure allocation and teardown.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _get_slot(self, theme: str):
+        slots = getattr(self._local, "slots", None)
+        if slots is None:
+            slots = self._local.slots = {}
+
+        slot = slots.get(theme)
+        if slot is None:
+            figure = mpf.figure(style=get_chart_style(theme), figsize=CHART_FIGSIZE)
+            figure.subplots_adjust(**REUSED_FIGURE_MARGINS)
+            axes = figure.add_subplot(1, 1, 1)
+            slot = slots[theme] = (figure, axes, io.BytesIO())
+        return slot
+
+    def render(self, ohlc, title: str, datetime_format: str, theme: str = DEFAULT_THEME):
+        figure, axes, image_stream = self._get_slot(theme)
+        with span("chart.plot"):
+            axes.clear()
+            mpf.plot(
+                ohlc,
+                type="candle",
+                ax=axes,
+                xrotation=0,
+                datetime_format=datetime_format,
+            )
+            axes.set_xlim(-1, len(ohlc))
+            axes.set_title(title, fontweight="bold")
+
+        with span("chart.savefig"):
+            image_stream.seek(0)
+            image_stream.truncate()
+            figure.savefig(
+                image_stream,
+                format="png",
+                dpi=CHART_DPI,
+                facecolor=figure.get_facecolor(),
+            )
+            return image_stream.getvalue()
+
+
+_figure_pool = None
+
+
+def configure_chart_renderer(reuse_figures=False):
+    """Switch ``render_chart_png`` between fresh figures and the per-thread figure pool."""
+    global _figure_pool
+
+    _figure_pool = FigurePoolRenderer() if reuse_figures else None
+
+
+def render_chart_png(ohlc, title: str, datetime_format: str, theme: str = DEFAULT_THEME, cancel_token=None):
+    """Render a candle chart of ``ohlc`` and return the PNG bytes."""
+    raise_if_cancelled(cancel_token)
+    if _figure_pool is not None:
+        return _figure_pool.render(ohlc, title, datetime_format, theme)
+
+    figure = None
+    try:
+        with span("chart.plot"):
+            figure, _axes = mpf.plot(
+                ohlc,
+                type="candle",
+                style=get_chart_style(theme),
+                volume=False,
+                figsize=CHART_FIGSIZE,
+                returnfig=True,
+                xrotation=0,
+                datetime_format=datetime_format,
+                tight_layout=True,
+                title=title,
+            )
+
+        raise_if_cancelled(cancel_token)
+        with span("chart.savefig"):
+            image_stream = io.BytesIO()
+            figure.savefig(
+                image_stream,
+                format="png",
+                dpi=CHART_DPI,
+                facecolor=figure.get_facecolor(),
+                bbox_inches="tight",
+            )
+            return image_stream.getvalue()
+    finally:
+        if figure is not None:
+            plt.close(figure)
+
+
+def _init_render_worker(reuse_figures=False):
+    # Pay the matplotlib/mplfinance import and style setup cost once per worker.
+    configure_chart_renderer(reuse_figures=reuse_figures)
+    for theme_name in CHART_THEMES:
+        get_chart_style(theme_name)
+
+
+def _ping_render_worker():
+    return True
+
+
+def _terminate_executor(executor):
+    terminate_workers = getattr(executor, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    # Python < 3.14 has no public way to stop a busy worker.
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProcessChartRenderer:
+    """Renders charts in warm worker processes so renders do not hold the bot's GIL.
+
+    Each worker is its own single-process pool, so a render whose command timed
+    out can be killed and replaced without touching the other workers. Call
+    ``render`` from a worker thread; it blocks until the PNG bytes return.
+    """
+
+    def __init__(self, max_workers: int, reuse_figures=False):
+        self.max_workers = max(1, int(max_workers))
+        self.reuse_figures = reuse_figures
+        self._closed = False
+        self._idle = queue.Queue()
+        for _ in range(self.max_workers):
+            self._idle.put(self._new_worker())
+
+    def _new_worker(self, warm=False):
+        worker = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_render_worker,
+            initargs=(self.reuse_figures,),
+        )
+        if warm:
+            # Start spawning now so the next render does not pay for it.
+            worker.submit(_ping_render_worker)
+        return worker
+
+    def _take_worker(self, cancel_token):
+        while True:
+            raise_if_cancelled(cancel_token)
+            try:
+                return self._idle.get(timeout=CANCEL_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def warm(self):
+        workers = [self._idle.get() for _ in range(self.max_workers)]
+        try:
+            for future in [worker.submit(_ping_render_worker) for worker in workers]:
+                future.result()
+        finally:
+            for worker in workers:
+                self._idle.put(worker)
+
+    def render(self, ohlc, title: str, datetime_format: str, theme: str = DEFAULT_THEME, cancel_token=None):
+        worker = self._take_worker(cancel_token)
+        try:
+            future = worker.submit(render_chart_png, ohlc, title, datetime_format, theme)
+            while True:
+                try:
+                    return future.result(timeout=CANCEL_POLL_SECONDS)
+                except TimeoutError:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        _terminate_executor(worker)
+                        worker = self._new_worker(warm=True)
+                        raise OperationCancelled("chart render cancelled") from None
+                except BrokenProcessPool:
+                    worker = self._new_worker(warm=True)
+                    raise
+        finally:
+            if self._closed:
+                worker.shutdown(wait=False, cancel_futures=True)
+            else:
+                self._idle.put(worker)
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,33 @@
+try:
+    import numpy as np
+    import pandas as pd
+except ModuleNotFoundError:
+    np = None
+    pd = None
+
+
+def downsample_ohlc(frame, max_candles: int):
+    """Merge consecutive bars so ``frame`` has at most ``max_candles`` rows.
+
+    Each bucket keeps its true open (first), high (max), low (min) and close
+    (last), plus summed volume, and is stamped with its first bar's timestamp.
+    Frames already within the limit are returned unchanged.
+    """
+    row_count = len(frame)
+    if np is None or max_candles <= 0 or row_count <= max_candles:
+        return frame
+
+    bucket_size = -(-row_count // max_candles)
+    starts = np.arange(0, row_count, bucket_size)
+    ends = np.append(starts[1:], row_count) - 1
+
+    columns = {
+        "Open": frame["Open"].to_numpy(dtype=float)[starts],
+        "High": np.maximum.reduceat(frame["High"].to_numpy(dtype=float), starts),
+        "Low": np.minimum.reduceat(frame["Low"].to_numpy(dtype=float), starts),
+        "Close": frame["Close"].to_numpy(dtype=float)[ends],
+    }
+    if "Volume" in frame.columns:
+        columns["Volume"] = np.add.reduceat(frame["Volume"].to_numpy(dtype=float), starts)
+
+    return pd.DataFrame(columns, index=frame.index[starts])
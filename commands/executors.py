@@ -0,0 +1,100 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from commands.cancellation import CancelToken
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when a pool's workers and queue are all taken."""
+
+
+class BoundedExecutor:
+    """Named thread pool that rejects work instead of queueing without limit.
+
+    Up to ``max_workers`` jobs run at once and up to ``max_queue`` more wait;
+    anything beyond that fails fast with ``ExecutorBusyError``. Capacity is
+    released when the job actually finishes (or is cancelled before starting),
+    not when the awaiting coroutine gives up.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"splitbot-{name}",
+        )
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    def _admit(self):
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self._rejected += 1
+                raise ExecutorBusyError(f"{self.name} pool is busy")
+            self._admitted += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._admitted -= 1
+
+    def _call(self, context, func, args, kwargs):
+        with self._lock:
+            self._running += 1
+        try:
+            return context.run(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def submit(self, func, *args, **kwargs):
+        """Submit ``func`` and return a ``concurrent.futures.Future``."""
+        self._admit()
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(self._call, context, func, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, func, *args, **kwargs):
+        """Await ``func(*args, **kwargs)`` on this pool, like ``asyncio.to_thread``."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    async def run_cancellable(self, func, *args, **kwargs):
+        """Like ``run``, passing ``cancel_token=`` to ``func`` and cancelling it if the await is cancelled.
+
+        A job that has not started is dropped and frees its slot at once; a
+        running one stops at its next cancellation checkpoint.
+        """
+        cancel_token = CancelToken()
+        try:
+            return await self.run(func, *args, cancel_token=cancel_token, **kwargs)
+        except asyncio.CancelledError:
+            cancel_token.cancel()
+            raise
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": max(0, self._admitted - self._running),
+                "capacity": self.capacity,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,5 +1,8 @@
 import datetime
+import gc
+import threading
 import time
+from collections import deque
 
 try:
     import psutil
@@ -9,7 +12,139 @@ except ModuleNotFoundError:
 from commands.formatting import format_response
 
 
-def get_server_status():
+def format_executor_lines(executor_stats):
+    lines = []
+    for stats in executor_stats or []:
+        lines.append(
+            f"{stats['name'].title()} Pool: {stats['running']}/{stats['workers']} busy, "
+            f"{stats['queued']} queued, {stats['rejected']} rejected"
+        )
+    return lines
+
+
+BYTES_PER_MB = 1024 * 1024
+_baseline_rss = None
+
+
+def record_process_baseline():
+    """Remember the current RSS so ``!health`` can report growth since startup."""
+    global _baseline_rss
+
+    if psutil is not None:
+        _baseline_rss = psutil.Process().memory_info().rss
+    return _baseline_rss
+
+
+def _format_cache_line(label, stats):
+    lookups = stats["hits"] + stats["misses"] + stats.get("coalesced", 0)
+    saved = stats["hits"] + stats.get("coalesced", 0)
+    hit_ratio = f"{(saved / lookups) * 100:.0f}%" if lookups else "n/a"
+    line = f"{label}: {hit_ratio} served from cache ({stats['hits']} hits, {stats['misses']} misses"
+    if "coalesced" in stats:
+        line = f"{line}, {stats['coalesced']} coalesced"
+    return f"{line}, {stats['size']} entries)"
+
+
+def _count_open_files(process):
+    try:
+        return process.num_fds()
+    except AttributeError:
+        return process.num_handles()
+
+
+_PROCESS_PROBES = (
+    ("rss", lambda process: process.memory_info().rss),
+    ("threads", lambda process: process.num_threads()),
+    ("open_files", _count_open_files),
+)
+
+
+def read_process_metrics():
+    """Probe the bot process; a probe psutil cannot answer is None.
+
+    Blocking, so call it from a worker thread. Returns None without psutil.
+    """
+    if psutil is None:
+        return None
+
+    try:
+        process = psutil.Process()
+    except psutil.Error:
+        return None
+    metrics = {}
+    for key, probe in _PROCESS_PROBES:
+        try:
+            metrics[key] = probe(process)
+        except (psutil.Error, OSError):
+            metrics[key] = None
+    return metrics
+
+
+def format_process_lines(bot_stats=None, process_metrics=None):
+    """Lines about the bot process itself: memory, handles, GC, loop lag, in-flight work, caches.
+
+    ``process_metrics`` comes from ``read_process_metrics``; when omitted the
+    process is probed now.
+    """
+    bot_stats = bot_stats or {}
+    if process_metrics is None:
+        process_metrics = read_process_metrics() or {}
+    lines = []
+
+    rss = process_metrics.get("rss")
+    if rss is not None:
+        rss_line = f"Bot Memory (RSS): {rss / BYTES_PER_MB:.1f} MB"
+        if _baseline_rss is not None:
+            growth = (rss - _baseline_rss) / BYTES_PER_MB
+            rss_line = f"{rss_line} ({growth:+.1f} MB since start)"
+        lines.append(rss_line)
+    if process_metrics.get("threads") is not None:
+        lines.append(f"Bot Threads: {process_metrics['threads']}")
+    if process_metrics.get("open_files") is not None:
+        lines.append(f"Bot Open Files: {process_metrics['open_files']}")
+
+    gen0, gen1, gen2 = (generation["collections"] for generation in gc.get_stats())
+    lines.append(f"GC Collections (gen0/gen1/gen2): {gen0}/{gen1}/{gen2}")
+
+    worst_lag = bot_stats.get("worst_loop_lag_seconds")
+    if worst_lag is not None:
+        lines.append(f"Worst Event Loop Lag: {worst_lag:.2f}s since start")
+
+    in_flight = {name: count for name, count in (bot_stats.get("in_flight") or {}).items() if count}
+    if in_flight:
+        in_flight_display = ", ".join(f"!{name}={count}" for name, count in sorted(in_flight.items()))
+    else:
+        in_flight_display = "none"
+    lines.append(f"In-Flight Commands: {in_flight_display}")
+
+    for label, stats in (bot_stats.get("caches") or {}).items():
+        lines.append(_format_cache_line(label, stats))
+    return lines
+
+
+def _read_cpu_temperature():
+    try:
+        with open("/sys/class/thermal/thermal_zone0/temp", "r") as temp_file:
+            return int(temp_file.read()) / 1000
+    except (FileNotFoundError, PermissionError, OSError, ValueError):
+        return None
+
+
+def _read_host_uptime():
+    try:
+        return time.time() - psutil.boot_time()
+    except (psutil.Error, OSError):
+        return None
+
+
+def _format_uptime(uptime_seconds):
+    if uptime_seconds is None:
+        return "Unavailable"
+    return str(datetime.timedelta(seconds=int(uptime_seconds)))
+
+
+def get_server_status(executor_stats=None, bot_stats=None):
+    runtime_lines = format_executor_lines(executor_stats) + format_process_lines(bot_stats)
     if psutil is None:
         return format_response(
             "Server Health",
@@ -19,20 +154,15 @@ def get_server_status():
                 "Disk Usage: Unavailable",
                 "CPU Temperature: Unavailable",
                 "Uptime: Unavailable",
-            ],
+            ]
+            + runtime_lines,
         )
 
     cpu_usage = psutil.cpu_percent()
     memory_usage = psutil.virtual_memory().percent
-    uptime_seconds = time.time() - psutil.boot_time()
-    uptime = str(datetime.timedelta(seconds=int(uptime_seconds)))
+    uptime = _format_uptime(_read_host_uptime())
     disk_usage = psutil.disk_usage("/").percent
-
-    try:
-        with open("/sys/class/thermal/thermal_zone0/temp", "r") as temp_file:
-            cpu_temp = int(temp_file.read()) / 1000
-    except (FileNotFoundError, PermissionError, OSError, ValueError):
-        cpu_temp = None
+    cpu_temp = _read_cpu_temperature()
 
     if cpu_temp is None:
         temp_display = "Unavailable"
@@ -47,5 +177,93 @@ def get_server_status():
             f"Disk Usage: {disk_usage}%",
             f"CPU Temperature: {temp_display}",
             f"Uptime: {uptime}",
-        ],
+        ]
+        + runtime_lines,
     )
+
+
+SAMPLED_METRICS = (
+    ("cpu_percent", "CPU Usage", "{:.1f}%"),
+    ("memory_percent", "Memory Usage", "{:.1f}%"),
+    ("disk_percent", "Disk Usage", "{:.1f}%"),
+    ("cpu_temp", "CPU Temperature", "{:.1f}°C"),
+    ("loop_lag_seconds", "Event Loop Lag", "{:.2f}s"),
+    ("queue_depth", "Queued Jobs", "{:.0f}"),
+)
+
+
+class HealthSampler:
+    """Fixed-size ring buffer of periodic host samples so ``!health`` never blocks on probes.
+
+    ``record`` is meant to run on a timer in a worker thread;
+    ``psutil.cpu_percent(interval=None)`` then measures CPU over the time since
+    the previous sample. Process metrics are probed here too, so formatting a
+    sample never touches psutil.
+    """
+
+    def __init__(self, max_samples: int):
+        self._samples = deque(maxlen=max(1, int(max_samples)))
+        self._lock = threading.Lock()
+
+    def record(self, loop_lag_seconds=None, executor_stats=None):
+        if psutil is None:
+            return None
+
+        sample = {
+            "time": time.time(),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_percent": psutil.disk_usage("/").percent,
+            "cpu_temp": _read_cpu_temperature(),
+            "loop_lag_seconds": loop_lag_seconds,
+            "queue_depth": sum(stats["queued"] for stats in executor_stats or []),
+            "uptime_seconds": _read_host_uptime(),
+            "process": read_process_metrics() or {},
+        }
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def latest(self):
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def summarize(self, window_seconds: float):
+        """Return ``{metric: (min, avg, max)}`` over samples newer than ``window_seconds``."""
+        cutoff = time.time() - window_seconds
+        with self._lock:
+            samples = [sample for sample in self._samples if sample["time"] >= cutoff]
+
+        summary = {}
+        for key, _label, _value_format in SAMPLED_METRICS:
+            values = [sample[key] for sample in samples if sample.get(key) is not None]
+            if values:
+                summary[key] = (min(values), sum(values) / len(values), max(values))
+        return summary
+
+
+def get_sampled_server_status(sampler, window_seconds: float, executor_stats=None, bot_stats=None):
+    """Format ``!health`` from the sampler without probing; falls back to live probes before the first sample."""
+    latest = sampler.latest() if sampler is not None else None
+    if latest is None:
+        return get_server_status(executor_stats, bot_stats)
+
+    summary = sampler.summarize(window_seconds)
+    window_label = f"{int(window_seconds // 60)}m"
+    lines = []
+    for key, label, value_format in SAMPLED_METRICS:
+        value = latest.get(key)
+        if value is None:
+            lines.append(f"{label}: Unavailable")
+            continue
+
+        line = f"{label}: {value_format.format(value)}"
+        if key in summary:
+            low, average, high = (value_format.format(part) for part in summary[key])
+            line = f"{line} ({window_label} min/avg/max {low} / {average} / {high})"
+        lines.append(line)
+
+    lines.append(f"Uptime: {_format_uptime(latest.get('uptime_seconds'))}")
+    lines += format_executor_lines(executor_stats)
+    lines += format_process_lines(bot_stats, latest.get("process") or {})
+    return format_response("Server Health", lines)
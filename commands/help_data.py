@@ -1,9 +1,13 @@
 HELP_ORDER = [
     "help",
     "price",
+    "watch",
+    "unwatch",
     "chart",
     "post",
+    "splits",
     "rsa",
+    "rsa_scan",
     "health",
     "usercount",
     "test_all",
@@ -19,22 +23,46 @@ HELP_COMMANDS = {
         ],
     },
     "price": {
-        "usage": "!price <ticker>",
+        "usage": "!price <ticker> [ticker...]",
         "description": "Fetches the current or most recent stock price plus daily change.",
+        "details": [
+            "Pass up to 10 tickers to get them all in one message.",
+        ],
         "examples": [
             "!price AAPL",
-            "!price NVDA",
+            "!price AAPL TSLA NVDA",
+        ],
+    },
+    "watch": {
+        "usage": "!watch <ticker> [ticker...]",
+        "description": "Posts one price message and keeps editing it with fresh prices until it expires.",
+        "details": [
+            "Pass up to 10 tickers. Running `!watch` again in the same channel replaces your previous watch.",
+            "Each server can run a limited number of watches at once.",
+        ],
+        "examples": [
+            "!watch AAPL",
+            "!watch AAPL TSLA NVDA",
+        ],
+    },
+    "unwatch": {
+        "usage": "!unwatch",
+        "description": "Stops your live price watches in the current channel.",
+        "examples": [
+            "!unwatch",
         ],
     },
     "chart": {
-        "usage": "!chart <ticker> [period]",
-        "description": "Generates a dark mode stock chart image. Default period is 1d.",
+        "usage": "!chart <ticker> [period] [theme]",
+        "description": "Generates a stock chart image. Default period is 1d, default theme is dark.",
         "details": [
             "Valid periods: `1d`, `5d`, `1mo`, `3mo`, `6mo`, `1y`, `2y`, `5y`, `max`.",
+            "Valid themes: `dark`, `light`.",
         ],
         "examples": [
             "!chart TSLA",
             "!chart AAPL 6mo",
+            "!chart AAPL 1y light",
         ],
     },
     "post": {
@@ -51,20 +79,43 @@ HELP_COMMANDS = {
             "!post TSLA 1:5 Feb-20 https://example.com/source",
         ],
     },
+    "splits": {
+        "usage": "!splits [upcoming|ticker]",
+        "description": "Lists reverse splits recorded by `!post`: upcoming buy deadlines, or every split for one ticker.",
+        "examples": [
+            "!splits",
+            "!splits AAPL",
+        ],
+    },
     "rsa": {
-        "usage": "!rsa <ticker> <split_ratio>",
+        "usage": "!rsa <ticker> <split_ratio> [--grid] [--accounts N] [--move X]",
         "description": "Estimates profitability of a reverse split arbitrage setup.",
         "details": [
             "Split ratio format must be small:big (example: `1:10`).",
+            "`--grid` shows profit across price moves of up to plus or minus X% (default 10), 1 to N accounts (default 5) and broker rounding (round up vs cash in lieu).",
+            "With `--grid`, pass up to 4 comma-separated ratios (example: `1:10,1:20`).",
         ],
         "examples": [
             "!rsa AAPL 1:10",
             "!rsa TSLA 1:5",
+            "!rsa AAPL 1:10,1:20 --grid --accounts 3 --move 5",
+        ],
+    },
+    "rsa_scan": {
+        "usage": "!rsa_scan <rows> (or attach a CSV)",
+        "description": "Ranks a list of upcoming reverse splits by estimated profit per account.",
+        "details": [
+            "One row per line: `ticker ratio [last day to buy]`, space or comma separated. A header row is ignored.",
+            "Up to 50 rows; all prices are fetched in one batched request.",
+        ],
+        "examples": [
+            "!rsa_scan AAPL 1:10 2026-02-20",
+            "!rsa_scan (with splits.csv attached)",
         ],
     },
     "health": {
         "usage": "!health",
-        "description": "Shows server health details (CPU, memory, disk, temperature, uptime).",
+        "description": "Shows server health details (CPU, memory, disk, temperature, uptime) and bot process stats (memory, threads, loop lag, in-flight commands, cache hit rates).",
         "examples": [
             "!health",
         ],
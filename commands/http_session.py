@@ -0,0 +1,124 @@
+import logging
+import random
+import time
+
+try:
+    from curl_cffi import requests as curl_requests
+except ModuleNotFoundError:
+    curl_requests = None
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 3.0
+DEFAULT_READ_TIMEOUT_SECONDS = 10.0
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BACKOFF_SECONDS = 0.5
+# Never sleep longer than this between attempts, whatever Retry-After says.
+MAX_RETRY_SLEEP_SECONDS = 4.0
+# Wall-clock limit for one request including its retries, below the default
+# 20s command timeout. A lookup that makes several requests is still bounded
+# by the command timeout and its cancel token, not by this.
+DEFAULT_REQUEST_BUDGET_SECONDS = 15.0
+# A retry is only worth sending if it can wait this long for a response.
+MIN_RETRY_READ_SECONDS = 1.0
+
+
+def retry_delay(attempt: int, backoff_seconds: float, retry_after=None):
+    """Seconds to wait before retry ``attempt`` (1-based): exponential with full jitter."""
+    if retry_after is not None:
+        try:
+            return min(MAX_RETRY_SLEEP_SECONDS, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    ceiling = backoff_seconds * (2 ** (attempt - 1))
+    return min(MAX_RETRY_SLEEP_SECONDS, random.uniform(0.5 * ceiling, 1.5 * ceiling))
+
+
+if curl_requests is not None:
+
+    class YahooSession(curl_requests.Session):
+        """curl_cffi session shared by every yfinance call.
+
+        curl handles are kept per thread, so each network worker reuses its own
+        keep-alive connections and the pool grows with the network executor.
+        Every request uses the configured (connect, read) timeouts. 429/5xx
+        responses and transport errors are retried here, and only here, with
+        jittered exponential backoff; no retry starts once it could not finish
+        inside ``budget_seconds``.
+        """
+
+        def __init__(
+            self,
+            connect_timeout_seconds=DEFAULT_CONNECT_TIMEOUT_SECONDS,
+            read_timeout_seconds=DEFAULT_READ_TIMEOUT_SECONDS,
+            retries=DEFAULT_RETRIES,
+            backoff_seconds=DEFAULT_RETRY_BACKOFF_SECONDS,
+            budget_seconds=DEFAULT_REQUEST_BUDGET_SECONDS,
+        ):
+            self.request_timeout = (float(connect_timeout_seconds), float(read_timeout_seconds))
+            self.status_retries = max(0, int(retries))
+            self.backoff_seconds = float(backoff_seconds)
+            self.budget_seconds = float(budget_seconds)
+            super().__init__(impersonate="chrome", timeout=self.request_timeout)
+
+        def _can_retry(self, attempt, delay, deadline):
+            connect_timeout, _read_timeout = self.request_timeout
+            remaining = deadline - time.monotonic() - delay
+            return attempt < self.status_retries and remaining >= connect_timeout + MIN_RETRY_READ_SECONDS
+
+        def request(self, method, url, *args, **kwargs):
+            connect_timeout, read_timeout = self.request_timeout
+            deadline = time.monotonic() + self.budget_seconds
+            attempt = 0
+            while True:
+                # yfinance passes its own (often 30s) timeouts; ours win, trimmed to the budget.
+                remaining = deadline - time.monotonic()
+                attempt_read_timeout = min(read_timeout, remaining - connect_timeout)
+                kwargs["timeout"] = (connect_timeout, max(MIN_RETRY_READ_SECONDS, attempt_read_timeout))
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                except curl_requests.RequestsError:
+                    delay = retry_delay(attempt + 1, self.backoff_seconds)
+                    if not self._can_retry(attempt, delay, deadline):
+                        raise
+                    reason = "request failed"
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        return response
+                    delay = retry_delay(attempt + 1, self.backoff_seconds, response.headers.get("Retry-After"))
+                    if not self._can_retry(attempt, delay, deadline):
+                        return response
+                    reason = f"returned {response.status_code}"
+                attempt += 1
+                logger.info(
+                    "Yahoo %s for %s; retry %d/%d in %.2fs",
+                    reason,
+                    url,
+                    attempt,
+                    self.status_retries,
+                    delay,
+                )
+                time.sleep(delay)
+
+else:
+    YahooSession = None
+
+
+def create_yahoo_session(
+    connect_timeout_seconds=None,
+    read_timeout_seconds=None,
+    retries=None,
+    backoff_seconds=None,
+    budget_seconds=None,
+):
+    """Return a shared ``YahooSession``, or None when curl_cffi is not installed."""
+    if YahooSession is None:
+        return None
+    return YahooSession(
+        connect_timeout_seconds=connect_timeout_seconds or DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        read_timeout_seconds=read_timeout_seconds or DEFAULT_READ_TIMEOUT_SECONDS,
+        retries=DEFAULT_RETRIES if retries is None else retries,
+        backoff_seconds=DEFAULT_RETRY_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds,
+        budget_seconds=budget_seconds or DEFAULT_REQUEST_BUDGET_SECONDS,
+    )
@@ -0,0 +1,69 @@
+import asyncio
+import datetime as dt
+import logging
+
+from commands.post import parse_post_channel_name
+
+logger = logging.getLogger(__name__)
+
+JANITOR_MODES = ("archive", "delete")
+DEFAULT_JANITOR_INTERVAL_MINUTES = 360.0
+DEFAULT_JANITOR_GRACE_DAYS = 2
+DEFAULT_JANITOR_BATCH_SIZE = 5
+DEFAULT_JANITOR_BATCH_PAUSE_SECONDS = 5.0
+# Discord caps a category at 50 channels.
+MAX_CATEGORY_CHANNELS = 50
+
+
+def find_expired_post_channels(channels, today=None, grace_days=DEFAULT_JANITOR_GRACE_DAYS):
+    """Post channels whose last day to buy is more than ``grace_days`` ago, oldest first.
+
+    Only names built by ``build_post_channel_name`` are considered, so other
+    channels in the category are never touched. The year comes from the
+    channel's ``created_at``, so channels older than six months still expire.
+    """
+    today = today or dt.date.today()
+    cutoff = today - dt.timedelta(days=grace_days)
+    expired = []
+    for channel in channels:
+        created_at = getattr(channel, "created_at", None)
+        created_on = created_at.date() if created_at is not None else None
+        parsed = parse_post_channel_name(channel.name, today, created_on=created_on)
+        if parsed is not None and parsed[1] < cutoff:
+            expired.append((parsed[1], channel))
+    expired.sort(key=lambda item: item[0])
+    return [channel for _buy_date, channel in expired]
+
+
+async def clean_up_channels(
+    channels,
+    action,
+    batch_size=DEFAULT_JANITOR_BATCH_SIZE,
+    pause_seconds=DEFAULT_JANITOR_BATCH_PAUSE_SECONDS,
+    sleep=asyncio.sleep,
+):
+    """Await ``action(channel)`` for each channel in small batches. Returns ``(done, failed)``.
+
+    Batches run one channel at a time with a pause between them, so the
+    cleanup spends the channel-edit rate limit slowly instead of bursting into
+    429s that would delay user-facing commands. A 403 stops the run because
+    every later channel would fail the same way.
+    """
+    batch_size = max(1, int(batch_size))
+    done = 0
+    failed = 0
+    for start in range(0, len(channels), batch_size):
+        if start:
+            await sleep(pause_seconds)
+        for channel in channels[start : start + batch_size]:
+            try:
+                await action(channel)
+            except Exception as error:
+                failed += 1
+                if getattr(error, "status", None) == 403:
+                    logger.warning("Missing permission to clean up post channels; stopping.")
+                    return done, failed
+                logger.warning("Could not clean up channel %s.", channel.name, exc_info=True)
+                continue
+            done += 1
+    return done, failed
@@ -1,181 +1,308 @@
-try:
-    import yfinance as yf
-except ModuleNotFoundError:
-    yf = None
+import asyncio
+
+from commands.async_market_data import YahooChartClient, aiohttp
+from commands.bar_store import BarStore, pd
+from commands.cache import TTLCache
+from commands.cancellation import raise_if_cancelled
+from commands.http_session import create_yahoo_session
+from commands.market_providers import YFinanceProvider, create_market_data_provider
+from commands.metadata_cache import CompanyNameCache
+from commands.tracing import span
+
+
+DEFAULT_QUOTE_CACHE_TTL_SECONDS = 15.0
+DEFAULT_QUOTE_CACHE_MAX_ENTRIES = 512
+
+QUOTE_CACHE = TTLCache(
+    ttl_seconds=DEFAULT_QUOTE_CACHE_TTL_SECONDS,
+    max_entries=DEFAULT_QUOTE_CACHE_MAX_ENTRIES,
+)
+COMPANY_NAME_CACHE = CompanyNameCache()
+BAR_STORE = None
+HTTP_SESSION = None
+ASYNC_CLIENT = None
+_async_loads = {}
+
+_provider = YFinanceProvider()
+
+
+def get_market_data_provider():
+    return _provider
+
+
+def set_market_data_provider(provider):
+    """Swap the active provider and drop data cached from the previous one."""
+    global _provider
+
+    _provider = provider
+    QUOTE_CACHE.clear()
+    if BAR_STORE is not None:
+        BAR_STORE.clear()
+    return provider
+
+
+def configure_http_session(
+    connect_timeout_seconds=None,
+    read_timeout_seconds=None,
+    retries=None,
+    backoff_seconds=None,
+):
+    """Create the process-wide Yahoo session and hand it to the active provider."""
+    global HTTP_SESSION
+
+    HTTP_SESSION = create_yahoo_session(
+        connect_timeout_seconds=connect_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        retries=retries,
+        backoff_seconds=backoff_seconds,
+    )
+    if hasattr(_provider, "session"):
+        _provider.session = HTTP_SESSION
+    return HTTP_SESSION
+
+
+def configure_market_data_provider(name=None, fixture_dir=None, latency_seconds=0.0, timeout_seconds=None):
+    provider = create_market_data_provider(
+        name,
+        fixture_dir=fixture_dir,
+        latency_seconds=latency_seconds,
+        timeout_seconds=timeout_seconds,
+        session=HTTP_SESSION,
+    )
+    return set_market_data_provider(provider)
+
+
+def warm_market_data_provider():
+    """Let the provider open connections before the first command; False if it could not."""
+    warm = getattr(_provider, "warm", None)
+    if warm is None:
+        return True
+    try:
+        return bool(warm())
+    except Exception:
+        return False
 
 
-def _get_stock(ticker: str):
-    if yf is None:
-        return None
-    return yf.Ticker(ticker)
+def configure_bar_store(path=None):
+    """Enable the local OHLC bar store at ``path``; ``None`` disables it."""
+    global BAR_STORE
 
+    BAR_STORE = BarStore(path) if path and pd is not None else None
+    return BAR_STORE
 
-def get_latest_price(ticker: str):
-    stock = _get_stock(ticker)
-    if stock is None:
-        return None
 
-    price = None
+def configure_quote_cache(ttl_seconds=None, max_entries=None):
+    QUOTE_CACHE.configure(ttl_seconds=ttl_seconds, max_entries=max_entries)
 
-    try:
-        fast_info = stock.fast_info
-        if fast_info:
-            price = (
-                fast_info.get("last_price")
-                or fast_info.get("lastPrice")
-                or fast_info.get("last_close")
-            )
-    except Exception:
-        price = None
-
-    if price is None:
-        try:
-            info = stock.info or {}
-            price = (
-                info.get("currentPrice")
-                or info.get("regularMarketPrice")
-                or info.get("previousClose")
-            )
-        except Exception:
-            price = None
-
-    if price is None:
-        try:
-            history = stock.history(period="1d")
-            if not history.empty:
-                price = history["Close"].iloc[-1]
-        except Exception:
-            price = None
 
-    return price
+def get_quote_cache_stats():
+    return QUOTE_CACHE.stats()
 
 
-def get_price_snapshot(ticker: str):
-    stock = _get_stock(ticker)
-    if stock is None:
-        return None, None
+@span("market_data.get_latest_price")
+def get_latest_price(ticker: str, cancel_token=None):
+    """Return the cached or freshly fetched latest price.
 
-    last_price = None
-    previous_close = None
+    ``cancel_token`` is checked once before the lookup; a provider request
+    already in flight runs to completion.
+    """
+    raise_if_cancelled(cancel_token)
+    ticker_key = ticker.upper().strip()
+    return QUOTE_CACHE.get_or_load(
+        ("price", ticker_key),
+        lambda: _provider.get_latest_price(ticker_key),
+        cache_if=lambda price: price is not None,
+    )
 
-    try:
-        fast_info = stock.fast_info or {}
-        last_price = (
-            fast_info.get("last_price")
-            or fast_info.get("lastPrice")
-            or fast_info.get("last_close")
-        )
-        previous_close = (
-            fast_info.get("previous_close")
-            or fast_info.get("previousClose")
-        )
-        if previous_close is None:
-            previous_close = fast_info.get("last_close")
-    except Exception:
-        last_price = None
-        previous_close = None
-
-    if last_price is None or previous_close is None:
-        try:
-            info = stock.info or {}
-            if last_price is None:
-                last_price = (
-                    info.get("currentPrice")
-                    or info.get("regularMarketPrice")
-                )
-            if previous_close is None:
-                previous_close = (
-                    info.get("previousClose")
-                    or info.get("regularMarketPreviousClose")
-                )
-        except Exception:
-            pass
-
-    if last_price is None or previous_close is None:
-        try:
-            history = stock.history(period="2d")
-            if not history.empty:
-                if last_price is None:
-                    last_price = history["Close"].iloc[-1]
-                if previous_close is None and len(history) > 1:
-                    previous_close = history["Close"].iloc[-2]
-        except Exception:
-            pass
-
-    return last_price, previous_close
 
+@span("market_data.get_price_snapshot")
+def get_price_snapshot(ticker: str, cancel_token=None):
+    """Return ``(last_price, previous_close)``, cached per ticker.
 
-def get_price_history(ticker: str, period: str = "3mo", interval: str = "1d"):
-    stock = _get_stock(ticker)
-    if stock is None:
-        return None, None
+    Like ``get_latest_price``, ``cancel_token`` is only checked before the lookup.
+    """
+    raise_if_cancelled(cancel_token)
+    ticker_key = ticker.upper().strip()
+    return QUOTE_CACHE.get_or_load(
+        ("snapshot", ticker_key),
+        lambda: _provider.get_price_snapshot(ticker_key),
+        cache_if=lambda snapshot: snapshot[0] is not None,
+    )
 
-    try:
-        history = stock.history(period=period, interval=interval)
-        if history is None or history.empty:
-            return None, None
-
-        close_values = history["Close"].dropna()
-        if close_values.empty:
-            return None, None
-
-        timestamps = close_values.index.to_pydatetime().tolist()
-        prices = [float(value) for value in close_values.tolist()]
-        if not timestamps or not prices:
-            return None, None
-        return timestamps, prices
-    except Exception:
-        return None, None
 
+@span("market_data.get_price_snapshots")
+def get_price_snapshots(tickers, cancel_token=None, refresh=False):
+    """Return ``{TICKER: (last_price, previous_close)}``; misses share one bulk fetch.
+
+    Tickers the provider could not price are absent from the result. With
+    ``refresh`` every ticker is fetched, cached or not.
+    """
+    ticker_keys = list(dict.fromkeys(ticker.upper().strip() for ticker in tickers))
+    snapshots = {}
+    missing = []
+    for ticker_key in ticker_keys:
+        hit, snapshot = (False, None) if refresh else QUOTE_CACHE.get(("snapshot", ticker_key))
+        if hit:
+            snapshots[ticker_key] = snapshot
+        else:
+            missing.append(ticker_key)
+
+    if missing:
+        raise_if_cancelled(cancel_token)
+        fetched = _provider.get_price_snapshots(missing)
+        for ticker_key in missing:
+            snapshot = fetched.get(ticker_key)
+            if snapshot is None or snapshot[0] is None:
+                continue
+            QUOTE_CACHE.set(("snapshot", ticker_key), snapshot)
+            # Same fetch, so seed the latest-price entry used by !rsa as well.
+            QUOTE_CACHE.set(("price", ticker_key), snapshot[0])
+            snapshots[ticker_key] = snapshot
+
+    return snapshots
+
+
+@span("market_data.get_price_history")
+def get_price_history(ticker: str, period: str = "3mo", interval: str = "1d"):
+    return _provider.get_price_history(ticker, period=period, interval=interval)
 
-def get_ohlc_history(ticker: str, period: str = "3mo", interval: str = "1d"):
-    """Return OHLCV dataframe from yfinance history.
+
+@span("market_data.get_ohlc_history")
+def get_ohlc_history(ticker: str, period: str = "3mo", interval: str = "1d", cancel_token=None):
+    """Return OHLCV dataframe from the active market data provider.
 
     Expected columns: Open, High, Low, Close (Volume optional).
-    Returns None if data unavailable.
+    Returns None if data unavailable. With a bar store configured, only bars
+    after the last stored one are fetched and ``period`` is sliced locally.
+    Raises ``OperationCancelled`` if ``cancel_token`` is cancelled before the fetch.
     """
 
-    stock = _get_stock(ticker)
-    if stock is None:
-        return None
+    raise_if_cancelled(cancel_token)
+    if BAR_STORE is None:
+        return _provider.get_ohlc_history(ticker, period=period, interval=interval)
+    return BAR_STORE.get_history(_provider, ticker, period=period, interval=interval)
 
-    try:
-        history = stock.history(period=period, interval=interval)
-        if history is None or history.empty:
-            return None
 
-        keep_cols = [col for col in ("Open", "High", "Low", "Close", "Volume") if col in history.columns]
-        if not keep_cols:
-            return None
+def configure_company_name_cache(
+    path=None,
+    snapshot_path=None,
+    ttl_days=None,
+    negative_ttl_seconds=None,
+):
+    COMPANY_NAME_CACHE.configure(
+        path=path,
+        ttl_days=ttl_days,
+        negative_ttl_seconds=negative_ttl_seconds,
+    )
+    return COMPANY_NAME_CACHE.load(snapshot_path=snapshot_path)
 
-        frame = history[keep_cols].dropna(how="any")
-        if frame.empty:
-            return None
 
-        return frame
-    except Exception:
+@span("market_data.get_company_name")
+def get_company_name(ticker: str):
+    """Return the cached display name, falling back to the ticker on a miss.
+
+    Misses are fetched in the background so callers never wait on ``info``.
+    """
+    ticker_key = ticker.upper().strip()
+    hit, company_name = COMPANY_NAME_CACHE.get(ticker_key)
+    if hit:
+        return company_name or ticker_key
+
+    COMPANY_NAME_CACHE.refresh_in_background(
+        ticker_key,
+        lambda key: _provider.get_company_name(key),
+    )
+    return ticker_key
+
+
+def configure_async_client(
+    enabled=True,
+    connect_timeout_seconds=None,
+    read_timeout_seconds=None,
+    retries=None,
+    backoff_seconds=None,
+    max_connections=None,
+    base_url=None,
+):
+    """Set up the aiohttp chart client used by the ``*_async`` quote functions."""
+    global ASYNC_CLIENT
+
+    ASYNC_CLIENT = None
+    if not enabled or aiohttp is None:
         return None
 
+    options = {
+        "base_url": base_url,
+        "connect_timeout_seconds": connect_timeout_seconds,
+        "read_timeout_seconds": read_timeout_seconds,
+        "retries": retries,
+        "backoff_seconds": backoff_seconds,
+        "max_connections": max_connections,
+    }
+    ASYNC_CLIENT = YahooChartClient(**{key: value for key, value in options.items() if value is not None})
+    return ASYNC_CLIENT
 
-def get_company_name(ticker: str):
-    ticker_key = ticker.upper().strip()
-    stock = _get_stock(ticker_key)
-    if stock is None:
-        return ticker_key
 
-    try:
-        info = stock.info or {}
-        company_name = (
-            info.get("longName")
-            or info.get("shortName")
-            or info.get("displayName")
-            or info.get("name")
+def async_quotes_available():
+    """True when quotes can be awaited directly; the client only speaks to Yahoo."""
+    return ASYNC_CLIENT is not None and getattr(_provider, "name", None) == YFinanceProvider.name
+
+
+async def close_async_client():
+    if ASYNC_CLIENT is not None:
+        await ASYNC_CLIENT.close()
+
+
+async def _load_quote_async(key, loader, cache_if):
+    """Async twin of ``QUOTE_CACHE.get_or_load``: one in-flight request per key."""
+    hit, value = QUOTE_CACHE.get(key)
+    if hit:
+        return value
+
+    task = _async_loads.get(key)
+    if task is None:
+
+        async def load():
+            loaded = await loader()
+            if cache_if(loaded):
+                QUOTE_CACHE.set(key, loaded)
+            return loaded
+
+        task = asyncio.ensure_future(load())
+        _async_loads[key] = task
+        task.add_done_callback(lambda _task: _async_loads.pop(key, None))
+    # Shielded so one caller timing out does not cancel the load for the others.
+    return await asyncio.shield(task)
+
+
+async def get_latest_price_async(ticker: str, executor=None):
+    """Latest price from the async client.
+
+    If the client fails and an ``executor`` is given, ``get_latest_price``
+    is run on it through ``run_cancellable``. The fallback is not shared
+    between callers, so a timed-out command cancels only its own fallback.
+    """
+    ticker_key = ticker.upper().strip()
+    with span("market_data.get_latest_price_async"):
+        price = await _load_quote_async(
+            ("price", ticker_key),
+            lambda: ASYNC_CLIENT.get_latest_price(ticker_key),
+            cache_if=lambda price: price is not None,
         )
-        if company_name:
-            cleaned_name = str(company_name).strip()
-            if cleaned_name:
-                return cleaned_name
-    except Exception:
-        pass
+        if price is None and executor is not None:
+            price = await executor.run_cancellable(get_latest_price, ticker_key)
+    return price
 
-    return ticker_key
+
+async def get_price_snapshot_async(ticker: str, executor=None):
+    """``(last_price, previous_close)`` from the async client, with the same fallback as ``get_latest_price_async``."""
+    ticker_key = ticker.upper().strip()
+    with span("market_data.get_price_snapshot_async"):
+        snapshot = await _load_quote_async(
+            ("snapshot", ticker_key),
+            lambda: ASYNC_CLIENT.get_price_snapshot(ticker_key),
+            cache_if=lambda snapshot: snapshot[0] is not None,
+        )
+        if snapshot[0] is None and executor is not None:
+            snapshot = await executor.run_cancellable(get_price_snapshot, ticker_key)
+    return snapshot
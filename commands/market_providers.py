@@ -0,0 +1,483 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Protocol
+
+try:
+    import yfinance as yf
+    from yfinance.data import YfData
+except ModuleNotFoundError:
+    yf = None
+    YfData = None
+
+try:
+    import pandas as pd
+except ModuleNotFoundError:
+    pd = None
+
+logger = logging.getLogger(__name__)
+
+OHLC_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class MarketDataProvider(Protocol):
+    """Source of quotes and bars used by ``commands.market_data``."""
+
+    name: str
+
+    def get_latest_price(self, ticker: str):
+        """Return the latest price or None."""
+
+    def get_price_snapshot(self, ticker: str):
+        """Return ``(last_price, previous_close)``; either may be None."""
+
+    def get_price_snapshots(self, tickers):
+        """Return ``{ticker: (last_price, previous_close)}`` for many tickers in one request."""
+
+    def get_price_history(self, ticker: str, period: str, interval: str):
+        """Return ``(timestamps, close_prices)`` lists, or ``(None, None)``."""
+
+    def get_ohlc_history(self, ticker: str, period: str, interval: str, start=None):
+        """Return an OHLC(V) dataframe indexed by timestamp, or None.
+
+        When ``start`` is given, return bars from ``start`` onward instead of ``period``.
+        """
+
+    def get_company_name(self, ticker: str):
+        """Return ``(found, name)``; ``found`` is False when the lookup failed."""
+
+
+def clean_ohlc_frame(history):
+    if history is None or history.empty:
+        return None
+
+    keep_cols = [col for col in OHLC_COLUMNS if col in history.columns]
+    if not keep_cols:
+        return None
+
+    frame = history[keep_cols].dropna(how="any")
+    if frame.empty:
+        return None
+    return frame
+
+
+def close_series_to_lists(history):
+    if history is None or history.empty or "Close" not in history.columns:
+        return None, None
+
+    close_values = history["Close"].dropna()
+    if close_values.empty:
+        return None, None
+
+    timestamps = close_values.index.to_pydatetime().tolist()
+    prices = [float(value) for value in close_values.tolist()]
+    if not timestamps or not prices:
+        return None, None
+    return timestamps, prices
+
+
+def slice_period(frame, period: str):
+    """Trim a timestamp-indexed frame to a yfinance-style ``period`` ending at its last row.
+
+    Day periods count trading sessions present in the data, so ``1d`` is the
+    last session rather than the last 24 hours.
+    """
+    if frame is None or frame.empty or pd is None:
+        return frame
+
+    period_key = str(period or "").lower().strip()
+    if period_key == "max":
+        return frame
+
+    last_timestamp = frame.index[-1]
+    if period_key == "ytd":
+        start = last_timestamp.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        return frame[frame.index >= start]
+
+    for suffix, offset_name in (("mo", "months"), ("y", "years"), ("wk", "weeks"), ("d", "days")):
+        if not period_key.endswith(suffix):
+            continue
+        try:
+            count = int(period_key[: -len(suffix)])
+        except ValueError:
+            return frame
+
+        if offset_name == "days":
+            session_dates = frame.index.normalize()
+            kept_dates = session_dates.unique()[-count:]
+            return frame[session_dates.isin(kept_dates)]
+
+        start = last_timestamp - pd.DateOffset(**{offset_name: count})
+        return frame[frame.index > start]
+
+    return frame
+
+
+DEFAULT_UPSTREAM_TIMEOUT_SECONDS = 10.0
+WARM_UP_TICKER = "SPY"
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+# Symbols per multi-symbol quote request; covers a full !rsa_scan in one call.
+QUOTE_BATCH_SIZE = 50
+
+
+class YFinanceProvider:
+    name = "yfinance"
+
+    def __init__(self, timeout_seconds=None, session=None):
+        # Per-request HTTP timeout for history/download calls, so a stalled
+        # upstream does not hold a worker thread past the command timeout.
+        self.timeout_seconds = float(timeout_seconds or DEFAULT_UPSTREAM_TIMEOUT_SECONDS)
+        # Shared HTTP session (see ``commands.http_session``); None lets yfinance build its own.
+        self.session = session
+
+    def _get_stock(self, ticker: str):
+        if yf is None:
+            return None
+        return yf.Ticker(ticker, session=self.session)
+
+    def warm(self):
+        """Open a connection and fetch Yahoo's cookie and crumb ahead of the first command."""
+        return self.get_price_snapshot(WARM_UP_TICKER)[0] is not None
+
+    def get_latest_price(self, ticker: str):
+        stock = self._get_stock(ticker)
+        if stock is None:
+            return None
+
+        price = None
+
+        try:
+            fast_info = stock.fast_info
+            if fast_info:
+                price = (
+                    fast_info.get("last_price")
+                    or fast_info.get("lastPrice")
+                    or fast_info.get("last_close")
+                )
+        except Exception:
+            price = None
+
+        if price is None:
+            try:
+                info = stock.info or {}
+                price = (
+                    info.get("currentPrice")
+                    or info.get("regularMarketPrice")
+                    or info.get("previousClose")
+                )
+            except Exception:
+                price = None
+
+        if price is None:
+            try:
+                history = stock.history(period="1d", timeout=self.timeout_seconds)
+                if not history.empty:
+                    price = history["Close"].iloc[-1]
+            except Exception:
+                price = None
+
+        return price
+
+    def get_price_snapshot(self, ticker: str):
+        stock = self._get_stock(ticker)
+        if stock is None:
+            return None, None
+
+        last_price = None
+        previous_close = None
+
+        try:
+            fast_info = stock.fast_info or {}
+            last_price = (
+                fast_info.get("last_price")
+                or fast_info.get("lastPrice")
+                or fast_info.get("last_close")
+            )
+            previous_close = (
+                fast_info.get("previous_close")
+                or fast_info.get("previousClose")
+            )
+            if previous_close is None:
+                previous_close = fast_info.get("last_close")
+        except Exception:
+            last_price = None
+            previous_close = None
+
+        if last_price is None or previous_close is None:
+            try:
+                info = stock.info or {}
+                if last_price is None:
+                    last_price = (
+                        info.get("currentPrice")
+                        or info.get("regularMarketPrice")
+                    )
+                if previous_close is None:
+                    previous_close = (
+                        info.get("previousClose")
+                        or info.get("regularMarketPreviousClose")
+                    )
+            except Exception:
+                pass
+
+        if last_price is None or previous_close is None:
+            try:
+                history = stock.history(period="2d", timeout=self.timeout_seconds)
+                if not history.empty:
+                    if last_price is None:
+                        last_price = history["Close"].iloc[-1]
+                    if previous_close is None and len(history) > 1:
+                        previous_close = history["Close"].iloc[-2]
+            except Exception:
+                pass
+
+        return last_price, previous_close
+
+    def _fetch_quotes(self, tickers):
+        """Snapshots from Yahoo's multi-symbol quote endpoint, one request per ``QUOTE_BATCH_SIZE`` tickers.
+
+        ``YfData`` supplies the cookie and crumb the endpoint requires.
+        """
+        data = YfData(session=self.session) if self.session is not None else YfData()
+        snapshots = {}
+        for start in range(0, len(tickers), QUOTE_BATCH_SIZE):
+            batch = tickers[start : start + QUOTE_BATCH_SIZE]
+            payload = data.get_raw_json(
+                YAHOO_QUOTE_URL,
+                params={"symbols": ",".join(batch), "formatted": "false"},
+                timeout=self.timeout_seconds,
+            )
+            for quote in ((payload or {}).get("quoteResponse") or {}).get("result") or []:
+                ticker = str(quote.get("symbol") or "").upper()
+                last_price = quote.get("regularMarketPrice")
+                if ticker not in batch or last_price is None:
+                    continue
+                previous_close = quote.get("regularMarketPreviousClose")
+                snapshots[ticker] = (float(last_price), None if previous_close is None else float(previous_close))
+        return snapshots
+
+    def get_price_snapshots(self, tickers):
+        """Snapshots for many tickers from one quote request, falling back to a threaded download."""
+        tickers = list(tickers)
+        if yf is None or not tickers:
+            return {}
+
+        try:
+            return self._fetch_quotes(tickers)
+        except Exception:
+            logger.warning("Bulk quote request failed; falling back to yf.download.", exc_info=True)
+
+        try:
+            history = yf.download(
+                tickers,
+                period="5d",
+                interval="1d",
+                group_by="ticker",
+                auto_adjust=False,
+                progress=False,
+                threads=True,
+                timeout=self.timeout_seconds,
+                session=self.session,
+            )
+        except Exception:
+            return {}
+        if history is None or history.empty:
+            return {}
+
+        snapshots = {}
+        for ticker in tickers:
+            try:
+                if isinstance(history.columns, pd.MultiIndex):
+                    closes = history[ticker]["Close"].dropna()
+                else:
+                    closes = history["Close"].dropna()
+            except KeyError:
+                continue
+            if closes.empty:
+                continue
+            previous_close = float(closes.iloc[-2]) if len(closes) > 1 else None
+            snapshots[ticker] = (float(closes.iloc[-1]), previous_close)
+        return snapshots
+
+    def get_price_history(self, ticker: str, period: str = "3mo", interval: str = "1d"):
+        stock = self._get_stock(ticker)
+        if stock is None:
+            return None, None
+
+        try:
+            return close_series_to_lists(stock.history(period=period, interval=interval, timeout=self.timeout_seconds))
+        except Exception:
+            return None, None
+
+    def get_ohlc_history(self, ticker: str, period: str = "3mo", interval: str = "1d", start=None):
+        stock = self._get_stock(ticker)
+        if stock is None:
+            return None
+
+        try:
+            if start is not None:
+                return clean_ohlc_frame(stock.history(start=start, interval=interval, timeout=self.timeout_seconds))
+            return clean_ohlc_frame(stock.history(period=period, interval=interval, timeout=self.timeout_seconds))
+        except Exception:
+            return None
+
+    def get_company_name(self, ticker: str):
+        stock = self._get_stock(ticker)
+        if stock is None:
+            return False, None
+
+        try:
+            info = stock.info or {}
+        except Exception:
+            return False, None
+
+        company_name = (
+            info.get("longName")
+            or info.get("shortName")
+            or info.get("displayName")
+            or info.get("name")
+        )
+        if company_name:
+            cleaned_name = str(company_name).strip()
+            if cleaned_name:
+                return True, cleaned_name
+
+        return True, None
+
+
+class FixtureProvider:
+    """Replays recorded bars from ``<fixture_dir>`` for offline runs and benchmarks.
+
+    Bars are read from ``<TICKER>_<interval>.csv`` / ``.parquet`` and fall back
+    to ``<TICKER>.csv`` / ``.parquet``; the first column is the timestamp index.
+    Company names come from an optional ``companies.json`` mapping. Every call
+    sleeps ``latency_seconds`` so load tests see a fixed upstream latency.
+    """
+
+    name = "fixture"
+
+    def __init__(self, fixture_dir: str, latency_seconds: float = 0.0):
+        self.fixture_dir = fixture_dir
+        self.latency_seconds = max(0.0, float(latency_seconds or 0.0))
+        self._lock = threading.Lock()
+        self._frames = {}
+        self._company_names = None
+
+    def _simulate_latency(self):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def _read_frame(self, path):
+        if path.endswith(".parquet"):
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_csv(path, index_col=0)
+        if not isinstance(frame.index, pd.DatetimeIndex):
+            frame.index = pd.to_datetime(frame.index, utc=True)
+        return clean_ohlc_frame(frame.sort_index())
+
+    def _load_frame(self, ticker: str, interval=None):
+        if pd is None:
+            return None
+
+        ticker_key = ticker.upper().strip()
+        cache_key = (ticker_key, interval)
+        with self._lock:
+            if cache_key in self._frames:
+                return self._frames[cache_key]
+
+        stems = [ticker_key]
+        if interval:
+            stems.insert(0, f"{ticker_key}_{interval}")
+
+        frame = None
+        for stem in stems:
+            for extension in (".csv", ".parquet"):
+                path = os.path.join(self.fixture_dir, f"{stem}{extension}")
+                if not os.path.exists(path):
+                    continue
+                try:
+                    frame = self._read_frame(path)
+                except Exception:
+                    logger.exception("Could not read market data fixture %s", path)
+                    frame = None
+                break
+            if frame is not None:
+                break
+
+        with self._lock:
+            self._frames[cache_key] = frame
+        return frame
+
+    def get_latest_price(self, ticker: str):
+        self._simulate_latency()
+        frame = self._load_frame(ticker)
+        if frame is None:
+            return None
+        return float(frame["Close"].iloc[-1])
+
+    def get_price_snapshot(self, ticker: str):
+        self._simulate_latency()
+        frame = self._load_frame(ticker)
+        if frame is None:
+            return None, None
+
+        last_price = float(frame["Close"].iloc[-1])
+        session_dates = frame.index.normalize()
+        earlier = frame["Close"][session_dates < session_dates[-1]]
+        previous_close = float(earlier.iloc[-1]) if not earlier.empty else None
+        return last_price, previous_close
+
+    def get_price_snapshots(self, tickers):
+        snapshots = {}
+        for ticker in tickers:
+            if self._load_frame(ticker) is not None:
+                snapshots[ticker] = self.get_price_snapshot(ticker)
+        return snapshots
+
+    def get_price_history(self, ticker: str, period: str = "3mo", interval: str = "1d"):
+        return close_series_to_lists(self.get_ohlc_history(ticker, period=period, interval=interval))
+
+    def get_ohlc_history(self, ticker: str, period: str = "3mo", interval: str = "1d", start=None):
+        self._simulate_latency()
+        frame = self._load_frame(ticker, interval)
+        if frame is None:
+            return None
+        if start is not None:
+            return clean_ohlc_frame(frame[frame.index >= start])
+        return clean_ohlc_frame(slice_period(frame, period))
+
+    def get_company_name(self, ticker: str):
+        self._simulate_latency()
+        with self._lock:
+            if self._company_names is None:
+                names = {}
+                path = os.path.join(self.fixture_dir, "companies.json")
+                try:
+                    with open(path, "r", encoding="utf-8") as names_file:
+                        names = {str(key).upper(): value for key, value in json.load(names_file).items()}
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError):
+                    logger.warning("Could not read fixture company names from %s", path)
+                self._company_names = names
+            company_name = self._company_names.get(ticker.upper().strip())
+        return True, company_name or None
+
+
+def create_market_data_provider(
+    name=None,
+    fixture_dir=None,
+    latency_seconds=0.0,
+    timeout_seconds=None,
+    session=None,
+):
+    provider_name = str(name or YFinanceProvider.name).lower().strip()
+    if provider_name == YFinanceProvider.name:
+        return YFinanceProvider(timeout_seconds=timeout_seconds, session=session)
+    if provider_name == FixtureProvider.name:
+        if not fixture_dir:
+            raise ValueError("MARKET_DATA_FIXTURE_DIR is required for the fixture provider.")
+        return FixtureProvider(fixture_dir, latency_seconds=latency_seconds)
+    raise ValueError(f"Unknown market data provider '{name}'.")
@@ -0,0 +1,167 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAME_TTL_DAYS = 7.0
+DEFAULT_NEGATIVE_TTL_SECONDS = 3600.0
+SECONDS_PER_DAY = 86400.0
+
+
+class CompanyNameCache:
+    """Memory + JSON file cache of ticker display names.
+
+    Entries are ``{"name": str | None, "expires_at": epoch_seconds}``; a ``None``
+    name records an unknown ticker and uses the shorter negative TTL.
+    """
+
+    def __init__(
+        self,
+        path=None,
+        ttl_days=DEFAULT_NAME_TTL_DAYS,
+        negative_ttl_seconds=DEFAULT_NEGATIVE_TTL_SECONDS,
+        clock=time.time,
+    ):
+        self.path = path
+        self.ttl_seconds = float(ttl_days) * SECONDS_PER_DAY
+        self.negative_ttl_seconds = float(negative_ttl_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Serializes file writes so refresh workers never interleave a save.
+        self._save_lock = threading.Lock()
+        self._entries = {}
+        self._pending = set()
+        self._executor = None
+
+    def configure(self, path=None, ttl_days=None, negative_ttl_seconds=None):
+        with self._lock:
+            if path is not None:
+                self.path = path
+            if ttl_days is not None:
+                self.ttl_seconds = float(ttl_days) * SECONDS_PER_DAY
+            if negative_ttl_seconds is not None:
+                self.negative_ttl_seconds = float(negative_ttl_seconds)
+
+    def load(self, snapshot_path=None):
+        """Prefill from an optional snapshot, then from the persisted cache file.
+
+        The snapshot is a plain ``{"TICKER": "Company Name"}`` mapping.
+        """
+        now = self._clock()
+        loaded = {}
+
+        snapshot = _read_json(snapshot_path)
+        if isinstance(snapshot, dict):
+            for ticker, name in snapshot.items():
+                if name:
+                    loaded[str(ticker).upper()] = {
+                        "name": str(name).strip(),
+                        "expires_at": now + self.ttl_seconds,
+                    }
+
+        persisted = _read_json(self.path)
+        if isinstance(persisted, dict):
+            for ticker, entry in persisted.items():
+                if not isinstance(entry, dict) or entry.get("expires_at", 0) <= now:
+                    continue
+                loaded[str(ticker).upper()] = {
+                    "name": entry.get("name"),
+                    "expires_at": float(entry["expires_at"]),
+                }
+
+        with self._lock:
+            self._entries.update(loaded)
+        return len(loaded)
+
+    def get(self, ticker: str):
+        """Return ``(hit, name)``; ``name`` is None for a cached unknown ticker."""
+        ticker_key = ticker.upper().strip()
+        with self._lock:
+            entry = self._entries.get(ticker_key)
+            if entry is None:
+                return False, None
+            if entry["expires_at"] <= self._clock():
+                del self._entries[ticker_key]
+                return False, None
+            return True, entry["name"]
+
+    def set(self, ticker: str, name):
+        ticker_key = ticker.upper().strip()
+        ttl = self.ttl_seconds if name else self.negative_ttl_seconds
+        with self._lock:
+            self._entries[ticker_key] = {
+                "name": name or None,
+                "expires_at": self._clock() + ttl,
+            }
+        self.save()
+
+    def save(self):
+        """Write the entries to ``path`` through a unique temp file and ``os.replace``."""
+        if not self.path:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                payload = dict(self._entries)
+
+            temp_path = None
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "w",
+                    encoding="utf-8",
+                    dir=directory,
+                    prefix=f".{os.path.basename(self.path)}.",
+                    suffix=".tmp",
+                    delete=False,
+                ) as cache_file:
+                    temp_path = cache_file.name
+                    json.dump(payload, cache_file, sort_keys=True)
+                os.replace(temp_path, self.path)
+            except OSError:
+                logger.warning("Could not write company name cache to %s", self.path)
+                if temp_path is not None and os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    def refresh_in_background(self, ticker: str, loader):
+        """Schedule ``loader(ticker)`` once per ticker without blocking the caller."""
+        ticker_key = ticker.upper().strip()
+        with self._lock:
+            if ticker_key in self._pending:
+                return None
+            self._pending.add(ticker_key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="company-name")
+            executor = self._executor
+
+        return executor.submit(self._refresh, ticker_key, loader)
+
+    def _refresh(self, ticker_key, loader):
+        try:
+            found, name = loader(ticker_key)
+            if found:
+                self.set(ticker_key, name)
+        except Exception:
+            logger.exception("Company name refresh failed for %s", ticker_key)
+        finally:
+            with self._lock:
+                self._pending.discard(ticker_key)
+
+
+def _read_json(path):
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Could not read JSON cache file %s", path)
+        return None
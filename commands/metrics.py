@@ -0,0 +1,249 @@
+import bisect
+import logging
+import threading
+
+try:
+    from aiohttp import web
+except ModuleNotFoundError:
+    web = None
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Seconds; tuned around the 20-25s command timeouts.
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0)
+
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(label_names, label_values, extra=()):
+    pairs = list(zip(label_names, label_values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, label_values):
+        if len(label_values) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {label_values}")
+        return tuple(str(value) for value in label_values)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [
+            f"# TYPE {self.name} {self.kind}",
+            f"# HELP {self.name} {self.documentation}",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic count, exposed as ``<name>_total``."""
+
+    kind = "counter"
+
+    def inc(self, *label_values, amount=1.0):
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + float(amount)
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(self._key(label_values), 0.0)
+
+    def _render_samples(self, items):
+        return [
+            f"{self.name}_total{_format_labels(self.label_names, key)} {_format_number(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, *label_values):
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(self._key(label_values))
+
+    def _render_samples(self, items):
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram, one series per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets))
+
+    def observe(self, value, *label_values):
+        key = self._key(label_values)
+        value = float(value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+
+    def count(self, *label_values):
+        with self._lock:
+            series = self._values.get(self._key(label_values))
+            return sum(series["counts"]) if series else 0
+
+    def _render_samples(self, items):
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), series["counts"]):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, (("le", _format_number(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{labels} {_format_number(series['sum'])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the OpenMetrics text format.
+
+    Collectors are called before every render so values that are cheaper to
+    read on demand (cache stats, loop lag) stay current without a timer.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Metrics collector failed.")
+
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+COMMAND_DURATION = REGISTRY.register(
+    Histogram(
+        "splitbot_command_duration_seconds",
+        "Wall time of a command invocation, from argument parsing to the last reply.",
+        ("command",),
+    )
+)
+COMMAND_PHASE_DURATION = REGISTRY.register(
+    Histogram(
+        "splitbot_command_phase_duration_seconds",
+        "Time spent per command phase (fetch, render, send).",
+        ("command", "phase"),
+    )
+)
+COMMAND_TIMEOUTS = REGISTRY.register(
+    Counter("splitbot_command_timeouts", "Commands that hit their timeout.", ("command",))
+)
+COMMAND_ERRORS = REGISTRY.register(
+    Counter(
+        "splitbot_command_errors",
+        "Commands that failed, by kind (error, busy, rate_limited).",
+        ("command", "kind"),
+    )
+)
+CACHE_HIT_RATIO = REGISTRY.register(
+    Gauge(
+        "splitbot_cache_hit_ratio",
+        "Share of cache lookups served without a new load (hits plus coalesced).",
+        ("cache",),
+    )
+)
+CACHE_ENTRIES = REGISTRY.register(Gauge("splitbot_cache_entries", "Entries held per cache.", ("cache",)))
+EVENT_LOOP_LAG = REGISTRY.register(
+    Gauge("splitbot_event_loop_lag_seconds", "Event loop lag measured by the last monitor tick.")
+)
+
+
+def set_cache_stats(cache_name: str, stats):
+    lookups = stats["hits"] + stats["misses"] + stats.get("coalesced", 0)
+    if lookups:
+        CACHE_HIT_RATIO.set((stats["hits"] + stats.get("coalesced", 0)) / lookups, cache_name)
+    CACHE_ENTRIES.set(stats["size"], cache_name)
+
+
+class MetricsServer:
+    """Serves ``REGISTRY`` on ``/metrics`` from the bot's own event loop."""
+
+    def __init__(self, host: str, port: int, registry=REGISTRY):
+        if web is None:
+            raise RuntimeError("aiohttp is required for the metrics endpoint.")
+        self.host = host
+        self.port = int(port)
+        self.registry = registry
+        self._runner = None
+
+    async def _handle_metrics(self, _request):
+        return web.Response(
+            body=self.registry.render().encode("utf-8"),
+            headers={"Content-Type": OPENMETRICS_CONTENT_TYPE},
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -25,6 +25,9 @@ SUPPORTED_DATE_FORMATS_NO_YEAR = (
     "%B %d",
 )
 SUPPORTED_DATE_FORMATS = SUPPORTED_DATE_FORMATS_WITH_YEAR + SUPPORTED_DATE_FORMATS_NO_YEAR
+# A channel may be posted a few days after its buy date, but never a year early.
+POST_CHANNEL_LATE_DAYS = 7
+_POST_CHANNEL_PATTERN = re.compile(rf"^{CLOCK_EMOJI}-([a-z0-9]+)-([a-z]{{3}})-(\d{{1,2}})$")
 
 
 def parse_last_day_to_buy(value: str):
@@ -52,6 +55,29 @@ def parse_last_day_to_buy(value: str):
     return None
 
 
+def parse_split_ratio(split_ratio: str):
+    """Return the share multiplier for a ``small:big`` reverse split ratio such as ``1:10``.
+
+    Raises ``ValueError`` or ``ZeroDivisionError`` for anything else.
+    """
+    split_parts = [part.strip() for part in split_ratio.split(":")]
+    if len(split_parts) != 2:
+        raise ValueError
+
+    numerator = float(split_parts[0])
+    denominator = float(split_parts[1])
+
+    if denominator == 0:
+        raise ZeroDivisionError
+    if numerator <= 0 or denominator <= 0:
+        raise ValueError
+    if numerator >= denominator:
+        raise ValueError
+
+    # Reverse split ratios are expected in small:big format (e.g., 1:10).
+    return denominator / numerator
+
+
 def build_post_channel_name(ticker: str, buy_date):
     ticker_key = str(ticker or "").strip().upper()
     sanitized_ticker = re.sub(r"[^A-Z0-9]", "", ticker_key).lower()
@@ -63,6 +89,41 @@ def build_post_channel_name(ticker: str, buy_date):
     return f"{CLOCK_EMOJI}-{sanitized_ticker}-{month_label}-{day_label}"
 
 
+def parse_post_channel_name(channel_name: str, today=None, created_on=None):
+    """Return ``(TICKER, buy_date)`` for a name built by ``build_post_channel_name``, else None.
+
+    Channel names carry no year. With ``created_on`` (the channel's creation
+    date) the buy date is the first matching date on or shortly before it;
+    otherwise the year putting the date closest to ``today`` is used. Returns
+    None when no year fits, e.g. a Feb 29 name far from a leap year.
+    """
+    match = _POST_CHANNEL_PATTERN.match(str(channel_name or ""))
+    if match is None:
+        return None
+    ticker_label, month_label, day_label = match.groups()
+    try:
+        month = dt.datetime.strptime(month_label, "%b").month
+    except ValueError:
+        return None
+
+    anchor = created_on or today or dt.date.today()
+    candidates = []
+    for year in (anchor.year - 1, anchor.year, anchor.year + 1):
+        try:
+            candidates.append(dt.date(year, month, int(day_label)))
+        except ValueError:
+            continue
+    if not candidates:
+        return None
+    if created_on is not None:
+        earliest = created_on - dt.timedelta(days=POST_CHANNEL_LATE_DAYS)
+        buy_date = min((candidate for candidate in candidates if candidate >= earliest), default=None)
+        if buy_date is None:
+            return None
+        return ticker_label.upper(), buy_date
+    return ticker_label.upper(), min(candidates, key=lambda candidate: abs((candidate - anchor).days))
+
+
 def build_reverse_split_announcement(ticker: str, split_ratio: str, buy_date, source_link: str):
     ticker_key = str(ticker or "").strip().upper()
     split_ratio_value = str(split_ratio or "").strip()
@@ -0,0 +1,61 @@
+import datetime as dt
+
+from commands.cancellation import raise_if_cancelled
+from commands.market_data import get_company_name, get_price_snapshots
+from commands.post import parse_post_channel_name
+
+DEFAULT_PREWARM_INTERVAL_SECONDS = 60.0
+DEFAULT_PREWARM_DAYS_AHEAD = 3
+DEFAULT_PREWARM_MAX_TICKERS = 10
+# Warmed quotes are refreshed after this share of the quote TTL, before they expire.
+QUOTE_REFRESH_FRACTION = 0.8
+MIN_QUOTE_REFRESH_SECONDS = 5.0
+# The periods people chart around a buy deadline; both use intraday bars.
+PREWARM_CHART_PERIODS = ("1d", "5d")
+
+
+def collect_prewarm_tickers(
+    registry=None,
+    channel_names=(),
+    today=None,
+    days_ahead=DEFAULT_PREWARM_DAYS_AHEAD,
+    max_tickers=DEFAULT_PREWARM_MAX_TICKERS,
+):
+    """Tickers whose last day to buy falls within ``days_ahead`` days, soonest first.
+
+    Buy dates come from the split registry and from ``⏰-ticker-mon-day``
+    channel names, so channels posted before the registry existed still count.
+    """
+    today = today or dt.date.today()
+    last_day = today + dt.timedelta(days=days_ahead)
+    due = {}
+    if registry is not None:
+        for ticker_key, buy_date in registry.tickers_due(today, last_day):
+            due[ticker_key] = buy_date
+    for channel_name in channel_names:
+        parsed = parse_post_channel_name(channel_name, today)
+        if parsed is None:
+            continue
+        ticker_key, buy_date = parsed
+        if today <= buy_date <= last_day and buy_date < due.get(ticker_key, dt.date.max):
+            due[ticker_key] = buy_date
+    return sorted(due, key=lambda ticker_key: (due[ticker_key], ticker_key))[:max_tickers]
+
+
+def quote_refresh_interval(quote_ttl_seconds):
+    """Seconds between ``prewarm_quotes`` runs so warmed quotes are replaced before they expire."""
+    return max(MIN_QUOTE_REFRESH_SECONDS, float(quote_ttl_seconds) * QUOTE_REFRESH_FRACTION)
+
+
+def prewarm_quotes(tickers, cancel_token=None):
+    """Refresh quotes for ``tickers`` in one bulk fetch and load their company names.
+
+    Quotes are fetched even when cached and keep the configured quote TTL;
+    run this every ``quote_refresh_interval`` to keep them warm. Returns the
+    number of tickers that could be priced.
+    """
+    snapshots = get_price_snapshots(tickers, cancel_token=cancel_token, refresh=True)
+    for ticker_key in tickers:
+        raise_if_cancelled(cancel_token)
+        get_company_name(ticker_key)
+    return len(snapshots)
@@ -1,19 +1,26 @@
 from commands.formatting import format_error, format_response
-from commands.market_data import get_price_snapshot
+from commands.market_data import get_price_snapshot, get_price_snapshot_async, get_price_snapshots
+from commands.tracing import span
 
-def get_stock_price(ticker: str):
-    ticker_key = ticker.upper()
-    last_price, previous_close = get_price_snapshot(ticker_key)
+MAX_PRICE_TICKERS = 10
+
+
+def _format_daily_change(last_price, previous_close):
+    if previous_close is None or float(previous_close) == 0.0:
+        return None
 
+    change_amount = float(last_price) - float(previous_close)
+    change_percent = (change_amount / float(previous_close)) * 100
+    sign = "+" if change_amount >= 0 else "-"
+    return f"{sign}${abs(change_amount):.2f} ({sign}{abs(change_percent):.2f}%)"
+
+
+def _format_stock_price(ticker_key, last_price, previous_close):
     if last_price is not None:
         lines = [f"Last Price: ${float(last_price):.2f}"]
-        if previous_close is not None and float(previous_close) != 0.0:
-            change_amount = float(last_price) - float(previous_close)
-            change_percent = (change_amount / float(previous_close)) * 100
-            sign = "+" if change_amount >= 0 else "-"
-            lines.append(
-                f"Daily Change: {sign}${abs(change_amount):.2f} ({sign}{abs(change_percent):.2f}%)"
-            )
+        daily_change = _format_daily_change(last_price, previous_close)
+        if daily_change is not None:
+            lines.append(f"Daily Change: {daily_change}")
         else:
             lines.append("Daily Change: unavailable")
         response = format_response(
@@ -25,5 +32,64 @@ def get_stock_price(ticker: str):
             "Price Lookup",
             f"Could not retrieve the last price for ticker {ticker_key}.",
         )
-    
+
     return response
+
+
+def get_stock_price(ticker: str, cancel_token=None):
+    ticker_key = ticker.upper()
+    with span("price.fetch", phase="fetch"):
+        last_price, previous_close = get_price_snapshot(ticker_key, cancel_token=cancel_token)
+    return _format_stock_price(ticker_key, last_price, previous_close)
+
+
+async def get_stock_price_async(ticker: str, executor=None):
+    """``get_stock_price`` for the event loop, using the async quote client.
+
+    ``executor`` runs the threaded fallback when the async request fails.
+    """
+    ticker_key = ticker.upper()
+    with span("price.fetch", phase="fetch"):
+        last_price, previous_close = await get_price_snapshot_async(ticker_key, executor=executor)
+    return _format_stock_price(ticker_key, last_price, previous_close)
+
+
+def _normalize_price_tickers(tickers):
+    """Return ``(ticker_keys, error_response)``."""
+    ticker_keys = list(dict.fromkeys(ticker.upper().strip() for ticker in tickers if ticker.strip()))
+    if not ticker_keys:
+        return None, format_error("Price Lookup", "Provide at least one ticker.")
+    if len(ticker_keys) > MAX_PRICE_TICKERS:
+        return None, format_error(
+            "Price Lookup",
+            f"Too many tickers. Provide at most {MAX_PRICE_TICKERS} per request.",
+        )
+    return ticker_keys, None
+
+
+def get_stock_prices(tickers, cancel_token=None):
+    ticker_keys, error_response = _normalize_price_tickers(tickers)
+    if error_response is not None:
+        return error_response
+
+    with span("price.fetch", phase="fetch"):
+        snapshots = get_price_snapshots(ticker_keys, cancel_token=cancel_token)
+    return format_response("Prices", format_price_lines(ticker_keys, snapshots))
+
+
+def format_price_lines(ticker_keys, snapshots):
+    """One ``TICKER: $price change`` line per ticker, in order."""
+    lines = []
+    for ticker_key in ticker_keys:
+        snapshot = snapshots.get(ticker_key)
+        if snapshot is None:
+            lines.append(f"{ticker_key}: unavailable")
+            continue
+
+        last_price, previous_close = snapshot
+        line = f"{ticker_key}: ${float(last_price):.2f}"
+        daily_change = _format_daily_change(last_price, previous_close)
+        if daily_change is not None:
+            line = f"{line} {daily_change}"
+        lines.append(line)
+    return lines
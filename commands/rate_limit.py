@@ -0,0 +1,237 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_COMMAND_COSTS = {
+    "chart": 3.0,
+    "price": 1.0,
+    "watch": 3.0,
+    "rsa": 1.0,
+    "rsa_scan": 3.0,
+    "health": 1.0,
+    "test_all": 5.0,
+}
+DEFAULT_COMMAND_COST = 1.0
+# Commands that never touch the worker pools.
+FREE_COMMANDS = ("help", "usercount", "post", "unwatch")
+DEFAULT_USER_RATE = (6.0, 60.0)
+DEFAULT_CHANNEL_RATE = (20.0, 60.0)
+DEFAULT_GUILD_RATE = (60.0, 60.0)
+MAX_TRACKED_BUCKETS = 10000
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a request is over its limit and cannot be queued."""
+
+    def __init__(self, retry_after: float, reason: str = "rate limited"):
+        super().__init__(reason)
+        self.retry_after = max(0.0, float(retry_after))
+        self.reason = reason
+
+
+def parse_rate(value, default):
+    """Parse ``"<tokens>/<seconds>"`` (e.g. ``6/60``) into ``(tokens, seconds)``."""
+    if value is None or not value.strip():
+        return default
+    try:
+        tokens, seconds = (float(part) for part in value.split("/", 1))
+    except ValueError:
+        return default
+    if tokens <= 0 or seconds <= 0:
+        return default
+    return tokens, seconds
+
+
+def parse_costs(value, defaults=DEFAULT_COMMAND_COSTS):
+    """Parse ``"chart=3,price=1"`` over ``defaults``; malformed pairs are ignored."""
+    costs = dict(defaults)
+    for pair in (value or "").split(","):
+        name, _, cost = pair.partition("=")
+        try:
+            costs[name.strip().lower()] = max(0.0, float(cost))
+        except ValueError:
+            continue
+    return costs
+
+
+class TokenBucket:
+    """Holds up to ``capacity`` tokens, refilled at ``capacity / per_seconds`` per second."""
+
+    def __init__(self, capacity: float, per_seconds: float, now: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = self.capacity / float(per_seconds)
+        self.tokens = self.capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated = now
+
+    def wait_time(self, cost: float):
+        """Seconds until ``cost`` tokens are available (0 when they are now)."""
+        cost = min(cost, self.capacity)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.refill_per_second
+
+    def take(self, cost: float):
+        self.tokens -= min(cost, self.capacity)
+
+    @property
+    def is_full(self):
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    """Token buckets per user, channel and guild with per-command costs.
+
+    A request is admitted only if every bucket it touches has enough tokens,
+    and then all of them are charged, so a refusal never spends tokens.
+    """
+
+    def __init__(
+        self,
+        user_rate=DEFAULT_USER_RATE,
+        channel_rate=DEFAULT_CHANNEL_RATE,
+        guild_rate=DEFAULT_GUILD_RATE,
+        command_costs=None,
+        clock=time.monotonic,
+    ):
+        self.rates = {"user": user_rate, "channel": channel_rate, "guild": guild_rate}
+        self.command_costs = dict(DEFAULT_COMMAND_COSTS if command_costs is None else command_costs)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def cost_for(self, command_name: str):
+        if command_name in FREE_COMMANDS:
+            return 0.0
+        return self.command_costs.get(command_name, DEFAULT_COMMAND_COST)
+
+    def _bucket(self, scope: str, scope_id, now: float):
+        key = (scope, scope_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*self.rates[scope], now=now)
+        else:
+            self._buckets.move_to_end(key)
+        bucket.refill(now)
+        return bucket
+
+    def _prune(self):
+        # Full buckets behave exactly like missing ones, so they are safe to drop.
+        while len(self._buckets) > MAX_TRACKED_BUCKETS:
+            key, bucket = next(iter(self._buckets.items()))
+            bucket.refill(self._clock())
+            if not bucket.is_full:
+                break
+            self._buckets.popitem(last=False)
+
+    def try_acquire(self, command_name: str, user_id, channel_id, guild_id=None):
+        """Charge the request and return 0.0, or return the seconds to wait without charging."""
+        cost = self.cost_for(command_name)
+        if cost <= 0:
+            return 0.0
+
+        scopes = [("user", user_id), ("channel", channel_id)]
+        if guild_id is not None:
+            scopes.append(("guild", guild_id))
+
+        with self._lock:
+            now = self._clock()
+            buckets = [self._bucket(scope, scope_id, now) for scope, scope_id in scopes]
+            retry_after = max(bucket.wait_time(cost) for bucket in buckets)
+            if retry_after > 0:
+                return retry_after
+            for bucket in buckets:
+                bucket.take(cost)
+            self._prune()
+            return 0.0
+
+
+class FairQueue:
+    """Waits out rate limits in per-user round-robin order.
+
+    Over-limit requests queue behind their own user's earlier requests; when
+    capacity frees up, users take turns, so one user's backlog cannot starve
+    everyone else. Each user may hold at most ``max_per_user`` queued requests,
+    and a request that waits longer than ``max_wait_seconds`` is refused.
+    """
+
+    def __init__(self, limiter: RateLimiter, max_per_user=3, max_wait_seconds=30.0):
+        self.limiter = limiter
+        self.max_per_user = max(0, int(max_per_user))
+        self.max_wait_seconds = float(max_wait_seconds)
+        self._queues = OrderedDict()
+        self._wakeup = None
+        self._drainer = None
+
+    def queued_count(self):
+        return sum(len(waiters) for waiters in self._queues.values())
+
+    async def acquire(self, command_name: str, user_id, channel_id, guild_id=None):
+        request = (command_name, user_id, channel_id, guild_id)
+        if not self._queues:
+            retry_after = self.limiter.try_acquire(*request)
+            if retry_after == 0:
+                return
+        else:
+            retry_after = self.max_wait_seconds
+
+        user_queue = self._queues.get(user_id)
+        queued_for_user = len(user_queue) if user_queue is not None else 0
+        if queued_for_user >= self.max_per_user:
+            raise RateLimitExceeded(retry_after, "queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(user_id, deque()).append((request, future))
+        self._ensure_drainer()
+        try:
+            await asyncio.wait_for(future, timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            raise RateLimitExceeded(retry_after, "queue wait too long") from None
+
+    def _ensure_drainer(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.get_running_loop().create_task(self._drain())
+
+    def _grant_next(self):
+        """Admit the first user in rotation whose head request fits. Returns the shortest wait otherwise."""
+        shortest_wait = None
+        for user_id in list(self._queues):
+            user_queue = self._queues[user_id]
+            while user_queue and user_queue[0][1].done():
+                user_queue.popleft()
+            if not user_queue:
+                del self._queues[user_id]
+                continue
+
+            request, future = user_queue[0]
+            retry_after = self.limiter.try_acquire(*request)
+            if retry_after == 0:
+                user_queue.popleft()
+                future.set_result(None)
+                # Send this user to the back of the rotation.
+                del self._queues[user_id]
+                if user_queue:
+                    self._queues[user_id] = user_queue
+                return 0.0
+            if shortest_wait is None or retry_after < shortest_wait:
+                shortest_wait = retry_after
+        return shortest_wait
+
+    async def _drain(self):
+        while self._queues:
+            wait = self._grant_next()
+            if wait is None or wait == 0:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
@@ -1,30 +1,213 @@
+import csv
+import datetime as dt
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+from commands.cancellation import raise_if_cancelled
 from commands.formatting import format_error, format_response
-from commands.market_data import get_latest_price
+from commands.market_data import get_latest_price, get_latest_price_async, get_price_snapshots
+from commands.post import format_buy_date_short, parse_last_day_to_buy, parse_split_ratio
+from commands.tracing import span
+
+
+MAX_SCAN_ROWS = 50
+MAX_SCAN_DISPLAY_ROWS = 20
+MAX_SCAN_ATTACHMENT_BYTES = 64 * 1024
+ROUNDING_POLICIES = (("round_up", "up"), ("cash_in_lieu", "cash"))
+DEFAULT_GRID_ACCOUNTS = 5
+MAX_GRID_ACCOUNTS = 10
+DEFAULT_GRID_MOVE_PERCENT = 10.0
+GRID_MOVE_STEPS = 5
+MAX_GRID_RATIOS = 4
+
+
+def parse_rsa_options(options):
+    """Parse ``!rsa`` flags into ``(grid_settings_or_None, error_response)``.
+
+    ``--grid`` turns the grid on; ``--accounts N`` and ``--move X`` (percent)
+    size it and also accept the ``--flag=value`` form.
+    """
+    grid = False
+    accounts = DEFAULT_GRID_ACCOUNTS
+    move_percent = DEFAULT_GRID_MOVE_PERCENT
+    tokens = []
+    for option in options:
+        tokens.extend(option.split("=", 1) if option.startswith("--") else [option])
+
+    index = 0
+    try:
+        while index < len(tokens):
+            flag = tokens[index].lower()
+            if flag == "--grid":
+                grid = True
+            elif flag == "--accounts":
+                index += 1
+                accounts = int(tokens[index])
+            elif flag == "--move":
+                index += 1
+                move_percent = float(tokens[index].rstrip("%"))
+            else:
+                return None, format_error("Reverse Split Arbitrage", f"Unknown option `{tokens[index]}`.")
+            index += 1
+    except (IndexError, ValueError):
+        return None, format_error(
+            "Reverse Split Arbitrage",
+            "Invalid grid options. Example: `!rsa AAPL 1:10,1:20 --grid --accounts 5 --move 10`.",
+        )
+
+    if not grid:
+        return None, None
+    if not 1 <= accounts <= MAX_GRID_ACCOUNTS or not 0 <= move_percent < 100:
+        return None, format_error(
+            "Reverse Split Arbitrage",
+            f"Use 1-{MAX_GRID_ACCOUNTS} accounts and a price move below 100%.",
+        )
+    return {"accounts": accounts, "move_percent": move_percent}, None
+
 
+def rsa_scenario_grid(price, ratio_values, moves, account_counts):
+    """Profit for every (policy, ratio, move, accounts) scenario, holding one share per account.
 
-def _parse_split_ratio(split_ratio: str):
-    split_parts = [part.strip() for part in split_ratio.split(":")]
-    if len(split_parts) != 2:
-        raise ValueError
+    Round-up brokers turn the fractional share into one post-split share worth
+    ``price * ratio * (1 + move)``; cash-in-lieu brokers pay out the fraction at
+    the post-split price, which nets ``price * move``. The result has shape
+    ``(len(ROUNDING_POLICIES), len(ratio_values), len(moves), len(account_counts))``.
+    """
+    price = float(price)
+    ratios = np.asarray(ratio_values, dtype=float)[:, None]
+    moves = np.asarray(moves, dtype=float)[None, :]
+    round_up = price * ratios * (1.0 + moves) - price
+    cash_in_lieu = np.broadcast_to(price * moves, round_up.shape)
+    per_account = np.stack((round_up, cash_in_lieu))
+    return per_account[..., None] * np.asarray(account_counts, dtype=float)
 
-    numerator = float(split_parts[0])
-    denominator = float(split_parts[1])
 
-    if denominator == 0:
-        raise ZeroDivisionError
-    if numerator <= 0 or denominator <= 0:
-        raise ValueError
-    if numerator >= denominator:
-        raise ValueError
+def _format_grid_money(value):
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    if value >= 10000:
+        return f"{sign}${value / 1000:.0f}k"
+    if value >= 1000:
+        return f"{sign}${value / 1000:.1f}k"
+    return f"{sign}${value:.2f}"
 
-    # Reverse split ratios are expected in small:big format (e.g., 1:10).
-    return denominator / numerator
 
+def _format_grid_table(row_labels, column_labels, values):
+    cells = [[_format_grid_money(value) for value in row] for row in values]
+    label_width = max(len(label) for label in row_labels)
+    widths = [
+        max(len(column_labels[column]), *(len(row[column]) for row in cells))
+        for column in range(len(column_labels))
+    ]
+    lines = [" " * label_width + "".join(f" {label:>{width}}" for label, width in zip(column_labels, widths))]
+    for label, row in zip(row_labels, cells):
+        lines.append(f"{label:<{label_width}}" + "".join(f" {cell:>{width}}" for cell, width in zip(row, widths)))
+    return "\n".join(lines)
 
-def calculate_reverse_split_arbitrage(ticker: str, split_ratio: str):
+
+def _parse_grid_ratios(split_ratios):
+    """Return ``(labels, values, error_response)`` for a comma-separated ratio list."""
+    labels = list(dict.fromkeys(part.strip() for part in split_ratios.split(",") if part.strip()))
+    if not labels or len(labels) > MAX_GRID_RATIOS:
+        return None, None, format_error(
+            "Reverse Split Arbitrage",
+            f"Provide 1-{MAX_GRID_RATIOS} comma-separated ratios (example: 1:10,1:20).",
+        )
+    values = []
+    for label in labels:
+        try:
+            values.append(parse_split_ratio(label))
+        except (ValueError, ZeroDivisionError):
+            return None, None, format_error(
+                "Reverse Split Arbitrage",
+                f"Invalid split ratio `{label}`. Use 'small:big' with positive numbers (example: 1:10).",
+            )
+    return labels, values, None
+
+
+def calculate_reverse_split_arbitrage(ticker: str, split_ratio: str, cancel_token=None):
+    ticker_key = ticker.upper()
+    with span("rsa.fetch", phase="fetch"):
+        current_price = get_latest_price(ticker_key, cancel_token=cancel_token)
+    return _build_rsa_response(ticker_key, split_ratio, current_price)
+
+
+async def calculate_reverse_split_arbitrage_async(ticker: str, split_ratio: str, executor=None):
     ticker_key = ticker.upper()
-    current_price = get_latest_price(ticker_key)
+    with span("rsa.fetch", phase="fetch"):
+        current_price = await get_latest_price_async(ticker_key, executor=executor)
+    return _build_rsa_response(ticker_key, split_ratio, current_price)
+
+
+def calculate_rsa_grid(
+    ticker: str,
+    split_ratios: str,
+    accounts=DEFAULT_GRID_ACCOUNTS,
+    move_percent=DEFAULT_GRID_MOVE_PERCENT,
+    cancel_token=None,
+):
+    ticker_key = ticker.upper()
+    labels, ratio_values, error_response = _parse_grid_ratios(split_ratios)
+    if error_response is not None:
+        return error_response
+    with span("rsa.fetch", phase="fetch"):
+        current_price = get_latest_price(ticker_key, cancel_token=cancel_token)
+    return _build_rsa_grid_response(ticker_key, labels, ratio_values, current_price, accounts, move_percent)
+
+
+async def calculate_rsa_grid_async(
+    ticker: str,
+    split_ratios: str,
+    accounts=DEFAULT_GRID_ACCOUNTS,
+    move_percent=DEFAULT_GRID_MOVE_PERCENT,
+    executor=None,
+):
+    ticker_key = ticker.upper()
+    labels, ratio_values, error_response = _parse_grid_ratios(split_ratios)
+    if error_response is not None:
+        return error_response
+    with span("rsa.fetch", phase="fetch"):
+        current_price = await get_latest_price_async(ticker_key, executor=executor)
+    return _build_rsa_grid_response(ticker_key, labels, ratio_values, current_price, accounts, move_percent)
+
 
+def _build_rsa_grid_response(ticker_key, labels, ratio_values, current_price, accounts, move_percent):
+    if np is None:
+        return format_error("Reverse Split Arbitrage", "The scenario grid needs NumPy installed.")
+    if current_price is None:
+        return format_error(
+            "Reverse Split Arbitrage",
+            f"Could not retrieve the current price for ticker {ticker_key}.",
+        )
+
+    moves = np.linspace(-move_percent, move_percent, GRID_MOVE_STEPS) / 100.0
+    account_counts = np.arange(1, accounts + 1)
+    with span("rsa.grid"):
+        profits = rsa_scenario_grid(current_price, ratio_values, moves, account_counts)
+
+    row_labels = [f"{label} {short}" for _policy, short in ROUNDING_POLICIES for label in labels]
+    # Rows are policy-major to match the grid's first two axes.
+    by_move = profits[:, :, :, 0].reshape(-1, len(moves))
+    flat_move = int(np.argmin(np.abs(moves)))
+    by_accounts = profits[:, :, flat_move, :].reshape(-1, len(account_counts))
+
+    move_table = _format_grid_table(row_labels, [f"{move * 100:+.0f}%" for move in moves], by_move)
+    account_table = _format_grid_table(row_labels, [f"x{count}" for count in account_counts], by_accounts)
+    return format_response(
+        f"Reverse Split Arbitrage Grid for {ticker_key}",
+        [
+            f"Current Price: ${float(current_price):.2f}",
+            "One share per account. `up` = broker rounds up to a whole share, `cash` = cash in lieu.",
+        ],
+        f"Profit per account by price move:\n```\n{move_table}\n```\n"
+        f"Profit by account count, price flat:\n```\n{account_table}\n```",
+    )
+
+
+def _build_rsa_response(ticker_key, split_ratio, current_price):
     if current_price is None:
         return format_error(
             "Reverse Split Arbitrage",
@@ -32,7 +215,7 @@ def calculate_reverse_split_arbitrage(ticker: str, split_ratio: str):
         )
 
     try:
-        split_ratio_value = _parse_split_ratio(split_ratio)
+        split_ratio_value = parse_split_ratio(split_ratio)
     except ZeroDivisionError:
         return format_error(
             "Reverse Split Arbitrage",
@@ -52,3 +235,95 @@ def calculate_reverse_split_arbitrage(ticker: str, split_ratio: str):
             f"Estimated Profitability: ${profitability:.2f}",
         ],
     )
+
+
+def parse_scan_rows(text: str):
+    """Parse ``ticker, ratio[, last day to buy]`` lines into ``(rows, error_response)``.
+
+    Lines may be CSV or whitespace separated; a header row and blank lines are
+    skipped. Each row is ``(ticker, ratio_label, buy_date_or_None)``.
+    """
+    rows = []
+    for line in str(text or "").splitlines():
+        line = line.strip().strip("`")
+        if not line:
+            continue
+        if "," in line:
+            fields = [field.strip() for field in next(csv.reader([line]))]
+        else:
+            parts = line.split()
+            fields = parts[:2] + ([" ".join(parts[2:])] if len(parts) > 2 else [])
+        if len(fields) < 2 or fields[0].lower() in ("ticker", "symbol"):
+            continue
+        ticker_key = fields[0].upper()
+        buy_date = parse_last_day_to_buy(fields[2]) if len(fields) > 2 else None
+        rows.append((ticker_key, fields[1], buy_date))
+
+    if not rows:
+        return None, format_error(
+            "RSA Scan",
+            "No rows found. Paste lines like `AAPL 1:10 2026-02-20` or attach a CSV with ticker,ratio,last_day_to_buy.",
+        )
+    if len(rows) > MAX_SCAN_ROWS:
+        return None, format_error("RSA Scan", f"Too many rows. Scan at most {MAX_SCAN_ROWS} at a time.")
+    return rows, None
+
+
+def scan_reverse_splits(rows, cancel_token=None):
+    """Rank scan rows by estimated profit from one batched price fetch."""
+    if np is None:
+        return format_error("RSA Scan", "The screener needs NumPy installed.")
+
+    ratio_values = []
+    skipped = []
+    valid_rows = []
+    for ticker_key, ratio_label, buy_date in rows:
+        try:
+            ratio_values.append(parse_split_ratio(ratio_label))
+        except (ValueError, ZeroDivisionError):
+            skipped.append(f"{ticker_key} (bad ratio {ratio_label})")
+            continue
+        valid_rows.append((ticker_key, ratio_label, buy_date))
+
+    with span("rsa.fetch", phase="fetch"):
+        snapshots = get_price_snapshots([row[0] for row in valid_rows], cancel_token=cancel_token) if valid_rows else {}
+    raise_if_cancelled(cancel_token)
+
+    prices = np.array(
+        [snapshots[row[0]][0] if row[0] in snapshots else np.nan for row in valid_rows],
+        dtype=float,
+    )
+    profits = prices * (np.asarray(ratio_values, dtype=float) - 1)
+    priced = ~np.isnan(profits)
+    skipped.extend(f"{row[0]} (no price)" for row, has_price in zip(valid_rows, priced) if not has_price)
+
+    order = [index for index in np.argsort(-profits, kind="stable") if priced[index]]
+    today = dt.date.today()
+    table_rows = []
+    for index in order[:MAX_SCAN_DISPLAY_ROWS]:
+        ticker_key, ratio_label, buy_date = valid_rows[index]
+        if buy_date is None:
+            buy_label = "-"
+        else:
+            buy_label = format_buy_date_short(buy_date) + (" (past)" if buy_date < today else "")
+        table_rows.append(
+            (ticker_key, ratio_label, buy_label, f"${prices[index]:.2f}", _format_grid_money(profits[index]))
+        )
+
+    lines = [f"Ranked {len(order)} of {len(rows)} rows by estimated profit per account."]
+    if len(order) > MAX_SCAN_DISPLAY_ROWS:
+        lines.append(f"Showing the top {MAX_SCAN_DISPLAY_ROWS}.")
+    if skipped:
+        lines.append(f"Skipped: {', '.join(skipped)}")
+    footer = None
+    if table_rows:
+        footer = f"```\n{_format_text_table(('Ticker', 'Ratio', 'Buy By', 'Price', 'Profit'), table_rows)}\n```"
+    return format_response("RSA Scan", lines, footer)
+
+
+def _format_text_table(headers, rows):
+    widths = [max(len(headers[column]), *(len(row[column]) for row in rows)) for column in range(len(headers))]
+    lines = [" ".join(f"{header:<{width}}" for header, width in zip(headers, widths)).rstrip()]
+    for row in rows:
+        lines.append(" ".join(f"{cell:<{width}}" for cell, width in zip(row, widths)).rstrip())
+    return "\n".join(lines)
@@ -0,0 +1,142 @@
+import datetime as dt
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from commands.formatting import format_error, format_response
+from commands.post import format_buy_date_short
+
+MAX_SPLIT_ROWS = 15
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS splits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    ticker TEXT NOT NULL,
+    split_ratio TEXT NOT NULL,
+    buy_date TEXT NOT NULL,
+    source_url TEXT,
+    channel_id INTEGER,
+    created_by INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS splits_guild_ticker_date ON splits (guild_id, ticker, buy_date);
+CREATE INDEX IF NOT EXISTS splits_guild_date ON splits (guild_id, buy_date);
+CREATE INDEX IF NOT EXISTS splits_buy_date ON splits (buy_date);
+"""
+_COLUMNS = ("ticker", "split_ratio", "buy_date", "source_url", "channel_id", "created_by", "created_at")
+
+
+def _row_to_split(row):
+    split = dict(zip(_COLUMNS, row))
+    split["buy_date"] = dt.date.fromisoformat(split["buy_date"])
+    return split
+
+
+class SplitRegistry:
+    """SQLite record of reverse splits announced with ``!post``.
+
+    Buy dates are stored as ISO strings so the ``(guild_id, buy_date)`` index
+    answers "upcoming" range scans and ``(guild_id, ticker, buy_date)`` answers
+    per-ticker lookups. Posting the same ticker and buy date again updates the row.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record(self, guild_id, ticker, split_ratio, buy_date, source_url=None, channel_id=None, created_by=None):
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT INTO splits "
+                "(guild_id, ticker, split_ratio, buy_date, source_url, channel_id, created_by, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, ticker, buy_date) DO UPDATE SET "
+                "split_ratio = excluded.split_ratio, source_url = excluded.source_url, "
+                "channel_id = COALESCE(excluded.channel_id, splits.channel_id), "
+                "created_by = excluded.created_by, created_at = excluded.created_at",
+                (
+                    guild_id,
+                    ticker.strip().upper(),
+                    split_ratio.strip(),
+                    buy_date.isoformat(),
+                    source_url,
+                    channel_id,
+                    created_by,
+                    time.time(),
+                ),
+            )
+
+    def upcoming(self, guild_id, from_date, limit=MAX_SPLIT_ROWS):
+        """Splits whose last day to buy is ``from_date`` or later, soonest first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM splits "
+                "WHERE guild_id = ? AND buy_date >= ? ORDER BY buy_date, ticker LIMIT ?",
+                (guild_id, from_date.isoformat(), limit),
+            ).fetchall()
+        return [_row_to_split(row) for row in rows]
+
+    def for_ticker(self, guild_id, ticker, limit=MAX_SPLIT_ROWS):
+        """Every recorded split for ``ticker``, newest buy date first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM splits "
+                "WHERE guild_id = ? AND ticker = ? ORDER BY buy_date DESC LIMIT ?",
+                (guild_id, ticker.strip().upper(), limit),
+            ).fetchall()
+        return [_row_to_split(row) for row in rows]
+
+    def tickers_due(self, from_date, to_date):
+        """``[(ticker, buy_date)]`` across all guilds with a buy date in the range, soonest first."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT ticker, MIN(buy_date) AS first_date FROM splits "
+                "WHERE buy_date BETWEEN ? AND ? GROUP BY ticker ORDER BY first_date, ticker",
+                (from_date.isoformat(), to_date.isoformat()),
+            ).fetchall()
+        return [(ticker, dt.date.fromisoformat(buy_date)) for ticker, buy_date in rows]
+
+
+def _format_split_line(split, with_ticker=True, with_year=False):
+    buy_label = format_buy_date_short(split["buy_date"])
+    if with_year:
+        buy_label = f"{buy_label}, {split['buy_date'].year}"
+    line = f"{split['split_ratio']}, buy by {buy_label}"
+    if with_ticker:
+        line = f"{split['ticker']} {line}"
+    if split["channel_id"]:
+        line = f"{line} in <#{split['channel_id']}>"
+    return line
+
+
+def get_splits_response(registry, guild_id, query=None, today=None):
+    """Build the ``!splits [upcoming|ticker]`` reply from the registry."""
+    today = today or dt.date.today()
+    query = (query or "upcoming").strip()
+    if query.lower() == "upcoming":
+        splits = registry.upcoming(guild_id, today)
+        if not splits:
+            return format_response("Upcoming Reverse Splits", ["No upcoming splits recorded. Post one with `!post`."])
+        return format_response("Upcoming Reverse Splits", [_format_split_line(split) for split in splits])
+
+    ticker_key = query.upper()
+    if not re.fullmatch(r"[A-Z0-9.\-]{1,10}", ticker_key):
+        return format_error("Splits", "Usage: `!splits [upcoming|ticker]`")
+    splits = registry.for_ticker(guild_id, ticker_key)
+    if not splits:
+        return format_response(f"Reverse Splits for {ticker_key}", ["No splits recorded for this ticker."])
+    return format_response(
+        f"Reverse Splits for {ticker_key}",
+        [_format_split_line(split, with_ticker=False, with_year=True) for split in splits],
+    )
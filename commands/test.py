@@ -1,43 +1,46 @@
-import asyncio
-
 import discord
 
 from commands.chart import generate_stock_chart
 from commands.formatting import format_response
-from commands.health import get_server_status
 from commands.price import get_stock_price
 from commands.rsa import calculate_reverse_split_arbitrage
 
 
-async def test_all(ctx):
+async def test_all(ctx, network_executor, render_executor, build_health_response, renderer=None):
     """
     Test all bot commands with sample inputs.
+
+    Lookups run on the same bounded pools as the real commands, and
+    ``build_health_response()`` is the coroutine ``!health`` replies with.
     """
     test_ticker = "AAPL"
     test_split_ratio = "1:10"
 
-    stock_price_response = (await asyncio.to_thread(get_stock_price, test_ticker)).replace(
+    stock_price_response = (await network_executor.run_cancellable(get_stock_price, test_ticker)).replace(
         f"**Price for {test_ticker}**",
         f"**Price for {test_ticker} (!price {test_ticker})**",
     )
     await ctx.send(stock_price_response)
 
-    server_health_response = (await asyncio.to_thread(get_server_status)).replace(
+    server_health_response = (await build_health_response()).replace(
         "**Server Health**",
         "**Server Health (!health)**",
     )
     await ctx.send(server_health_response)
 
-    rsa_response = (await asyncio.to_thread(calculate_reverse_split_arbitrage, test_ticker, test_split_ratio)).replace(
+    rsa_response = (
+        await network_executor.run_cancellable(calculate_reverse_split_arbitrage, test_ticker, test_split_ratio)
+    ).replace(
         f"**Reverse Split Arbitrage for {test_ticker}**",
         f"**Reverse Split Arbitrage for {test_ticker} (!rsa {test_ticker} {test_split_ratio})**",
     )
     await ctx.send(rsa_response)
 
-    chart_stream, filename, caption, chart_error = await asyncio.to_thread(
+    chart_stream, filename, caption, chart_error = await render_executor.run_cancellable(
         generate_stock_chart,
         test_ticker,
         "1mo",
+        renderer=renderer,
     )
     if chart_error:
         await ctx.send(chart_error)
@@ -0,0 +1,127 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from commands.metrics import COMMAND_DURATION, COMMAND_PHASE_DURATION
+
+logger = logging.getLogger("splitbot.trace")
+
+DEFAULT_SLOW_COMMAND_SECONDS = 5.0
+
+_current_trace = contextvars.ContextVar("splitbot_trace", default=None)
+_slow_command_seconds = DEFAULT_SLOW_COMMAND_SECONDS
+_log_invocations = True
+
+
+def configure_tracing(slow_command_seconds=None, log_invocations=None):
+    global _slow_command_seconds, _log_invocations
+
+    if slow_command_seconds is not None:
+        _slow_command_seconds = float(slow_command_seconds)
+    if log_invocations is not None:
+        _log_invocations = bool(log_invocations)
+
+
+class Trace:
+    """Timings for one command invocation.
+
+    The trace lives in a context variable, so spans opened in executor threads
+    (which run in a copy of the caller's context) land in the same trace.
+    """
+
+    def __init__(self, command: str, **attributes):
+        self.command = command
+        self.attributes = attributes
+        self.status = "ok"
+        self.started = time.perf_counter()
+        self.duration_seconds = None
+        self._lock = threading.Lock()
+        self._spans = []
+
+    def add_span(self, name: str, duration_seconds: float):
+        with self._lock:
+            self._spans.append((name, duration_seconds))
+
+    def span_totals(self):
+        """Seconds per span name, summed, in first-seen order."""
+        totals = {}
+        with self._lock:
+            for name, duration_seconds in self._spans:
+                totals[name] = totals.get(name, 0.0) + duration_seconds
+        return totals
+
+    def to_record(self):
+        return {
+            "event": "command",
+            "command": self.command,
+            "status": self.status,
+            "duration_ms": round((self.duration_seconds or 0.0) * 1000, 1),
+            "spans_ms": {name: round(seconds * 1000, 1) for name, seconds in self.span_totals().items()},
+            **self.attributes,
+        }
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def start_trace(command: str, **attributes):
+    trace = Trace(command, **attributes)
+    _current_trace.set(trace)
+    return trace
+
+
+def set_trace_status(status: str):
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.status = status
+
+
+def finish_trace():
+    """Close the current trace, record its metrics and log it. Returns the trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    _current_trace.set(None)
+
+    trace.duration_seconds = time.perf_counter() - trace.started
+    COMMAND_DURATION.observe(trace.duration_seconds, trace.command)
+    if _log_invocations:
+        logger.info(json.dumps(trace.to_record(), sort_keys=True))
+    if trace.duration_seconds >= _slow_command_seconds:
+        breakdown = ", ".join(
+            f"{name}={seconds:.2f}s" for name, seconds in trace.span_totals().items()
+        )
+        logger.warning(
+            "Slow command !%s took %.2fs (%s): %s",
+            trace.command,
+            trace.duration_seconds,
+            trace.status,
+            breakdown or "no spans",
+        )
+    return trace
+
+
+@contextmanager
+def span(name: str, phase=None):
+    """Time the block into the current trace; a no-op outside a command.
+
+    ``phase`` (fetch, render, send) also feeds the per-phase latency histogram.
+    Works as a decorator too.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_seconds = time.perf_counter() - started
+        trace.add_span(name, duration_seconds)
+        if phase is not None:
+            COMMAND_PHASE_DURATION.observe(duration_seconds, trace.command, phase)
@@ -0,0 +1,222 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+import math
+import time
+
+from commands.formatting import format_error, format_response
+from commands.price import MAX_PRICE_TICKERS, format_price_lines
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCH_INTERVAL_SECONDS = 15.0
+MIN_WATCH_INTERVAL_SECONDS = 5.0
+DEFAULT_WATCH_DURATION_SECONDS = 15 * 60.0
+DEFAULT_MAX_WATCHES_PER_GUILD = 5
+# DM watches have no server to charge, so they share one bot-wide cap.
+DEFAULT_MAX_DIRECT_WATCHES = 10
+# Discord allows roughly five edits per channel every five seconds; stay under it.
+MAX_EDITS_PER_CHANNEL_PER_TICK = 4
+# Edit failures with these statuses mean the message is gone or off-limits.
+_DROP_STATUSES = (403, 404)
+
+
+class WatchLimitExceeded(RuntimeError):
+    """Raised when a guild, or DMs as a whole, already has its maximum number of live watches."""
+
+
+def parse_watch_tickers(tickers):
+    """Return ``(ticker_keys, error_response)`` for ``!watch`` arguments."""
+    ticker_keys = list(dict.fromkeys(ticker.upper().strip() for ticker in tickers if ticker.strip()))
+    if not ticker_keys:
+        return None, format_error("Watch", "Provide at least one ticker. Usage: `!watch AAPL [TSLA ...]`")
+    if len(ticker_keys) > MAX_PRICE_TICKERS:
+        return None, format_error(
+            "Watch",
+            f"Too many tickers. Provide at most {MAX_PRICE_TICKERS} per watch.",
+        )
+    return ticker_keys, None
+
+
+class Watch:
+    def __init__(self, watch_id, guild_id, channel_id, user_id, tickers, expires_at):
+        self.watch_id = watch_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.tickers = tickers
+        self.expires_at = expires_at
+        self.snapshots = {}
+        self.message = None
+        self.last_content = None
+        self.last_edit_at = 0.0
+
+
+class WatchManager:
+    """Keeps ``!watch`` messages up to date from one shared poller.
+
+    Every tick fetches the union of all watched tickers in a single batch, so
+    ten users watching the same symbol cost one upstream lookup. Messages are
+    only edited when their text changes, and at most
+    ``MAX_EDITS_PER_CHANNEL_PER_TICK`` edits go to one channel per tick; the
+    rest keep their latest text and are edited first on the next tick.
+    """
+
+    def __init__(
+        self,
+        fetch_snapshots,
+        interval_seconds=DEFAULT_WATCH_INTERVAL_SECONDS,
+        duration_seconds=DEFAULT_WATCH_DURATION_SECONDS,
+        max_per_guild=DEFAULT_MAX_WATCHES_PER_GUILD,
+        max_direct=DEFAULT_MAX_DIRECT_WATCHES,
+        clock=time.monotonic,
+    ):
+        self.fetch_snapshots = fetch_snapshots
+        self.interval_seconds = max(MIN_WATCH_INTERVAL_SECONDS, float(interval_seconds))
+        self.duration_seconds = float(duration_seconds)
+        self.max_per_guild = max(1, int(max_per_guild))
+        self.max_direct = max(1, int(max_direct))
+        self.clock = clock
+        self._watches = {}
+        self._ids = itertools.count(1)
+        self._poller = None
+
+    def active_count(self, guild_id=None):
+        now = self.clock()
+        return sum(
+            1
+            for watch in self._watches.values()
+            if watch.expires_at > now and (guild_id is None or watch.guild_id == guild_id)
+        )
+
+    def active_direct_count(self):
+        now = self.clock()
+        return sum(1 for watch in self._watches.values() if watch.expires_at > now and watch.guild_id is None)
+
+    def watched_tickers(self):
+        return sorted({ticker for watch in self._watches.values() for ticker in watch.tickers})
+
+    def add(self, guild_id, channel_id, user_id, tickers):
+        """Reserve a watch; a user's earlier watch in the same channel is ended."""
+        self.stop(channel_id, user_id)
+        if guild_id is not None and self.active_count(guild_id) >= self.max_per_guild:
+            raise WatchLimitExceeded(f"{self.max_per_guild} watches already running in this server")
+        if guild_id is None and self.active_direct_count() >= self.max_direct:
+            raise WatchLimitExceeded(f"{self.max_direct} watches already running in direct messages")
+
+        watch = Watch(
+            next(self._ids),
+            guild_id,
+            channel_id,
+            user_id,
+            list(tickers),
+            self.clock() + self.duration_seconds,
+        )
+        self._watches[watch.watch_id] = watch
+        return watch
+
+    def attach(self, watch, message, content):
+        """Start updating ``message`` once the first version has been sent."""
+        watch.message = message
+        watch.last_content = content
+        watch.last_edit_at = self.clock()
+        self._ensure_poller()
+
+    def remove(self, watch):
+        self._watches.pop(watch.watch_id, None)
+
+    def stop(self, channel_id, user_id):
+        """End a user's watches in a channel; the poller posts the final edit. Returns the count."""
+        now = self.clock()
+        stopped = 0
+        for watch in self._watches.values():
+            if watch.channel_id == channel_id and watch.user_id == user_id and watch.expires_at > now:
+                watch.expires_at = now
+                stopped += 1
+        return stopped
+
+    def render(self, watch, now=None):
+        now = self.clock() if now is None else now
+        lines = format_price_lines(watch.tickers, watch.snapshots)
+        remaining_seconds = watch.expires_at - now
+        if remaining_seconds <= 0:
+            return format_response(f"Watch ended: {', '.join(watch.tickers)}", lines, "Run `!watch` again to restart.")
+        return format_response(
+            f"Watching {', '.join(watch.tickers)}",
+            lines,
+            f"Refreshes every {int(self.interval_seconds)}s. "
+            f"Stops in {max(1, math.ceil(remaining_seconds / 60))} min.",
+        )
+
+    async def tick(self):
+        """Fetch every watched ticker once and edit the messages that changed."""
+        watches = [watch for watch in self._watches.values() if watch.message is not None]
+        if not watches:
+            return
+
+        tickers = sorted({ticker for watch in watches for ticker in watch.tickers})
+        try:
+            snapshots = await asyncio.wait_for(self.fetch_snapshots(tickers), timeout=self.interval_seconds)
+        except Exception:
+            logger.warning("Watch refresh for %d tickers failed; keeping previous prices.", len(tickers), exc_info=True)
+            snapshots = None
+
+        now = self.clock()
+        edits_per_channel = {}
+        pending = []
+        # Watches that waited longest go first, so deferred edits are not starved.
+        for watch in sorted(watches, key=lambda item: item.last_edit_at):
+            if snapshots is not None:
+                watch.snapshots = {ticker: snapshots[ticker] for ticker in watch.tickers if ticker in snapshots}
+            ended = watch.expires_at <= now
+            content = self.render(watch, now)
+            if content == watch.last_content:
+                if ended:
+                    self.remove(watch)
+                continue
+            if edits_per_channel.get(watch.channel_id, 0) >= MAX_EDITS_PER_CHANNEL_PER_TICK:
+                continue
+            edits_per_channel[watch.channel_id] = edits_per_channel.get(watch.channel_id, 0) + 1
+            pending.append((watch, content, ended))
+
+        await asyncio.gather(*(self._edit(watch, content, ended, now) for watch, content, ended in pending))
+
+    async def _edit(self, watch, content, ended, now):
+        try:
+            await watch.message.edit(content=content)
+        except Exception as error:
+            dropped = getattr(error, "status", None) in _DROP_STATUSES
+            if not dropped:
+                logger.warning("Could not update watch message %s.", watch.watch_id, exc_info=True)
+            # The final edit gets one attempt; an ended watch is dropped either way.
+            if dropped or ended:
+                self.remove(watch)
+            return
+        watch.last_content = content
+        watch.last_edit_at = now
+        if ended:
+            self.remove(watch)
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            # A fresh context so the poller does not inherit the trace of the command that started it.
+            self._poller = asyncio.get_running_loop().create_task(self._poll(), context=contextvars.Context())
+
+    async def _poll(self):
+        while self._watches:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Watch poller tick failed.")
+
+    async def close(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        self._watches.clear()
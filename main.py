@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import math
 import os
 import time
 
@@ -7,24 +8,100 @@ import discord
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
-from commands.chart import generate_stock_chart
+from commands.chart import configure_chart_cache, generate_stock_chart, get_chart_cache_stats
+from commands.chart_render import ProcessChartRenderer, configure_chart_renderer
+from commands.executors import BoundedExecutor, ExecutorBusyError
 from commands.formatting import format_error, format_response
-from commands.health import get_server_status
+from commands.health import (
+    HealthSampler,
+    get_sampled_server_status,
+    get_server_status,
+    record_process_baseline,
+)
+from commands.janitor import (
+    DEFAULT_JANITOR_BATCH_PAUSE_SECONDS,
+    DEFAULT_JANITOR_BATCH_SIZE,
+    DEFAULT_JANITOR_GRACE_DAYS,
+    DEFAULT_JANITOR_INTERVAL_MINUTES,
+    JANITOR_MODES,
+    MAX_CATEGORY_CHANNELS,
+    clean_up_channels,
+    find_expired_post_channels,
+)
+from commands.market_data import (
+    DEFAULT_QUOTE_CACHE_TTL_SECONDS,
+    async_quotes_available,
+    close_async_client,
+    configure_async_client,
+    configure_bar_store,
+    configure_company_name_cache,
+    configure_http_session,
+    configure_market_data_provider,
+    configure_quote_cache,
+    get_price_snapshots,
+    get_quote_cache_stats,
+    warm_market_data_provider,
+)
+from commands.metrics import (
+    COMMAND_ERRORS,
+    COMMAND_TIMEOUTS,
+    EVENT_LOOP_LAG,
+    REGISTRY,
+    MetricsServer,
+    set_cache_stats,
+)
 from commands.help_data import (
     build_command_help_lines,
     build_help_overview_lines,
     normalize_help_command_name,
 )
+from commands.rate_limit import (
+    DEFAULT_CHANNEL_RATE,
+    DEFAULT_GUILD_RATE,
+    DEFAULT_USER_RATE,
+    FairQueue,
+    RateLimiter,
+    RateLimitExceeded,
+    parse_costs,
+    parse_rate,
+)
+from commands.tracing import configure_tracing, finish_trace, set_trace_status, span, start_trace
+from commands.prewarm import (
+    DEFAULT_PREWARM_DAYS_AHEAD,
+    DEFAULT_PREWARM_INTERVAL_SECONDS,
+    DEFAULT_PREWARM_MAX_TICKERS,
+    PREWARM_CHART_PERIODS,
+    collect_prewarm_tickers,
+    prewarm_quotes,
+    quote_refresh_interval,
+)
 from commands.post import (
     SUPPORTED_DATE_FORMATS,
     build_post_channel_name,
     build_reverse_split_announcement,
     has_post_permission,
     parse_last_day_to_buy,
+    parse_split_ratio,
+)
+from commands.price import (
+    MAX_PRICE_TICKERS,
+    get_stock_price,
+    get_stock_price_async,
+    get_stock_prices,
 )
-from commands.price import get_stock_price
-from commands.rsa import calculate_reverse_split_arbitrage
+from commands.rsa import (
+    calculate_reverse_split_arbitrage,
+    calculate_reverse_split_arbitrage_async,
+    calculate_rsa_grid,
+    calculate_rsa_grid_async,
+    MAX_SCAN_ATTACHMENT_BYTES,
+    parse_rsa_options,
+    parse_scan_rows,
+    scan_reverse_splits,
+)
+from commands.splits import SplitRegistry, get_splits_response
 from commands.test import test_all
+from commands.watch import WatchLimitExceeded, WatchManager, parse_watch_tickers
 
 # Load environment variables from .env file
 load_dotenv()
@@ -33,9 +110,70 @@ load_dotenv()
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 POST_CATEGORY_ID_RAW = os.getenv("POST_CATEGORY_ID")
 POST_MODERATOR_ROLE_ID_RAW = os.getenv("POST_MODERATOR_ROLE_ID")
+POST_ARCHIVE_CATEGORY_ID_RAW = os.getenv("POST_ARCHIVE_CATEGORY_ID")
+JANITOR_ENABLED_RAW = os.getenv("JANITOR_ENABLED")
+JANITOR_MODE = (os.getenv("JANITOR_MODE") or "archive").strip().lower()
+JANITOR_INTERVAL_MINUTES_RAW = os.getenv("JANITOR_INTERVAL_MINUTES")
+JANITOR_GRACE_DAYS_RAW = os.getenv("JANITOR_GRACE_DAYS")
+JANITOR_BATCH_SIZE_RAW = os.getenv("JANITOR_BATCH_SIZE")
+JANITOR_BATCH_PAUSE_SECONDS_RAW = os.getenv("JANITOR_BATCH_PAUSE_SECONDS")
 COMMAND_TIMEOUT_SECONDS_RAW = os.getenv("COMMAND_TIMEOUT_SECONDS")
 CHART_TIMEOUT_SECONDS_RAW = os.getenv("CHART_TIMEOUT_SECONDS")
 TEST_ALL_TIMEOUT_SECONDS_RAW = os.getenv("TEST_ALL_TIMEOUT_SECONDS")
+QUOTE_CACHE_TTL_SECONDS_RAW = os.getenv("QUOTE_CACHE_TTL_SECONDS")
+QUOTE_CACHE_MAX_ENTRIES_RAW = os.getenv("QUOTE_CACHE_MAX_ENTRIES")
+CACHE_DIR = os.getenv("CACHE_DIR") or ".cache"
+MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER") or "yfinance"
+MARKET_DATA_FIXTURE_DIR = os.getenv("MARKET_DATA_FIXTURE_DIR")
+MARKET_DATA_FIXTURE_LATENCY_MS_RAW = os.getenv("MARKET_DATA_FIXTURE_LATENCY_MS")
+UPSTREAM_TIMEOUT_SECONDS_RAW = os.getenv("UPSTREAM_TIMEOUT_SECONDS")
+UPSTREAM_CONNECT_TIMEOUT_SECONDS_RAW = os.getenv("UPSTREAM_CONNECT_TIMEOUT_SECONDS")
+UPSTREAM_RETRIES_RAW = os.getenv("UPSTREAM_RETRIES")
+UPSTREAM_RETRY_BACKOFF_SECONDS_RAW = os.getenv("UPSTREAM_RETRY_BACKOFF_SECONDS")
+ASYNC_QUOTES_ENABLED_RAW = os.getenv("ASYNC_QUOTES_ENABLED")
+ASYNC_QUOTES_MAX_CONNECTIONS_RAW = os.getenv("ASYNC_QUOTES_MAX_CONNECTIONS")
+COMPANY_NAME_SNAPSHOT_PATH = os.getenv("COMPANY_NAME_SNAPSHOT_PATH")
+OHLC_STORE_ENABLED_RAW = os.getenv("OHLC_STORE_ENABLED")
+OHLC_STORE_PATH = os.getenv("OHLC_STORE_PATH") or os.path.join(CACHE_DIR, "ohlc_bars.sqlite3")
+SPLIT_REGISTRY_PATH = os.getenv("SPLIT_REGISTRY_PATH") or os.path.join(CACHE_DIR, "splits.sqlite3")
+PREWARM_ENABLED_RAW = os.getenv("PREWARM_ENABLED")
+PREWARM_INTERVAL_SECONDS_RAW = os.getenv("PREWARM_INTERVAL_SECONDS")
+PREWARM_DAYS_AHEAD_RAW = os.getenv("PREWARM_DAYS_AHEAD")
+PREWARM_MAX_TICKERS_RAW = os.getenv("PREWARM_MAX_TICKERS")
+COMPANY_NAME_CACHE_TTL_DAYS_RAW = os.getenv("COMPANY_NAME_CACHE_TTL_DAYS")
+COMPANY_NAME_NEGATIVE_TTL_SECONDS_RAW = os.getenv("COMPANY_NAME_NEGATIVE_TTL_SECONDS")
+NETWORK_POOL_WORKERS_RAW = os.getenv("NETWORK_POOL_WORKERS")
+NETWORK_POOL_QUEUE_RAW = os.getenv("NETWORK_POOL_QUEUE")
+RENDER_POOL_WORKERS_RAW = os.getenv("RENDER_POOL_WORKERS")
+RENDER_POOL_QUEUE_RAW = os.getenv("RENDER_POOL_QUEUE")
+SYSTEM_POOL_WORKERS_RAW = os.getenv("SYSTEM_POOL_WORKERS")
+SYSTEM_POOL_QUEUE_RAW = os.getenv("SYSTEM_POOL_QUEUE")
+CHART_RENDER_MODE = (os.getenv("CHART_RENDER_MODE") or "thread").strip().lower()
+CHART_RENDER_PROCESSES_RAW = os.getenv("CHART_RENDER_PROCESSES")
+CHART_FIGURE_REUSE_RAW = os.getenv("CHART_FIGURE_REUSE")
+HEALTH_SAMPLE_INTERVAL_SECONDS_RAW = os.getenv("HEALTH_SAMPLE_INTERVAL_SECONDS")
+HEALTH_WINDOW_MINUTES_RAW = os.getenv("HEALTH_WINDOW_MINUTES")
+CHART_CACHE_MAX_ENTRIES_RAW = os.getenv("CHART_CACHE_MAX_ENTRIES")
+CHART_CACHE_INTRADAY_TTL_SECONDS_RAW = os.getenv("CHART_CACHE_INTRADAY_TTL_SECONDS")
+CHART_CACHE_DAILY_TTL_SECONDS_RAW = os.getenv("CHART_CACHE_DAILY_TTL_SECONDS")
+CHART_CACHE_DISK_ENABLED_RAW = os.getenv("CHART_CACHE_DISK_ENABLED")
+METRICS_ENABLED_RAW = os.getenv("METRICS_ENABLED")
+METRICS_HOST = os.getenv("METRICS_HOST") or "127.0.0.1"
+METRICS_PORT_RAW = os.getenv("METRICS_PORT")
+TRACE_LOG_ENABLED_RAW = os.getenv("TRACE_LOG_ENABLED")
+SLOW_COMMAND_SECONDS_RAW = os.getenv("SLOW_COMMAND_SECONDS")
+RATE_LIMIT_ENABLED_RAW = os.getenv("RATE_LIMIT_ENABLED")
+RATE_LIMIT_MODE = (os.getenv("RATE_LIMIT_MODE") or "queue").strip().lower()
+RATE_LIMIT_USER_RAW = os.getenv("RATE_LIMIT_USER")
+RATE_LIMIT_CHANNEL_RAW = os.getenv("RATE_LIMIT_CHANNEL")
+RATE_LIMIT_GUILD_RAW = os.getenv("RATE_LIMIT_GUILD")
+RATE_LIMIT_COSTS_RAW = os.getenv("RATE_LIMIT_COSTS")
+RATE_LIMIT_QUEUE_PER_USER_RAW = os.getenv("RATE_LIMIT_QUEUE_PER_USER")
+RATE_LIMIT_QUEUE_MAX_WAIT_SECONDS_RAW = os.getenv("RATE_LIMIT_QUEUE_MAX_WAIT_SECONDS")
+WATCH_INTERVAL_SECONDS_RAW = os.getenv("WATCH_INTERVAL_SECONDS")
+WATCH_DURATION_MINUTES_RAW = os.getenv("WATCH_DURATION_MINUTES")
+WATCH_MAX_PER_GUILD_RAW = os.getenv("WATCH_MAX_PER_GUILD")
+WATCH_MAX_DIRECT_RAW = os.getenv("WATCH_MAX_DIRECT")
 
 
 def _parse_int(value):
@@ -52,17 +190,123 @@ def _parse_float(value):
         return None
 
 
+def _parse_bool(value, default):
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 POST_CATEGORY_ID = _parse_int(POST_CATEGORY_ID_RAW)
 POST_MODERATOR_ROLE_ID = _parse_int(POST_MODERATOR_ROLE_ID_RAW)
+POST_ARCHIVE_CATEGORY_ID = _parse_int(POST_ARCHIVE_CATEGORY_ID_RAW)
+JANITOR_ENABLED = _parse_bool(JANITOR_ENABLED_RAW, False)
+if JANITOR_MODE not in JANITOR_MODES:
+    JANITOR_MODE = "archive"
+JANITOR_INTERVAL_MINUTES = _parse_float(JANITOR_INTERVAL_MINUTES_RAW) or DEFAULT_JANITOR_INTERVAL_MINUTES
+JANITOR_GRACE_DAYS = _parse_int(JANITOR_GRACE_DAYS_RAW)
+if JANITOR_GRACE_DAYS is None:
+    JANITOR_GRACE_DAYS = DEFAULT_JANITOR_GRACE_DAYS
+JANITOR_BATCH_SIZE = _parse_int(JANITOR_BATCH_SIZE_RAW) or DEFAULT_JANITOR_BATCH_SIZE
+JANITOR_BATCH_PAUSE_SECONDS = _parse_float(JANITOR_BATCH_PAUSE_SECONDS_RAW) or DEFAULT_JANITOR_BATCH_PAUSE_SECONDS
 COMMAND_TIMEOUT_SECONDS = _parse_float(COMMAND_TIMEOUT_SECONDS_RAW) or 20.0
 CHART_TIMEOUT_SECONDS = _parse_float(CHART_TIMEOUT_SECONDS_RAW) or 25.0
 TEST_ALL_TIMEOUT_SECONDS = _parse_float(TEST_ALL_TIMEOUT_SECONDS_RAW) or 120.0
+QUOTE_CACHE_TTL_SECONDS = _parse_float(QUOTE_CACHE_TTL_SECONDS_RAW)
+QUOTE_CACHE_MAX_ENTRIES = _parse_int(QUOTE_CACHE_MAX_ENTRIES_RAW)
+MARKET_DATA_FIXTURE_LATENCY_MS = _parse_float(MARKET_DATA_FIXTURE_LATENCY_MS_RAW) or 0.0
+UPSTREAM_TIMEOUT_SECONDS = _parse_float(UPSTREAM_TIMEOUT_SECONDS_RAW) or 10.0
+UPSTREAM_CONNECT_TIMEOUT_SECONDS = _parse_float(UPSTREAM_CONNECT_TIMEOUT_SECONDS_RAW) or 3.0
+UPSTREAM_RETRIES = _parse_int(UPSTREAM_RETRIES_RAW)
+UPSTREAM_RETRY_BACKOFF_SECONDS = _parse_float(UPSTREAM_RETRY_BACKOFF_SECONDS_RAW)
+ASYNC_QUOTES_ENABLED = _parse_bool(ASYNC_QUOTES_ENABLED_RAW, False)
+ASYNC_QUOTES_MAX_CONNECTIONS = _parse_int(ASYNC_QUOTES_MAX_CONNECTIONS_RAW)
+OHLC_STORE_ENABLED = _parse_bool(OHLC_STORE_ENABLED_RAW, True)
+PREWARM_ENABLED = _parse_bool(PREWARM_ENABLED_RAW, True)
+PREWARM_INTERVAL_SECONDS = _parse_float(PREWARM_INTERVAL_SECONDS_RAW) or DEFAULT_PREWARM_INTERVAL_SECONDS
+PREWARM_DAYS_AHEAD = _parse_int(PREWARM_DAYS_AHEAD_RAW)
+if PREWARM_DAYS_AHEAD is None:
+    PREWARM_DAYS_AHEAD = DEFAULT_PREWARM_DAYS_AHEAD
+PREWARM_MAX_TICKERS = _parse_int(PREWARM_MAX_TICKERS_RAW) or DEFAULT_PREWARM_MAX_TICKERS
+PREWARM_QUOTE_REFRESH_SECONDS = quote_refresh_interval(QUOTE_CACHE_TTL_SECONDS or DEFAULT_QUOTE_CACHE_TTL_SECONDS)
+COMPANY_NAME_CACHE_TTL_DAYS = _parse_float(COMPANY_NAME_CACHE_TTL_DAYS_RAW)
+COMPANY_NAME_NEGATIVE_TTL_SECONDS = _parse_float(COMPANY_NAME_NEGATIVE_TTL_SECONDS_RAW)
+NETWORK_POOL_WORKERS = _parse_int(NETWORK_POOL_WORKERS_RAW) or 8
+NETWORK_POOL_QUEUE = _parse_int(NETWORK_POOL_QUEUE_RAW) or 32
+RENDER_POOL_WORKERS = _parse_int(RENDER_POOL_WORKERS_RAW) or 2
+RENDER_POOL_QUEUE = _parse_int(RENDER_POOL_QUEUE_RAW) or 4
+SYSTEM_POOL_WORKERS = _parse_int(SYSTEM_POOL_WORKERS_RAW) or 1
+SYSTEM_POOL_QUEUE = _parse_int(SYSTEM_POOL_QUEUE_RAW) or 4
+CHART_RENDER_PROCESSES = _parse_int(CHART_RENDER_PROCESSES_RAW) or RENDER_POOL_WORKERS
+CHART_FIGURE_REUSE = _parse_bool(CHART_FIGURE_REUSE_RAW, False)
+CHART_CACHE_MAX_ENTRIES = _parse_int(CHART_CACHE_MAX_ENTRIES_RAW)
+CHART_CACHE_INTRADAY_TTL_SECONDS = _parse_float(CHART_CACHE_INTRADAY_TTL_SECONDS_RAW)
+CHART_CACHE_DAILY_TTL_SECONDS = _parse_float(CHART_CACHE_DAILY_TTL_SECONDS_RAW)
+CHART_CACHE_DISK_ENABLED = _parse_bool(CHART_CACHE_DISK_ENABLED_RAW, False)
+HEALTH_SAMPLE_INTERVAL_SECONDS = _parse_float(HEALTH_SAMPLE_INTERVAL_SECONDS_RAW) or 15.0
+HEALTH_WINDOW_MINUTES = _parse_float(HEALTH_WINDOW_MINUTES_RAW) or 15.0
+METRICS_ENABLED = _parse_bool(METRICS_ENABLED_RAW, False)
+METRICS_PORT = _parse_int(METRICS_PORT_RAW) or 9108
+TRACE_LOG_ENABLED = _parse_bool(TRACE_LOG_ENABLED_RAW, True)
+SLOW_COMMAND_SECONDS = _parse_float(SLOW_COMMAND_SECONDS_RAW) or 5.0
+RATE_LIMIT_ENABLED = _parse_bool(RATE_LIMIT_ENABLED_RAW, True)
+RATE_LIMIT_USER = parse_rate(RATE_LIMIT_USER_RAW, DEFAULT_USER_RATE)
+RATE_LIMIT_CHANNEL = parse_rate(RATE_LIMIT_CHANNEL_RAW, DEFAULT_CHANNEL_RATE)
+RATE_LIMIT_GUILD = parse_rate(RATE_LIMIT_GUILD_RAW, DEFAULT_GUILD_RATE)
+RATE_LIMIT_COSTS = parse_costs(RATE_LIMIT_COSTS_RAW)
+RATE_LIMIT_QUEUE_PER_USER = _parse_int(RATE_LIMIT_QUEUE_PER_USER_RAW)
+if RATE_LIMIT_QUEUE_PER_USER is None:
+    RATE_LIMIT_QUEUE_PER_USER = 3
+RATE_LIMIT_QUEUE_MAX_WAIT_SECONDS = _parse_float(RATE_LIMIT_QUEUE_MAX_WAIT_SECONDS_RAW) or 30.0
+WATCH_INTERVAL_SECONDS = _parse_float(WATCH_INTERVAL_SECONDS_RAW) or 15.0
+WATCH_DURATION_MINUTES = _parse_float(WATCH_DURATION_MINUTES_RAW) or 15.0
+WATCH_MAX_PER_GUILD = _parse_int(WATCH_MAX_PER_GUILD_RAW) or 5
+WATCH_MAX_DIRECT = _parse_int(WATCH_MAX_DIRECT_RAW) or 10
 EVENT_LOOP_MONITOR_INTERVAL_SECONDS = 10.0
 EVENT_LOOP_LAG_WARNING_SECONDS = 5.0
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+configure_http_session(
+    connect_timeout_seconds=UPSTREAM_CONNECT_TIMEOUT_SECONDS,
+    read_timeout_seconds=UPSTREAM_TIMEOUT_SECONDS,
+    retries=UPSTREAM_RETRIES,
+    backoff_seconds=UPSTREAM_RETRY_BACKOFF_SECONDS,
+)
+configure_market_data_provider(
+    MARKET_DATA_PROVIDER,
+    fixture_dir=MARKET_DATA_FIXTURE_DIR,
+    latency_seconds=MARKET_DATA_FIXTURE_LATENCY_MS / 1000.0,
+    timeout_seconds=UPSTREAM_TIMEOUT_SECONDS,
+)
+configure_async_client(
+    enabled=ASYNC_QUOTES_ENABLED,
+    connect_timeout_seconds=UPSTREAM_CONNECT_TIMEOUT_SECONDS,
+    read_timeout_seconds=UPSTREAM_TIMEOUT_SECONDS,
+    retries=UPSTREAM_RETRIES,
+    backoff_seconds=UPSTREAM_RETRY_BACKOFF_SECONDS,
+    max_connections=ASYNC_QUOTES_MAX_CONNECTIONS,
+)
+configure_quote_cache(
+    ttl_seconds=QUOTE_CACHE_TTL_SECONDS,
+    max_entries=QUOTE_CACHE_MAX_ENTRIES,
+)
+configure_bar_store(OHLC_STORE_PATH if OHLC_STORE_ENABLED else None)
+configure_chart_renderer(reuse_figures=CHART_FIGURE_REUSE)
+configure_chart_cache(
+    max_entries=CHART_CACHE_MAX_ENTRIES,
+    intraday_ttl_seconds=CHART_CACHE_INTRADAY_TTL_SECONDS,
+    daily_ttl_seconds=CHART_CACHE_DAILY_TTL_SECONDS,
+    disk_dir=os.path.join(CACHE_DIR, "charts") if CHART_CACHE_DISK_ENABLED else None,
+)
+configure_tracing(slow_command_seconds=SLOW_COMMAND_SECONDS, log_invocations=TRACE_LOG_ENABLED)
+configure_company_name_cache(
+    path=os.path.join(CACHE_DIR, "company_names.json"),
+    snapshot_path=COMPANY_NAME_SNAPSHOT_PATH,
+    ttl_days=COMPANY_NAME_CACHE_TTL_DAYS,
+    negative_ttl_seconds=COMPANY_NAME_NEGATIVE_TTL_SECONDS,
+)
+
 # Define the intents
 intents = discord.Intents.default()
 intents.messages = True
@@ -71,28 +315,182 @@ intents.message_content = True
 
 # Create the bot object with a command prefix (e.g., '!')
 bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
+# Separate pools so slow chart renders cannot starve quote lookups or !health.
+network_executor = BoundedExecutor("network", NETWORK_POOL_WORKERS, NETWORK_POOL_QUEUE)
+render_executor = BoundedExecutor("render", RENDER_POOL_WORKERS, RENDER_POOL_QUEUE)
+system_executor = BoundedExecutor("system", SYSTEM_POOL_WORKERS, SYSTEM_POOL_QUEUE)
+EXECUTORS = (network_executor, render_executor, system_executor)
+chart_renderer = None
+metrics_server = None
+split_registry = SplitRegistry(SPLIT_REGISTRY_PATH)
+rate_limiter = RateLimiter(
+    user_rate=RATE_LIMIT_USER,
+    channel_rate=RATE_LIMIT_CHANNEL,
+    guild_rate=RATE_LIMIT_GUILD,
+    command_costs=RATE_LIMIT_COSTS,
+)
+rate_limit_queue = FairQueue(
+    rate_limiter,
+    max_per_user=RATE_LIMIT_QUEUE_PER_USER,
+    max_wait_seconds=RATE_LIMIT_QUEUE_MAX_WAIT_SECONDS,
+)
+
+
+async def _fetch_watch_snapshots(tickers):
+    return await network_executor.run_cancellable(get_price_snapshots, tickers)
+
+
+watch_manager = WatchManager(
+    _fetch_watch_snapshots,
+    interval_seconds=WATCH_INTERVAL_SECONDS,
+    duration_seconds=WATCH_DURATION_MINUTES * 60,
+    max_per_guild=WATCH_MAX_PER_GUILD,
+    max_direct=WATCH_MAX_DIRECT,
+)
+health_sampler = HealthSampler(
+    max_samples=int(HEALTH_WINDOW_MINUTES * 60 / HEALTH_SAMPLE_INTERVAL_SECONDS) + 1,
+)
 _last_loop_tick = time.monotonic()
+_last_loop_lag_seconds = 0.0
+_worst_loop_lag_seconds = 0.0
+_in_flight_commands = {}
+_market_data_warmed = False
+record_process_baseline()
+
+
+class CommandRateLimited(commands.CheckFailure):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited; retry after {retry_after:.0f}s.")
+        self.retry_after = retry_after
 
 
 async def _send_command_error(ctx, action):
     logger.exception("%s command failed", action)
+    COMMAND_ERRORS.inc(ctx.command.qualified_name, "error")
+    set_trace_status("error")
     await ctx.send(format_error(action, "Unexpected error. Check bot logs."))
 
 
+async def _send_busy_error(ctx, action, error):
+    logger.warning("%s rejected: %s", action, error)
+    COMMAND_ERRORS.inc(ctx.command.qualified_name, "busy")
+    set_trace_status("busy")
+    await ctx.send(format_error(action, "Bot is busy right now. Try again in a moment."))
+
+
+def get_executor_stats():
+    return [executor.stats() for executor in EXECUTORS]
+
+
+def get_bot_stats():
+    return {
+        "worst_loop_lag_seconds": _worst_loop_lag_seconds,
+        "in_flight": dict(_in_flight_commands),
+        "caches": {
+            "Quote Cache": get_quote_cache_stats(),
+            "Chart Cache": get_chart_cache_stats(),
+        },
+    }
+
+
+def _collect_cache_metrics():
+    set_cache_stats("quote", get_quote_cache_stats())
+    set_cache_stats("chart", get_chart_cache_stats())
+
+
+REGISTRY.add_collector(_collect_cache_metrics)
+
+
+@bot.check
+async def apply_rate_limit(ctx):
+    if not RATE_LIMIT_ENABLED or ctx.command is None:
+        return True
+
+    request = (
+        ctx.command.qualified_name,
+        ctx.author.id,
+        ctx.channel.id,
+        ctx.guild.id if ctx.guild is not None else None,
+    )
+    if RATE_LIMIT_MODE == "reject":
+        retry_after = rate_limiter.try_acquire(*request)
+        if retry_after > 0:
+            raise CommandRateLimited(retry_after)
+        return True
+
+    try:
+        await rate_limit_queue.acquire(*request)
+    except RateLimitExceeded as error:
+        raise CommandRateLimited(error.retry_after) from error
+    return True
+
+
+@bot.before_invoke
+async def track_command_start(ctx):
+    name = ctx.command.qualified_name
+    _in_flight_commands[name] = _in_flight_commands.get(name, 0) + 1
+    start_trace(
+        name,
+        guild_id=ctx.guild.id if ctx.guild is not None else None,
+        channel_id=ctx.channel.id,
+    )
+
+
+@bot.after_invoke
+async def track_command_end(ctx):
+    name = ctx.command.qualified_name
+    _in_flight_commands[name] = max(0, _in_flight_commands.get(name, 0) - 1)
+    finish_trace()
+
+
 @bot.event
 async def on_ready():
+    global chart_renderer, metrics_server, _market_data_warmed
+
     logger.info("Logged in as %s", bot.user.name)
+    if CHART_RENDER_MODE == "process" and chart_renderer is None:
+        chart_renderer = ProcessChartRenderer(CHART_RENDER_PROCESSES, reuse_figures=CHART_FIGURE_REUSE)
+        await asyncio.to_thread(chart_renderer.warm)
+        logger.info("Chart render process pool ready (%d workers).", CHART_RENDER_PROCESSES)
+    if not _market_data_warmed:
+        _market_data_warmed = True
+        try:
+            warmed = await network_executor.run(warm_market_data_provider)
+        except ExecutorBusyError:
+            warmed = False
+        if warmed:
+            logger.info("Market data session warmed.")
+        else:
+            logger.warning("Could not warm the market data session; the first lookup may be slow.")
+    if METRICS_ENABLED and metrics_server is None:
+        metrics_server = MetricsServer(METRICS_HOST, METRICS_PORT)
+        try:
+            await metrics_server.start()
+            logger.info("Metrics endpoint listening on http://%s:%d/metrics", METRICS_HOST, metrics_server.port)
+        except OSError:
+            logger.exception("Could not start metrics endpoint on %s:%d.", METRICS_HOST, METRICS_PORT)
     if not monitor_event_loop_lag.is_running():
         monitor_event_loop_lag.start()
+    if not sample_health.is_running():
+        sample_health.start()
+    if PREWARM_ENABLED and not prewarm_upcoming_splits.is_running():
+        prewarm_upcoming_splits.start()
+    if PREWARM_ENABLED and not refresh_prewarmed_quotes.is_running():
+        refresh_prewarmed_quotes.start()
+    if JANITOR_ENABLED and not clean_up_post_channels.is_running():
+        clean_up_post_channels.start()
 
 
 @tasks.loop(seconds=EVENT_LOOP_MONITOR_INTERVAL_SECONDS)
 async def monitor_event_loop_lag():
-    global _last_loop_tick
+    global _last_loop_tick, _last_loop_lag_seconds, _worst_loop_lag_seconds
 
     now = time.monotonic()
     lag_seconds = now - _last_loop_tick - EVENT_LOOP_MONITOR_INTERVAL_SECONDS
     _last_loop_tick = now
+    _last_loop_lag_seconds = max(0.0, lag_seconds)
+    _worst_loop_lag_seconds = max(_worst_loop_lag_seconds, _last_loop_lag_seconds)
+    EVENT_LOOP_LAG.set(_last_loop_lag_seconds)
     if lag_seconds > EVENT_LOOP_LAG_WARNING_SECONDS:
         logger.warning(
             "Event loop lag detected: %.1fs (threshold %.1fs).",
@@ -106,6 +504,149 @@ async def before_event_loop_monitor():
     await bot.wait_until_ready()
 
 
+@tasks.loop(seconds=HEALTH_SAMPLE_INTERVAL_SECONDS)
+async def sample_health():
+    try:
+        await system_executor.run(
+            health_sampler.record,
+            _last_loop_lag_seconds,
+            get_executor_stats(),
+        )
+    except ExecutorBusyError:
+        logger.warning("Skipped health sample: system pool is busy.")
+    except Exception:
+        logger.exception("Health sample failed.")
+
+
+@sample_health.before_loop
+async def before_sample_health():
+    await bot.wait_until_ready()
+
+
+def _post_channel_names():
+    """Names of the text channels in the post category, from the gateway cache (no REST call)."""
+    if POST_CATEGORY_ID is None:
+        return []
+    category = bot.get_channel(POST_CATEGORY_ID)
+    if not isinstance(category, discord.CategoryChannel):
+        return []
+    return [channel.name for channel in category.text_channels]
+
+
+_prewarm_tickers = []
+
+
+@tasks.loop(seconds=PREWARM_INTERVAL_SECONDS)
+async def prewarm_upcoming_splits():
+    global _prewarm_tickers
+
+    try:
+        tickers = await system_executor.run(
+            collect_prewarm_tickers,
+            split_registry,
+            _post_channel_names(),
+            days_ahead=PREWARM_DAYS_AHEAD,
+            max_tickers=PREWARM_MAX_TICKERS,
+        )
+        _prewarm_tickers = tickers
+        if not tickers:
+            return
+
+        await network_executor.run(prewarm_quotes, tickers)
+        # One render at a time so warming never takes more than one render worker from users.
+        for ticker in tickers:
+            for period in PREWARM_CHART_PERIODS:
+                await render_executor.run(
+                    generate_stock_chart,
+                    ticker,
+                    period,
+                    renderer=chart_renderer.render if chart_renderer is not None else None,
+                )
+    except ExecutorBusyError:
+        logger.info("Skipped split pre-warm: worker pools are busy.")
+    except Exception:
+        logger.exception("Split pre-warm failed.")
+
+
+@prewarm_upcoming_splits.before_loop
+async def before_prewarm_upcoming_splits():
+    await bot.wait_until_ready()
+
+
+@tasks.loop(seconds=PREWARM_QUOTE_REFRESH_SECONDS)
+async def refresh_prewarmed_quotes():
+    # Quotes keep the configured TTL, so they are refreshed more often than charts.
+    if not _prewarm_tickers:
+        return
+    try:
+        await network_executor.run(prewarm_quotes, _prewarm_tickers)
+    except ExecutorBusyError:
+        logger.info("Skipped quote pre-warm: network pool is busy.")
+    except Exception:
+        logger.exception("Quote pre-warm failed.")
+
+
+@refresh_prewarmed_quotes.before_loop
+async def before_refresh_prewarmed_quotes():
+    await bot.wait_until_ready()
+
+
+@tasks.loop(minutes=JANITOR_INTERVAL_MINUTES)
+async def clean_up_post_channels():
+    try:
+        await _clean_up_expired_post_channels()
+    except Exception:
+        logger.exception("Post channel cleanup failed.")
+
+
+async def _clean_up_expired_post_channels():
+    category = bot.get_channel(POST_CATEGORY_ID) if POST_CATEGORY_ID is not None else None
+    if not isinstance(category, discord.CategoryChannel):
+        return
+
+    expired = find_expired_post_channels(category.text_channels, grace_days=JANITOR_GRACE_DAYS)
+    if not expired:
+        return
+
+    reason = "Reverse split last day to buy has passed"
+    if JANITOR_MODE == "delete":
+
+        async def action(channel):
+            await channel.delete(reason=reason)
+
+    else:
+        archive = bot.get_channel(POST_ARCHIVE_CATEGORY_ID) if POST_ARCHIVE_CATEGORY_ID is not None else None
+        if not isinstance(archive, discord.CategoryChannel):
+            logger.warning("Janitor is in archive mode but POST_ARCHIVE_CATEGORY_ID is not a category; skipping.")
+            return
+        capacity = MAX_CATEGORY_CHANNELS - len(archive.channels)
+        if capacity <= 0:
+            logger.warning("Archive category is full (%d channels); skipping channel cleanup.", MAX_CATEGORY_CHANNELS)
+            return
+        expired = expired[:capacity]
+
+        async def action(channel):
+            await channel.edit(category=archive, sync_permissions=True, reason=reason)
+
+    done, failed = await clean_up_channels(
+        expired,
+        action,
+        batch_size=JANITOR_BATCH_SIZE,
+        pause_seconds=JANITOR_BATCH_PAUSE_SECONDS,
+    )
+    logger.info(
+        "Janitor %s %d expired post channels (%d failed).",
+        "deleted" if JANITOR_MODE == "delete" else "archived",
+        done,
+        failed,
+    )
+
+
+@clean_up_post_channels.before_loop
+async def before_clean_up_post_channels():
+    await bot.wait_until_ready()
+
+
 @bot.event
 async def on_disconnect():
     logger.warning("Disconnected from Discord gateway.")
@@ -121,6 +662,16 @@ async def on_command_error(ctx, error):
     if isinstance(error, commands.CommandNotFound):
         return
 
+    if isinstance(error, CommandRateLimited):
+        COMMAND_ERRORS.inc(ctx.command.qualified_name, "rate_limited")
+        await ctx.send(
+            format_error(
+                "Rate Limit",
+                f"Too many requests. Try again in {max(1, math.ceil(error.retry_after))}s.",
+            )
+        )
+        return
+
     if isinstance(error, commands.MissingRequiredArgument):
         usage = None
         if ctx.command is not None:
@@ -173,79 +724,235 @@ async def help_command(ctx, *, command_name: str = ""):
     )
 
 
-@bot.command(name="price", help="Gets the current or most recent price of a specified stock ticker.")
-async def fetch_stock_price(ctx, ticker: str):
+@bot.command(
+    name="price",
+    help=f"Gets the current or most recent price of up to {MAX_PRICE_TICKERS} stock tickers. Usage: !price [ticker] [ticker...].",
+)
+async def fetch_stock_price(ctx, *tickers: str):
+    if not tickers:
+        await ctx.send(format_error("Price Lookup", "Missing ticker. Usage: `!price AAPL [TSLA ...]`"))
+        return
+
     try:
         async with ctx.typing():
-            response = await asyncio.wait_for(
-                asyncio.to_thread(get_stock_price, ticker),
-                timeout=COMMAND_TIMEOUT_SECONDS,
-            )
-        await ctx.send(response)
+            if len(tickers) == 1 and async_quotes_available():
+                # The quote is awaited on the loop; no network worker is tied up.
+                lookup = get_stock_price_async(tickers[0], executor=network_executor)
+            elif len(tickers) == 1:
+                lookup = network_executor.run_cancellable(get_stock_price, tickers[0])
+            else:
+                lookup = network_executor.run_cancellable(get_stock_prices, tickers)
+            response = await asyncio.wait_for(lookup, timeout=COMMAND_TIMEOUT_SECONDS)
+        with span("discord.send", phase="send"):
+            await ctx.send(response)
     except asyncio.TimeoutError:
+        COMMAND_TIMEOUTS.inc("price")
+        set_trace_status("timeout")
         await ctx.send(
             format_error(
                 "Price Lookup",
                 f"Timed out after {int(COMMAND_TIMEOUT_SECONDS)} seconds. Try again.",
             )
         )
+    except ExecutorBusyError as error:
+        await _send_busy_error(ctx, "Price Lookup", error)
     except Exception:
         await _send_command_error(ctx, "Price Lookup")
 
 
+async def _build_health_response():
+    """The ``!health`` reply: formatted from samples when there are any, else probed on the system pool."""
+    if health_sampler.latest() is not None:
+        return get_sampled_server_status(
+            health_sampler,
+            HEALTH_WINDOW_MINUTES * 60,
+            get_executor_stats(),
+            get_bot_stats(),
+        )
+    return await system_executor.run(get_server_status, get_executor_stats(), get_bot_stats())
+
+
 @bot.command(name="health", help="Displays health information of the server and bot.")
 async def health(ctx):
     try:
         async with ctx.typing():
-            response = await asyncio.wait_for(
-                asyncio.to_thread(get_server_status),
-                timeout=COMMAND_TIMEOUT_SECONDS,
-            )
+            response = await asyncio.wait_for(_build_health_response(), timeout=COMMAND_TIMEOUT_SECONDS)
         await ctx.send(response)
     except asyncio.TimeoutError:
+        COMMAND_TIMEOUTS.inc("health")
+        set_trace_status("timeout")
         await ctx.send(
             format_error(
                 "Health Check",
                 f"Timed out after {int(COMMAND_TIMEOUT_SECONDS)} seconds. Try again.",
             )
         )
+    except ExecutorBusyError as error:
+        await _send_busy_error(ctx, "Health Check", error)
     except Exception:
         await _send_command_error(ctx, "Health Check")
 
 
-@bot.command(name="rsa", help="Calculates reverse split arbitrage profitability. Ratio format: small:big (example: 1:10).")
-async def rsa(ctx, ticker: str, split_ratio: str):
+@bot.command(
+    name="watch",
+    help=f"Posts live-updating prices for up to {MAX_PRICE_TICKERS} tickers. Usage: !watch [ticker] [ticker...].",
+)
+async def watch(ctx, *tickers: str):
+    ticker_keys, error_response = parse_watch_tickers(tickers)
+    if error_response is not None:
+        await ctx.send(error_response)
+        return
+
+    try:
+        live_watch = watch_manager.add(
+            ctx.guild.id if ctx.guild is not None else None,
+            ctx.channel.id,
+            ctx.author.id,
+            ticker_keys,
+        )
+    except WatchLimitExceeded as error:
+        hint = "Stop one with `!unwatch` first." if ctx.guild is not None else "Try again later."
+        await ctx.send(format_error("Watch", f"{str(error).capitalize()}. {hint}"))
+        return
+
     try:
         async with ctx.typing():
-            response = await asyncio.wait_for(
-                asyncio.to_thread(calculate_reverse_split_arbitrage, ticker, split_ratio),
-                timeout=COMMAND_TIMEOUT_SECONDS,
+            with span("watch.fetch", phase="fetch"):
+                live_watch.snapshots = await asyncio.wait_for(
+                    _fetch_watch_snapshots(ticker_keys),
+                    timeout=COMMAND_TIMEOUT_SECONDS,
+                )
+        content = watch_manager.render(live_watch)
+        with span("discord.send", phase="send"):
+            message = await ctx.send(content)
+        watch_manager.attach(live_watch, message, content)
+    except asyncio.TimeoutError:
+        watch_manager.remove(live_watch)
+        COMMAND_TIMEOUTS.inc("watch")
+        set_trace_status("timeout")
+        await ctx.send(
+            format_error(
+                "Watch",
+                f"Timed out after {int(COMMAND_TIMEOUT_SECONDS)} seconds. Try again.",
             )
-        await ctx.send(response)
+        )
+    except ExecutorBusyError as error:
+        watch_manager.remove(live_watch)
+        await _send_busy_error(ctx, "Watch", error)
+    except Exception:
+        watch_manager.remove(live_watch)
+        await _send_command_error(ctx, "Watch")
+
+
+@bot.command(name="unwatch", help="Stops your live price watches in this channel.")
+async def unwatch(ctx):
+    stopped = watch_manager.stop(ctx.channel.id, ctx.author.id)
+    if stopped:
+        await ctx.send(format_response("Watch", [f"Stopped {stopped} watch{'es' if stopped != 1 else ''}."]))
+    else:
+        await ctx.send(format_error("Watch", "You have no active watch in this channel."))
+
+
+@bot.command(
+    name="rsa",
+    help="Calculates reverse split arbitrage profitability. Ratio format: small:big (example: 1:10). Add --grid for a scenario table.",
+)
+async def rsa(ctx, ticker: str, split_ratio: str, *options: str):
+    grid, error_response = parse_rsa_options(options)
+    if error_response is not None:
+        await ctx.send(error_response)
+        return
+
+    try:
+        async with ctx.typing():
+            if grid is not None:
+                if async_quotes_available():
+                    lookup = calculate_rsa_grid_async(ticker, split_ratio, **grid, executor=network_executor)
+                else:
+                    lookup = network_executor.run_cancellable(calculate_rsa_grid, ticker, split_ratio, **grid)
+            elif async_quotes_available():
+                lookup = calculate_reverse_split_arbitrage_async(ticker, split_ratio, executor=network_executor)
+            else:
+                lookup = network_executor.run_cancellable(calculate_reverse_split_arbitrage, ticker, split_ratio)
+            response = await asyncio.wait_for(lookup, timeout=COMMAND_TIMEOUT_SECONDS)
+        with span("discord.send", phase="send"):
+            await ctx.send(response)
     except asyncio.TimeoutError:
+        COMMAND_TIMEOUTS.inc("rsa")
+        set_trace_status("timeout")
         await ctx.send(
             format_error(
                 "Reverse Split Arbitrage",
                 f"Timed out after {int(COMMAND_TIMEOUT_SECONDS)} seconds. Try again.",
             )
         )
+    except ExecutorBusyError as error:
+        await _send_busy_error(ctx, "Reverse Split Arbitrage", error)
     except Exception:
         await _send_command_error(ctx, "Reverse Split Arbitrage")
 
 
+@bot.command(
+    name="rsa_scan",
+    help="Ranks a pasted list or attached CSV of reverse splits (ticker, ratio, last day to buy) by estimated profit.",
+)
+async def rsa_scan(ctx, *, text: str = ""):
+    attachments = getattr(ctx.message, "attachments", None) or []
+    if attachments:
+        attachment = attachments[0]
+        if attachment.size > MAX_SCAN_ATTACHMENT_BYTES:
+            await ctx.send(format_error("RSA Scan", "Attachment is too large. Keep the CSV under 64 KB."))
+            return
+        try:
+            text = (await attachment.read()).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            await ctx.send(format_error("RSA Scan", "Attachment must be a UTF-8 text or CSV file."))
+            return
+
+    rows, error_response = parse_scan_rows(text)
+    if error_response is not None:
+        await ctx.send(error_response)
+        return
+
+    try:
+        async with ctx.typing():
+            # Always the threaded path: the provider prices every row in one bulk request.
+            response = await asyncio.wait_for(
+                network_executor.run_cancellable(scan_reverse_splits, rows),
+                timeout=COMMAND_TIMEOUT_SECONDS,
+            )
+        with span("discord.send", phase="send"):
+            await ctx.send(response)
+    except asyncio.TimeoutError:
+        COMMAND_TIMEOUTS.inc("rsa_scan")
+        set_trace_status("timeout")
+        await ctx.send(
+            format_error(
+                "RSA Scan",
+                f"Timed out after {int(COMMAND_TIMEOUT_SECONDS)} seconds. Try again.",
+            )
+        )
+    except ExecutorBusyError as error:
+        await _send_busy_error(ctx, "RSA Scan", error)
+    except Exception:
+        await _send_command_error(ctx, "RSA Scan")
+
+
 @bot.command(
     name="chart",
-    help="Sends a dark mode stock chart. Usage: !chart [ticker] [period]. Default period is 1d. Periods: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max.",
+    help="Sends a stock chart. Usage: !chart [ticker] [period] [theme]. Default period is 1d, default theme is dark. Periods: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max. Themes: dark, light.",
 )
-async def chart(ctx, ticker: str, period: str = "1d"):
+async def chart(ctx, ticker: str, period: str = "1d", theme: str = "dark"):
     chart_stream = None
     try:
         async with ctx.typing():
             chart_stream, filename, caption, error_message = await asyncio.wait_for(
-                asyncio.to_thread(
+                render_executor.run_cancellable(
                     generate_stock_chart,
                     ticker,
                     period,
+                    theme,
+                    renderer=chart_renderer.render if chart_renderer is not None else None,
                 ),
                 timeout=CHART_TIMEOUT_SECONDS,
             )
@@ -253,14 +960,19 @@ async def chart(ctx, ticker: str, period: str = "1d"):
             await ctx.send(error_message)
             return
 
-        await ctx.send(content=caption, file=discord.File(fp=chart_stream, filename=filename))
+        with span("discord.send", phase="send"):
+            await ctx.send(content=caption, file=discord.File(fp=chart_stream, filename=filename))
     except asyncio.TimeoutError:
+        COMMAND_TIMEOUTS.inc("chart")
+        set_trace_status("timeout")
         await ctx.send(
             format_error(
                 "Chart",
                 f"Timed out after {int(CHART_TIMEOUT_SECONDS)} seconds while generating chart data. Try again.",
             )
         )
+    except ExecutorBusyError as error:
+        await _send_busy_error(ctx, "Chart", error)
     except Exception:
         await _send_command_error(ctx, "Chart")
     finally:
@@ -304,6 +1016,18 @@ async def post(ctx, ticker: str, split_ratio: str, last_day_to_buy: str, source_
         )
         return
 
+    # Same parser as !rsa, so the registry never stores a ratio !rsa would reject.
+    try:
+        parse_split_ratio(split_ratio)
+    except (ValueError, ZeroDivisionError):
+        await ctx.send(
+            format_error(
+                "Post",
+                f"Invalid split ratio `{split_ratio}`. Use 'small:big' with positive numbers (example: 1:10).",
+            )
+        )
+        return
+
     category = ctx.guild.get_channel(POST_CATEGORY_ID)
     if category is None:
         try:
@@ -340,6 +1064,21 @@ async def post(ctx, ticker: str, split_ratio: str, last_day_to_buy: str, source_
         await ctx.send(format_error("Post", "Could not create the new channel in the target category."))
         return
 
+    try:
+        await system_executor.run(
+            split_registry.record,
+            ctx.guild.id,
+            ticker,
+            split_ratio,
+            buy_date,
+            source_url=source_link,
+            channel_id=new_channel.id,
+            created_by=ctx.author.id,
+        )
+    except Exception:
+        # The channel exists either way; a missing registry row only hides it from !splits.
+        logger.exception("Could not record split for %s in the registry.", ticker.upper())
+
     announcement = build_reverse_split_announcement(ticker, split_ratio, buy_date, source_link)
     try:
         await new_channel.send(
@@ -355,18 +1094,49 @@ async def post(ctx, ticker: str, split_ratio: str, last_day_to_buy: str, source_
         )
         return
 
+
+@bot.command(name="splits", help="Lists reverse splits posted with !post. Usage: !splits [upcoming|ticker].")
+async def splits(ctx, query: str = "upcoming"):
+    if ctx.guild is None:
+        await ctx.send(format_error("Splits", "This command can only run in a server."))
+        return
+
+    try:
+        response = await system_executor.run(get_splits_response, split_registry, ctx.guild.id, query)
+    except ExecutorBusyError as error:
+        await _send_busy_error(ctx, "Splits", error)
+        return
+    except Exception:
+        await _send_command_error(ctx, "Splits")
+        return
+    await ctx.send(response)
+
+
 @bot.command(name="test_all", help="Tests all bot commands with sample inputs.")
 async def run_all_tests(ctx):
     try:
         async with ctx.typing():
-            await asyncio.wait_for(test_all(ctx), timeout=TEST_ALL_TIMEOUT_SECONDS)
+            await asyncio.wait_for(
+                test_all(
+                    ctx,
+                    network_executor,
+                    render_executor,
+                    _build_health_response,
+                    renderer=chart_renderer.render if chart_renderer is not None else None,
+                ),
+                timeout=TEST_ALL_TIMEOUT_SECONDS,
+            )
     except asyncio.TimeoutError:
+        COMMAND_TIMEOUTS.inc("test_all")
+        set_trace_status("timeout")
         await ctx.send(
             format_error(
                 "Test Run",
                 f"Timed out after {int(TEST_ALL_TIMEOUT_SECONDS)} seconds.",
             )
         )
+    except ExecutorBusyError as error:
+        await _send_busy_error(ctx, "Test Run", error)
     except Exception:
         await _send_command_error(ctx, "Test Run")
 
@@ -382,11 +1152,29 @@ async def usercount(ctx):
     await ctx.send(response)
 
 
+async def _run_bot(token: str):
+    try:
+        async with bot:
+            await bot.start(token)
+    finally:
+        # The aiohttp sessions belong to this loop, so close them before it goes away.
+        await watch_manager.close()
+        await close_async_client()
+        if metrics_server is not None:
+            await metrics_server.stop()
+
+
 def main():
     token = (BOT_TOKEN or "").strip()
     if not token:
         raise RuntimeError("BOT_TOKEN is not set. Configure BOT_TOKEN in your .env file.")
-    bot.run(token)
+    try:
+        asyncio.run(_run_bot(token))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if chart_renderer is not None:
+            chart_renderer.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""Compare chart renders per second: fresh figure per render vs reused figures.
+
+Usage: python scripts/bench_chart_render.py [--renders 20] [--bars 250]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from commands.chart_render import configure_chart_renderer, render_chart_png  # noqa: E402
+
+
+def build_frame(bars):
+    rng = np.random.default_rng(7)
+    closes = 100 + np.cumsum(rng.normal(size=bars))
+    opens = closes + rng.normal(scale=0.3, size=bars)
+    return pd.DataFrame(
+        {
+            "Open": opens,
+            "High": np.maximum(opens, closes) + 0.5,
+            "Low": np.minimum(opens, closes) - 0.5,
+            "Close": closes,
+        },
+        index=pd.date_range("2024-01-01", periods=bars, freq="D"),
+    )
+
+
+def measure(frame, renders, reuse_figures):
+    configure_chart_renderer(reuse_figures=reuse_figures)
+    render_chart_png(frame, "warmup", "%b %d")
+    started = time.perf_counter()
+    for _ in range(renders):
+        render_chart_png(frame, "BENCH (1y)", "%b %d")
+    return renders / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=250)
+    args = parser.parse_args()
+
+    frame = build_frame(args.bars)
+    fresh = measure(frame, args.renders, reuse_figures=False)
+    reused = measure(frame, args.renders, reuse_figures=True)
+    print(f"fresh figure:  {fresh:.2f} renders/s")
+    print(f"reused figure: {reused:.2f} renders/s ({reused / fresh:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
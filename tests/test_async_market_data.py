@@ -0,0 +1,181 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+import commands.market_data as market_data
+from commands.async_market_data import YahooChartClient, aiohttp, parse_chart_snapshot
+from commands.market_providers import YFinanceProvider
+from commands.executors import BoundedExecutor
+from commands.price import get_stock_price_async
+from commands.rsa import calculate_reverse_split_arbitrage_async
+
+try:
+    from aiohttp import web
+except ModuleNotFoundError:
+    web = None
+
+
+def _chart_payload(closes, regular_market_price=None):
+    return {
+        "chart": {
+            "result": [
+                {
+                    "meta": {
+                        "regularMarketPrice": regular_market_price,
+                        "exchangeTimezoneName": "America/New_York",
+                    },
+                    "timestamp": [1700000000 + 86400 * index for index in range(len(closes))],
+                    "indicators": {"quote": [{"close": closes}]},
+                }
+            ],
+            "error": None,
+        }
+    }
+
+
+class ParseChartTests(unittest.TestCase):
+    def test_snapshot_falls_back_to_last_close(self):
+        result = _chart_payload([10.0, None, 11.0])["chart"]["result"][0]
+        self.assertEqual(parse_chart_snapshot(result), (11.0, 10.0))
+
+    def test_snapshot_without_prices(self):
+        result = _chart_payload([])["chart"]["result"][0]
+        self.assertEqual(parse_chart_snapshot(result), (None, None))
+
+
+@unittest.skipIf(web is None, "aiohttp not installed in test environment")
+class YahooChartClientTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.statuses = []
+        self.requests = []
+
+        async def chart(request):
+            ticker = request.match_info["ticker"]
+            self.requests.append((ticker, request.query.get("range"), request.query.get("interval")))
+            if self.statuses:
+                return web.Response(status=self.statuses.pop(0))
+            if ticker == "MISSING":
+                return web.json_response({"chart": {"result": None, "error": {"code": "Not Found"}}}, status=404)
+            return web.json_response(_chart_payload([100.0, 101.5, 103.0], regular_market_price=104.25))
+
+        app = web.Application()
+        app.router.add_get("/v8/finance/chart/{ticker}", chart)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.client = YahooChartClient(base_url=f"http://127.0.0.1:{port}", retries=2, backoff_seconds=0.01)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.runner.cleanup()
+
+    async def test_snapshot_uses_market_price_and_previous_close(self):
+        self.assertEqual(await self.client.get_price_snapshot("AAPL"), (104.25, 101.5))
+        self.assertEqual(self.requests, [("AAPL", "5d", "1d")])
+
+    async def test_history_returns_timezone_aware_timestamps(self):
+        timestamps, prices = await self.client.get_price_history("AAPL", period="1mo")
+
+        self.assertEqual(prices, [100.0, 101.5, 103.0])
+        self.assertEqual(str(timestamps[0].tzinfo), "America/New_York")
+        self.assertEqual(self.requests, [("AAPL", "1mo", "1d")])
+
+    async def test_unknown_ticker_returns_none(self):
+        self.assertIsNone(await self.client.get_latest_price("MISSING"))
+
+    async def test_rate_limited_response_is_retried(self):
+        self.statuses = [429, 503]
+        self.assertEqual(await self.client.get_latest_price("AAPL"), 104.25)
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_gives_up_after_configured_retries(self):
+        self.statuses = [500, 500, 500]
+        self.assertEqual(await self.client.get_price_snapshot("AAPL"), (None, None))
+        self.assertEqual(len(self.requests), 3)
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp not installed in test environment")
+class AsyncQuoteCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.previous_provider = market_data.get_market_data_provider()
+        self.previous_client = market_data.ASYNC_CLIENT
+        self.provider = Mock(spec=YFinanceProvider)
+        self.provider.name = YFinanceProvider.name
+        self.provider.get_latest_price.return_value = None
+        self.provider.get_price_snapshot.return_value = (None, None)
+        self.provider.get_price_snapshots.return_value = {}
+        market_data.set_market_data_provider(self.provider)
+        self.client = AsyncMock()
+        market_data.ASYNC_CLIENT = self.client
+
+    def tearDown(self):
+        market_data.ASYNC_CLIENT = self.previous_client
+        market_data.set_market_data_provider(self.previous_provider)
+
+    async def test_concurrent_lookups_share_one_request(self):
+        release = asyncio.Event()
+
+        async def slow_snapshot(_ticker):
+            await release.wait()
+            return 10.0, 9.0
+
+        self.client.get_price_snapshot.side_effect = slow_snapshot
+        lookups = [asyncio.create_task(market_data.get_price_snapshot_async("aapl")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await asyncio.gather(*lookups), [(10.0, 9.0)] * 5)
+        self.assertEqual(self.client.get_price_snapshot.await_count, 1)
+
+        # Cached for the next caller, including the threaded path.
+        self.assertEqual(await market_data.get_price_snapshot_async("AAPL"), (10.0, 9.0))
+        self.assertEqual(market_data.get_price_snapshot("AAPL"), (10.0, 9.0))
+        self.assertEqual(self.client.get_price_snapshot.await_count, 1)
+
+    async def test_failed_lookup_is_not_cached(self):
+        self.client.get_latest_price.side_effect = [None, 12.5]
+        self.assertIsNone(await market_data.get_latest_price_async("TSLA"))
+        self.assertEqual(await market_data.get_latest_price_async("TSLA"), 12.5)
+
+    async def test_failed_async_request_falls_back_on_the_given_executor(self):
+        self.client.get_price_snapshot.return_value = (None, None)
+        self.provider.get_price_snapshot.return_value = (20.0, 19.0)
+        executor = BoundedExecutor("network", max_workers=1, max_queue=1)
+        self.addCleanup(executor.shutdown)
+
+        self.assertEqual(await market_data.get_price_snapshot_async("blocked"), (None, None))
+        self.provider.get_price_snapshot.assert_not_called()
+
+        with patch.object(executor, "run_cancellable", wraps=executor.run_cancellable) as run_cancellable:
+            self.assertEqual(await market_data.get_price_snapshot_async("blocked", executor=executor), (20.0, 19.0))
+        run_cancellable.assert_awaited_once()
+        self.provider.get_price_snapshot.assert_called_once_with("BLOCKED")
+
+    async def test_price_command_helpers(self):
+        self.client.get_price_snapshot.side_effect = lambda ticker: {
+            "AAPL": (110.0, 100.0),
+            "MSFT": (None, None),
+        }[ticker]
+
+        single = await get_stock_price_async("aapl")
+        self.assertIn("Price for AAPL", single)
+        self.assertIn("+$10.00 (+10.00%)", single)
+
+        self.assertIn("Could not retrieve", await get_stock_price_async("msft"))
+
+    async def test_rsa_uses_async_latest_price(self):
+        self.client.get_latest_price.return_value = 2.0
+        response = await calculate_reverse_split_arbitrage_async("abc", "1:10")
+        self.assertIn("Estimated Profitability: $18.00", response)
+
+    def test_only_yahoo_provider_uses_async_client(self):
+        self.assertTrue(market_data.async_quotes_available())
+        with patch.object(market_data, "_provider", object()):
+            self.assertFalse(market_data.async_quotes_available())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from commands.bar_store import BarStore, pd, period_covers
+
+
+def _daily_frame(start, periods, first_close=100.0):
+    index = pd.date_range(start, periods=periods, freq="D", tz="America/New_York")
+    closes = [first_close + i for i in range(periods)]
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": [value + 1 for value in closes],
+            "Low": [value - 1 for value in closes],
+            "Close": closes,
+            "Volume": [1000.0] * periods,
+        },
+        index=index,
+    )
+
+
+class RecordingProvider:
+    def __init__(self, full_frame, delta_frame=None):
+        self.full_frame = full_frame
+        self.delta_frame = delta_frame
+        self.calls = []
+
+    def get_ohlc_history(self, ticker, period="3mo", interval="1d", start=None):
+        self.calls.append((ticker, period, interval, start))
+        if start is not None:
+            return self.delta_frame
+        return self.full_frame
+
+
+@unittest.skipIf(pd is None, "pandas not installed in test environment")
+class BarStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = BarStore(os.path.join(self.temp_dir.name, "bars.sqlite3"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip_keeps_timezone_and_values(self):
+        frame = _daily_frame("2025-01-01", 3)
+        self.store.write("AAPL", "1d", frame, period="1mo")
+        stored = self.store.read("AAPL", "1d")
+
+        self.assertEqual(str(stored.index.tz), "America/New_York")
+        self.assertTrue(stored.index.equals(frame.index))
+        self.assertEqual(stored["Close"].tolist(), frame["Close"].tolist())
+
+    def test_second_request_fetches_only_new_bars(self):
+        full = _daily_frame("2025-01-01", 60)
+        # The delta repeats the last stored bar with an updated close plus one new bar.
+        delta = _daily_frame(full.index[-1].tz_localize(None), 2, first_close=500.0)
+        provider = RecordingProvider(full, delta)
+
+        first = self.store.get_history(provider, "aapl", period="1y", interval="1d")
+        self.assertEqual(len(first), 60)
+
+        second = self.store.get_history(provider, "AAPL", period="1mo", interval="1d")
+        self.assertEqual(provider.calls[0], ("AAPL", "1y", "1d", None))
+        self.assertEqual(provider.calls[1][3], full.index[-1])
+        self.assertEqual(second["Close"].iloc[-2], 500.0)
+        self.assertEqual(second["Close"].iloc[-1], 501.0)
+        self.assertLessEqual(len(second), 32)
+
+    def test_longer_period_triggers_full_fetch(self):
+        provider = RecordingProvider(_daily_frame("2025-01-01", 10))
+        self.store.get_history(provider, "AAPL", period="1mo", interval="1d")
+        self.store.get_history(provider, "AAPL", period="5y", interval="1d")
+
+        self.assertEqual([call[3] for call in provider.calls], [None, None])
+        self.assertEqual(self.store.get_coverage("AAPL", "1d")[0], "5y")
+
+    def test_intraday_store_is_pruned_to_covered_window(self):
+        index = pd.date_range("2025-02-14 09:30", periods=3, freq="5min", tz="America/New_York")
+        day_one = pd.DataFrame(
+            {"Open": [1.0] * 3, "High": [1.0] * 3, "Low": [1.0] * 3, "Close": [1.0] * 3},
+            index=index,
+        )
+        day_two = day_one.copy()
+        day_two.index = index + pd.Timedelta(days=3)
+        provider = RecordingProvider(day_one, day_two)
+
+        self.store.get_history(provider, "AAPL", period="1d", interval="5m")
+        latest = self.store.get_history(provider, "AAPL", period="1d", interval="5m")
+
+        self.assertEqual(len(latest), 3)
+        self.assertEqual(len(self.store.read("AAPL", "5m")), 3)
+
+    def _age_coverage(self, ticker, interval, seconds):
+        with sqlite3.connect(self.store.path) as connection:
+            connection.execute(
+                "UPDATE coverage SET fetched_at = ? WHERE ticker = ? AND interval = ?",
+                (time.time() - seconds, ticker, interval),
+            )
+
+    def test_stale_intraday_bars_are_refetched_in_full(self):
+        index = pd.date_range("2025-02-14 09:30", periods=3, freq="5min", tz="America/New_York")
+        frame = pd.DataFrame(
+            {"Open": [1.0] * 3, "High": [1.0] * 3, "Low": [1.0] * 3, "Close": [1.0] * 3},
+            index=index,
+        )
+        provider = RecordingProvider(frame)
+        self.store.get_history(provider, "AAPL", period="1d", interval="5m")
+        self._age_coverage("AAPL", "5m", 61 * 86400)
+
+        self.store.get_history(provider, "AAPL", period="1d", interval="5m")
+
+        self.assertEqual([call[3] for call in provider.calls], [None, None])
+
+    def test_stale_bars_are_not_served_when_the_refetch_fails(self):
+        provider = RecordingProvider(_daily_frame("2025-01-01", 10))
+        self.store.get_history(provider, "AAPL", period="1mo", interval="1d")
+        self._age_coverage("AAPL", "1d", 8 * 86400)
+        provider.full_frame = None
+
+        self.assertIsNone(self.store.get_history(provider, "AAPL", period="1mo", interval="1d"))
+
+    def test_recent_bars_are_served_when_the_delta_fails(self):
+        provider = RecordingProvider(_daily_frame("2025-01-01", 10))
+        self.store.get_history(provider, "AAPL", period="1mo", interval="1d")
+
+        history = self.store.get_history(provider, "AAPL", period="1mo", interval="1d")
+
+        self.assertEqual(len(history), 10)
+        self.assertIsNotNone(provider.calls[1][3])
+
+    def test_concurrent_misses_fetch_once(self):
+        release = threading.Event()
+
+        class SlowProvider(RecordingProvider):
+            def get_ohlc_history(self, *args, **kwargs):
+                release.wait(5)
+                return super().get_ohlc_history(*args, **kwargs)
+
+        provider = SlowProvider(_daily_frame("2025-01-01", 10))
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.store.get_history(provider, "AAPL", period="1mo", interval="1d")
+                )
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual([len(result) for result in results], [10, 10])
+
+
+class PeriodCoversTests(unittest.TestCase):
+    def test_period_order(self):
+        self.assertTrue(period_covers("1y", "6mo"))
+        self.assertTrue(period_covers("1y", "ytd"))
+        self.assertFalse(period_covers("1mo", "max"))
+        self.assertFalse(period_covers("bad", "1d"))
+
+
+if __name__ == "__main__":
+    unittest.main()
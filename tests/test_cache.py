@@ -0,0 +1,152 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import commands.market_data as market_data
+from commands.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TTLCacheTests(unittest.TestCase):
+    def test_entry_expires_after_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl_seconds=10, max_entries=4, clock=clock)
+        cache.set("AAPL", 1.0)
+
+        self.assertEqual(cache.get("AAPL"), (True, 1.0))
+        clock.now = 10.5
+        self.assertEqual(cache.get("AAPL"), (False, None))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(ttl_seconds=60, max_entries=2)
+        cache.set("AAPL", 1.0)
+        cache.set("TSLA", 2.0)
+        cache.get("AAPL")
+        cache.set("NVDA", 3.0)
+
+        self.assertEqual(cache.get("TSLA"), (False, None))
+        self.assertEqual(cache.get("AAPL"), (True, 1.0))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_get_or_load_skips_rejected_values(self):
+        cache = TTLCache(ttl_seconds=60, max_entries=4)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(cache.get_or_load("AAPL", loader, cache_if=lambda value: value is not None))
+        self.assertIsNone(cache.get_or_load("AAPL", loader, cache_if=lambda value: value is not None))
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_loads_share_one_fetch(self):
+        cache = TTLCache(ttl_seconds=60, max_entries=4)
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def loader():
+            calls.append(1)
+            release.wait(timeout=5)
+            return 42.0
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load("AAPL", loader)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while cache.stats()["coalesced"] < 4:
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [42.0] * 5)
+        stats = cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["coalesced"], 4)
+
+
+class StubProvider:
+    name = "stub"
+
+    def __init__(self, price=None, snapshot=(None, None)):
+        self.price = price
+        self.snapshot = snapshot
+        self.calls = []
+
+    def get_latest_price(self, ticker):
+        self.calls.append(("price", ticker))
+        return self.price
+
+    def get_price_snapshot(self, ticker):
+        self.calls.append(("snapshot", ticker))
+        return self.snapshot
+
+    def get_price_snapshots(self, tickers):
+        self.calls.append(("snapshots", tuple(tickers)))
+        return {ticker: self.snapshot for ticker in tickers if ticker != "ZZZZ"}
+
+
+class QuoteCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.previous_provider = market_data.get_market_data_provider()
+
+    def tearDown(self):
+        market_data.set_market_data_provider(self.previous_provider)
+
+    def test_price_snapshot_is_cached_per_ticker(self):
+        provider = market_data.set_market_data_provider(StubProvider(snapshot=(10.0, 9.0)))
+        self.assertEqual(market_data.get_price_snapshot("aapl"), (10.0, 9.0))
+        self.assertEqual(market_data.get_price_snapshot("AAPL"), (10.0, 9.0))
+        self.assertEqual(provider.calls, [("snapshot", "AAPL")])
+
+    def test_missing_price_is_not_cached(self):
+        provider = market_data.set_market_data_provider(StubProvider(price=None))
+        self.assertIsNone(market_data.get_latest_price("AAPL"))
+        self.assertIsNone(market_data.get_latest_price("AAPL"))
+        self.assertEqual(len(provider.calls), 2)
+
+    def test_batch_snapshots_fetch_only_uncached_tickers(self):
+        provider = market_data.set_market_data_provider(StubProvider(snapshot=(10.0, 9.0)))
+        market_data.get_price_snapshot("AAPL")
+        snapshots = market_data.get_price_snapshots(["aapl", "tsla", "ZZZZ"])
+
+        self.assertEqual(snapshots, {"AAPL": (10.0, 9.0), "TSLA": (10.0, 9.0)})
+        self.assertEqual(provider.calls[-1], ("snapshots", ("TSLA", "ZZZZ")))
+        self.assertEqual(market_data.get_price_snapshot("TSLA"), (10.0, 9.0))
+        self.assertEqual(len(provider.calls), 2)
+
+    def test_batch_snapshots_seed_latest_price(self):
+        provider = market_data.set_market_data_provider(StubProvider(snapshot=(10.0, 9.0), price=99.0))
+        market_data.get_price_snapshots(["TSLA"])
+
+        self.assertEqual(market_data.get_latest_price("tsla"), 10.0)
+        self.assertEqual(provider.calls, [("snapshots", ("TSLA",))])
+
+    def test_refresh_refetches_cached_tickers_with_configured_ttl(self):
+        clock = FakeClock()
+        provider = market_data.set_market_data_provider(StubProvider(snapshot=(10.0, 9.0)))
+        with patch.object(market_data, "QUOTE_CACHE", TTLCache(ttl_seconds=15, max_entries=10, clock=clock)):
+            market_data.get_price_snapshots(["AAPL"])
+            clock.now += 10
+            market_data.get_price_snapshots(["AAPL"], refresh=True)
+            clock.now += 14
+            self.assertEqual(market_data.get_price_snapshot("AAPL"), (10.0, 9.0))
+            clock.now += 2
+            market_data.get_price_snapshot("AAPL")
+        self.assertEqual([call[0] for call in provider.calls], ["snapshots", "snapshots", "snapshot"])
+
+
+if __name__ == "__main__":
+    unittest.main()
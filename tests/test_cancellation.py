@@ -0,0 +1,19 @@
+import unittest
+
+from commands.cancellation import CancelToken, OperationCancelled, raise_if_cancelled
+
+
+class CancelTokenTests(unittest.TestCase):
+    def test_raise_if_cancelled(self):
+        token = CancelToken()
+        token.raise_if_cancelled()
+        raise_if_cancelled(None)
+
+        token.cancel()
+        self.assertTrue(token.cancelled)
+        with self.assertRaises(OperationCancelled):
+            raise_if_cancelled(token)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,12 +6,20 @@ import commands.chart as chart
 
 
 class StockChartTests(unittest.TestCase):
+    def setUp(self):
+        chart.CHART_CACHE.clear()
+
     def test_invalid_period_returns_error(self):
         _stream, _filename, _caption, error_message = chart.generate_stock_chart("AAPL", "bad")
         self.assertIsNotNone(error_message)
         self.assertIn("**Chart Error**", error_message)
         self.assertIn("Invalid period", error_message)
 
+    def test_invalid_theme_returns_error(self):
+        _stream, _filename, _caption, error_message = chart.generate_stock_chart("AAPL", "1mo", "neon")
+        self.assertIn("Invalid theme 'neon'", error_message)
+        self.assertIn("dark, light", error_message)
+
     @patch("commands.chart.plt", None)
     def test_missing_matplotlib_returns_error(self):
         _stream, _filename, _caption, error_message = chart.generate_stock_chart("AAPL", "1mo")
@@ -127,11 +135,110 @@ class StockChartTests(unittest.TestCase):
                 "AAPL",
                 period="1d",
                 interval=chart.PERIOD_TO_INTERVAL["1d"],
+                cancel_token=None,
             )
         finally:
             if stream is not None:
                 stream.close()
 
+    @unittest.skipIf(chart.plt is None or chart.mpf is None, "chart deps not installed in test environment")
+    @patch("commands.chart.get_company_name", return_value="AAPL")
+    @patch("commands.chart.get_ohlc_history")
+    def test_custom_renderer_receives_frame_and_title(self, mock_history, _mock_company_name):
+        import pandas as pd
+
+        index = pd.to_datetime([dt.datetime(2025, 1, 1), dt.datetime(2025, 1, 2)])
+        frame = pd.DataFrame(
+            {
+                "Open": [100.0, 101.0],
+                "High": [102.0, 103.0],
+                "Low": [99.0, 100.0],
+                "Close": [100.0, 101.0],
+            },
+            index=index,
+        )
+        mock_history.return_value = frame
+        calls = []
+
+        def renderer(ohlc, title, datetime_format, theme):
+            calls.append((ohlc, title, datetime_format, theme))
+            return b"png-bytes"
+
+        stream, _filename, _caption, error_message = chart.generate_stock_chart("AAPL", "1mo", renderer=renderer)
+        self.assertIsNone(error_message)
+        self.assertEqual(stream.getvalue(), b"png-bytes")
+        self.assertEqual(calls[0][1], "AAPL (1mo)")
+        self.assertEqual(calls[0][2], "%b %d %H:%M")
+        self.assertEqual(calls[0][3], "dark")
+
+    @unittest.skipIf(chart.plt is None or chart.mpf is None, "chart deps not installed in test environment")
+    @patch("commands.chart.get_company_name", return_value="AAPL")
+    @patch("commands.chart.get_ohlc_history")
+    def test_repeated_chart_is_served_from_cache(self, mock_history, _mock_company_name):
+        import pandas as pd
+
+        index = pd.to_datetime([dt.datetime(2025, 1, 1), dt.datetime(2025, 1, 2)])
+        frame = pd.DataFrame(
+            {
+                "Open": [100.0, 101.0],
+                "High": [102.0, 103.0],
+                "Low": [99.0, 100.0],
+                "Close": [100.0, 101.0],
+            },
+            index=index,
+        )
+        mock_history.return_value = frame
+        calls = []
+
+        def renderer(ohlc, title, datetime_format, theme):
+            calls.append(title)
+            return b"png-bytes"
+
+        first = chart.generate_stock_chart("AAPL", "1y", renderer=renderer)
+        second = chart.generate_stock_chart("aapl", "1y", renderer=renderer)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second[0].getvalue(), b"png-bytes")
+        self.assertEqual(first[2], second[2])
+
+        # Once the company name loads, the titled image is rendered once more.
+        _mock_company_name.return_value = "Apple Inc."
+        named = chart.generate_stock_chart("AAPL", "1y", renderer=renderer)
+        chart.generate_stock_chart("AAPL", "1y", renderer=renderer)
+        self.assertEqual(calls[1:], ["Apple Inc. (AAPL) (1y)"])
+        self.assertIn("**Apple Inc. (AAPL) Chart (1y)**", named[2])
+
+        updated = frame.copy()
+        updated.iloc[-1, updated.columns.get_loc("Close")] = 102.0
+        mock_history.return_value = updated
+        chart.generate_stock_chart("AAPL", "1y", renderer=renderer)
+        self.assertEqual(len(calls), 3)
+
+    @unittest.skipIf(chart.plt is None or chart.mpf is None, "chart deps not installed in test environment")
+    @patch("commands.chart.get_company_name", return_value="Apple Inc.")
+    @patch("commands.chart.get_ohlc_history")
+    def test_light_theme_renders_png(self, mock_history, _mock_company_name):
+        import pandas as pd
+
+        index = pd.to_datetime([dt.datetime(2025, 1, 1), dt.datetime(2025, 1, 2)])
+        mock_history.return_value = pd.DataFrame(
+            {
+                "Open": [100.0, 101.0],
+                "High": [102.0, 103.0],
+                "Low": [99.0, 100.0],
+                "Close": [100.0, 101.0],
+            },
+            index=index,
+        )
+
+        stream, filename, _caption, error_message = chart.generate_stock_chart("AAPL", "1y", "light")
+        try:
+            self.assertIsNone(error_message)
+            self.assertEqual(filename, "AAPL_1y_light_chart.png")
+            self.assertTrue(stream.getvalue().startswith(b"\x89PNG\r\n\x1a\n"))
+        finally:
+            if stream is not None:
+                stream.close()
+
 
 if __name__ == "__main__":
     unittest.main()
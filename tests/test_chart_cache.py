@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from commands.chart_cache import ChartCache, build_chart_cache_key
+
+try:
+    import pandas as pd
+except ModuleNotFoundError:
+    pd = None
+
+
+class ChartCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_intraday_intervals_use_short_ttl(self):
+        cache = ChartCache(intraday_ttl_seconds=30, daily_ttl_seconds=600)
+        self.assertEqual(cache.ttl_for_interval("5m"), 30)
+        self.assertEqual(cache.ttl_for_interval("1d"), 600)
+        self.assertEqual(cache.ttl_for_interval("1wk"), 600)
+
+    def test_disk_tier_survives_memory_loss(self):
+        cache = ChartCache(disk_dir=self.temp_dir.name)
+        cache.set(("AAPL", "1y"), b"png", ttl_seconds=60)
+
+        restarted = ChartCache(disk_dir=self.temp_dir.name)
+        self.assertEqual(restarted.get(("AAPL", "1y")), b"png")
+        self.assertIsNone(restarted.get(("AAPL", "5y")))
+        self.assertFalse([name for name in os.listdir(self.temp_dir.name) if name.endswith(".tmp")])
+
+    def test_prune_disk_removes_expired_entries(self):
+        cache = ChartCache(disk_dir=self.temp_dir.name)
+        cache.set(("AAPL", "1d"), b"png", ttl_seconds=-1)
+        cache.prune_disk()
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    @unittest.skipIf(pd is None, "pandas not installed in test environment")
+    def test_key_changes_when_last_bar_changes(self):
+        index = pd.date_range("2025-01-01", periods=2, freq="D")
+        frame = pd.DataFrame({"Open": [1.0, 2.0], "Close": [1.5, 2.5]}, index=index)
+        key = build_chart_cache_key("AAPL", "1y", frame)
+
+        updated = frame.copy()
+        updated.iloc[-1, 1] = 3.0
+        self.assertNotEqual(key, build_chart_cache_key("AAPL", "1y", updated))
+        self.assertEqual(key, build_chart_cache_key("AAPL", "1y", frame.copy()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import multiprocessing
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import commands.chart_render as chart_render
+from commands.cancellation import CancelToken, OperationCancelled
+
+
+@unittest.skipIf(chart_render.plt is None or chart_render.mpf is None, "chart deps not installed in test environment")
+class ChartRenderTests(unittest.TestCase):
+    def setUp(self):
+        import pandas as pd
+
+        self.frame = pd.DataFrame(
+            {
+                "Open": [100.0, 101.0, 102.0],
+                "High": [102.0, 103.0, 104.0],
+                "Low": [99.0, 100.0, 101.0],
+                "Close": [101.0, 102.5, 101.0],
+            },
+            index=pd.date_range("2025-01-01", periods=3, freq="D"),
+        )
+        self.addCleanup(chart_render.configure_chart_renderer, reuse_figures=False)
+
+    def test_chart_style_is_built_once_per_theme(self):
+        self.assertIs(chart_render.get_chart_style("dark"), chart_render.get_chart_style("dark"))
+        self.assertIsNot(chart_render.get_chart_style("dark"), chart_render.get_chart_style("light"))
+
+    def test_reused_figure_renders_png_without_new_figures(self):
+        chart_render.configure_chart_renderer(reuse_figures=True)
+        first = chart_render.render_chart_png(self.frame, "AAPL (1mo)", "%b %d")
+        open_figures = len(chart_render.plt.get_fignums())
+        second = chart_render.render_chart_png(self.frame, "AAPL (1mo)", "%b %d")
+
+        self.assertTrue(first.startswith(b"\x89PNG\r\n\x1a\n"))
+        self.assertEqual(first, second)
+        self.assertEqual(len(chart_render.plt.get_fignums()), open_figures)
+
+    def test_fresh_figure_is_closed_after_render(self):
+        open_figures = len(chart_render.plt.get_fignums())
+        png_bytes = chart_render.render_chart_png(self.frame, "AAPL (1mo)", "%b %d", "light")
+        self.assertTrue(png_bytes.startswith(b"\x89PNG\r\n\x1a\n"))
+        self.assertEqual(len(chart_render.plt.get_fignums()), open_figures)
+
+    def test_cancelled_token_stops_render(self):
+        token = CancelToken()
+        token.cancel()
+        with self.assertRaises(OperationCancelled):
+            chart_render.render_chart_png(self.frame, "AAPL (1mo)", "%b %d", cancel_token=token)
+
+
+class TerminateExecutorTests(unittest.TestCase):
+    def test_busy_worker_is_killed(self):
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self.addCleanup(executor.shutdown, wait=False, cancel_futures=True)
+        executor.submit(time.sleep, 0).result(timeout=30)
+        future = executor.submit(time.sleep, 60)
+        time.sleep(0.2)
+
+        started = time.monotonic()
+        chart_render._terminate_executor(executor)
+        with self.assertRaises(BrokenProcessPool):
+            future.result(timeout=10)
+        self.assertLess(time.monotonic() - started, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from commands.downsample import downsample_ohlc, np
+
+try:
+    import pandas as pd
+except ModuleNotFoundError:
+    pd = None
+
+
+@unittest.skipIf(np is None or pd is None, "numpy/pandas not installed in test environment")
+class DownsampleOhlcTests(unittest.TestCase):
+    def _frame(self, rows):
+        values = np.arange(rows, dtype=float)
+        return pd.DataFrame(
+            {
+                "Open": values,
+                "High": values + 10,
+                "Low": values - 10,
+                "Close": values + 0.5,
+                "Volume": np.ones(rows),
+            },
+            index=pd.date_range("2025-01-01", periods=rows, freq="5min"),
+        )
+
+    def test_small_frame_is_returned_unchanged(self):
+        frame = self._frame(5)
+        self.assertIs(downsample_ohlc(frame, 10), frame)
+
+    def test_buckets_keep_true_open_high_low_close(self):
+        frame = self._frame(10)
+        result = downsample_ohlc(frame, 3)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result.index[0], frame.index[0])
+        self.assertEqual(result.index[1], frame.index[4])
+        self.assertEqual(result["Open"].tolist(), [0.0, 4.0, 8.0])
+        self.assertEqual(result["High"].tolist(), [13.0, 17.0, 19.0])
+        self.assertEqual(result["Low"].tolist(), [-10.0, -6.0, -2.0])
+        self.assertEqual(result["Close"].tolist(), [3.5, 7.5, 9.5])
+        self.assertEqual(result["Volume"].tolist(), [4.0, 4.0, 2.0])
+
+    def test_large_frame_is_capped(self):
+        result = downsample_ohlc(self._frame(5000), 240)
+        self.assertLessEqual(len(result), 240)
+        self.assertEqual(result["Close"].iloc[-1], 4999.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
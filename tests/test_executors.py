@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import unittest
+
+from commands.executors import BoundedExecutor, ExecutorBusyError
+
+
+class BoundedExecutorTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+        self.release = threading.Event()
+
+    async def asyncTearDown(self):
+        self.release.set()
+        self.executor.shutdown(wait=True)
+
+    async def test_runs_function_and_returns_result(self):
+        self.assertEqual(await self.executor.run(lambda a, b: a + b, 2, 3), 5)
+
+    async def test_rejects_when_workers_and_queue_are_full(self):
+        running = asyncio.ensure_future(self.executor.run(self.release.wait, 5))
+        queued = asyncio.ensure_future(self.executor.run(self.release.wait, 5))
+        await asyncio.sleep(0.05)
+
+        stats = self.executor.stats()
+        self.assertEqual(stats["running"], 1)
+        self.assertEqual(stats["queued"], 1)
+        with self.assertRaises(ExecutorBusyError):
+            await self.executor.run(lambda: None)
+        self.assertEqual(self.executor.stats()["rejected"], 1)
+
+        self.release.set()
+        await asyncio.gather(running, queued)
+        self.assertEqual(self.executor.stats()["queued"], 0)
+
+    async def test_timed_out_queued_job_frees_its_slot(self):
+        running = asyncio.ensure_future(self.executor.run(self.release.wait, 5))
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.executor.run(lambda: None), timeout=0.05)
+
+        self.assertEqual(self.executor.stats()["queued"], 0)
+        self.release.set()
+        await running
+
+    async def test_timed_out_job_is_cancelled_and_frees_its_slot(self):
+        stopped = threading.Event()
+
+        def job(cancel_token):
+            while not cancel_token.cancelled:
+                self.release.wait(0.01)
+            stopped.set()
+            cancel_token.raise_if_cancelled()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.executor.run_cancellable(job), timeout=0.05)
+
+        self.assertTrue(await asyncio.to_thread(stopped.wait, 5))
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.executor.stats()["running"], 0)
+        self.assertEqual(await self.executor.run(lambda: "free"), "free")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,46 @@ class ServerHealthTests(unittest.TestCase):
         self.assertIn("CPU Usage: Unavailable", response)
         self.assertIn("CPU Temperature: Unavailable", response)
 
+    def test_executor_stats_are_reported(self):
+        stats = [{"name": "render", "workers": 2, "running": 2, "queued": 3, "capacity": 6, "rejected": 1}]
+        with patch("commands.health.psutil", None):
+            response = health.get_server_status(stats)
+        self.assertIn("Render Pool: 2/2 busy, 3 queued, 1 rejected", response)
+
+    def test_bot_stats_are_reported(self):
+        bot_stats = {
+            "worst_loop_lag_seconds": 1.25,
+            "in_flight": {"chart": 2, "price": 0, "health": 1},
+            "caches": {"Quote Cache": {"hits": 3, "misses": 1, "coalesced": 0, "evictions": 0, "size": 4}},
+        }
+        with patch("commands.health.psutil", None):
+            response = health.get_server_status(bot_stats=bot_stats)
+        self.assertIn("Worst Event Loop Lag: 1.25s since start", response)
+        self.assertIn("In-Flight Commands: !chart=2, !health=1", response)
+        self.assertIn("Quote Cache: 75% served from cache (3 hits, 1 misses, 0 coalesced, 4 entries)", response)
+        self.assertIn("GC Collections (gen0/gen1/gen2):", response)
+        self.assertNotIn("Bot Memory", response)
+
+    @unittest.skipIf(health.psutil is None, "psutil not installed in test environment")
+    def test_process_lines_report_rss_growth(self):
+        fake_process = type(
+            "proc",
+            (),
+            {
+                "memory_info": lambda self: type("mem", (), {"rss": 150 * health.BYTES_PER_MB})(),
+                "num_threads": lambda self: 12,
+                "num_fds": lambda self: 40,
+            },
+        )()
+        with patch("commands.health.psutil.Process", return_value=fake_process), patch(
+            "commands.health._baseline_rss", 100 * health.BYTES_PER_MB
+        ):
+            lines = health.format_process_lines()
+        self.assertIn("Bot Memory (RSS): 150.0 MB (+50.0 MB since start)", lines)
+        self.assertIn("Bot Threads: 12", lines)
+        self.assertIn("Bot Open Files: 40", lines)
+        self.assertIn("In-Flight Commands: none", lines)
+
     @unittest.skipIf(health.psutil is None, "psutil not installed in test environment")
     @patch("commands.health.psutil.disk_usage")
     @patch("commands.health.psutil.boot_time")
@@ -36,6 +76,87 @@ class ServerHealthTests(unittest.TestCase):
 
         self.assertIn("**Server Health**", response)
         self.assertIn("CPU Temperature: Unavailable", response)
+        self.assertIn("Uptime: 0:16:40", response)
+
+
+@unittest.skipIf(health.psutil is None, "psutil not installed in test environment")
+class HealthSamplerTests(unittest.TestCase):
+    def _record(self, sampler, cpu, lag):
+        with patch("commands.health.psutil.cpu_percent", return_value=cpu), patch(
+            "commands.health.psutil.virtual_memory",
+            return_value=type("vm", (), {"percent": 50.0})(),
+        ), patch(
+            "commands.health.psutil.disk_usage",
+            return_value=type("du", (), {"percent": 70.0})(),
+        ), patch("commands.health._read_cpu_temperature", return_value=None):
+            return sampler.record(lag, [{"queued": 2}, {"queued": 1}])
+
+    def test_ring_buffer_keeps_only_latest_samples(self):
+        sampler = health.HealthSampler(max_samples=2)
+        for cpu in (10.0, 20.0, 30.0):
+            self._record(sampler, cpu, 0.0)
+
+        summary = sampler.summarize(window_seconds=3600)
+        self.assertEqual(summary["cpu_percent"], (20.0, 25.0, 30.0))
+        self.assertEqual(sampler.latest()["queue_depth"], 3)
+        self.assertNotIn("cpu_temp", summary)
+
+    def test_sampled_status_reports_latest_and_window(self):
+        sampler = health.HealthSampler(max_samples=10)
+        self._record(sampler, 10.0, 0.5)
+        self._record(sampler, 30.0, 1.5)
+
+        response = health.get_sampled_server_status(sampler, window_seconds=900)
+        self.assertIn("CPU Usage: 30.0% (15m min/avg/max 10.0% / 20.0% / 30.0%)", response)
+        self.assertIn("Event Loop Lag: 1.50s", response)
+        self.assertIn("CPU Temperature: Unavailable", response)
+        self.assertIn("Uptime:", response)
+
+    def test_sampled_status_formats_stored_process_metrics_without_probing(self):
+        sampler = health.HealthSampler(max_samples=10)
+        self._record(sampler, 10.0, 0.5)
+        sampler.latest()["process"] = {
+            "rss": 64 * health.BYTES_PER_MB,
+            "threads": 9,
+            "open_files": None,
+        }
+        sampler.latest()["uptime_seconds"] = 90
+
+        with patch("commands.health.psutil.Process") as mock_process, patch(
+            "commands.health.psutil.boot_time"
+        ) as mock_boot_time, patch("commands.health._baseline_rss", None):
+            response = health.get_sampled_server_status(sampler, window_seconds=900)
+
+        mock_process.assert_not_called()
+        mock_boot_time.assert_not_called()
+        self.assertIn("Bot Memory (RSS): 64.0 MB", response)
+        self.assertIn("Bot Threads: 9", response)
+        self.assertNotIn("Bot Open Files", response)
+        self.assertIn("Uptime: 0:01:30", response)
+
+    def test_process_probe_errors_are_tolerated(self):
+        def deny(_process):
+            raise health.psutil.AccessDenied()
+
+        fake_process = type(
+            "proc",
+            (),
+            {
+                "memory_info": lambda self: type("mem", (), {"rss": 1})(),
+                "num_threads": lambda self: 3,
+                "num_fds": deny,
+            },
+        )()
+        with patch("commands.health.psutil.Process", return_value=fake_process):
+            metrics = health.read_process_metrics()
+        self.assertEqual(metrics["threads"], 3)
+        self.assertIsNone(metrics["open_files"])
+
+    def test_sampled_status_without_samples_falls_back(self):
+        sampler = health.HealthSampler(max_samples=10)
+        with patch("commands.health.get_server_status", return_value="live") as live_status:
+            self.assertEqual(health.get_sampled_server_status(sampler, window_seconds=900), "live")
+        live_status.assert_called_once_with(None, None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import commands.http_session as http_session
+import commands.market_data as market_data
+from commands.market_providers import YFinanceProvider
+
+
+class RetryDelayTests(unittest.TestCase):
+    def test_exponential_backoff_with_jitter(self):
+        for attempt, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0)):
+            delay = http_session.retry_delay(attempt, 0.5)
+            self.assertGreaterEqual(delay, 0.5 * ceiling)
+            self.assertLessEqual(delay, 1.5 * ceiling)
+
+    def test_retry_after_header_is_capped(self):
+        self.assertEqual(http_session.retry_delay(1, 0.5, "1"), 1.0)
+        self.assertEqual(http_session.retry_delay(1, 0.5, "600"), http_session.MAX_RETRY_SLEEP_SECONDS)
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    statuses = []
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *_args):
+        pass
+
+
+@unittest.skipIf(http_session.YahooSession is None, "curl_cffi not installed in test environment")
+class YahooSessionTests(unittest.TestCase):
+    def setUp(self):
+        _FlakyHandler.statuses = []
+        _FlakyHandler.requests = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v8/finance/chart/AAPL"
+
+    def test_retries_429_and_5xx_then_succeeds(self):
+        _FlakyHandler.statuses = [429, 503]
+        session = http_session.create_yahoo_session(retries=2, backoff_seconds=0.01)
+        with patch("commands.http_session.time.sleep") as mock_sleep:
+            response = session.get(self.url, timeout=30)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_FlakyHandler.requests, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_gives_up_after_configured_retries(self):
+        _FlakyHandler.statuses = [500, 500, 500]
+        session = http_session.create_yahoo_session(retries=1, backoff_seconds=0.01)
+        with patch("commands.http_session.time.sleep"):
+            response = session.get(self.url)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(_FlakyHandler.requests, 2)
+
+    def test_no_retry_past_the_request_budget(self):
+        _FlakyHandler.statuses = [503, 503, 503]
+        session = http_session.create_yahoo_session(
+            connect_timeout_seconds=1,
+            retries=2,
+            backoff_seconds=0.01,
+            budget_seconds=1.5,
+        )
+        with patch("commands.http_session.time.sleep"):
+            response = session.get(self.url)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(_FlakyHandler.requests, 1)
+
+    def test_transport_errors_are_retried_once_by_the_session(self):
+        session = http_session.create_yahoo_session(retries=1, backoff_seconds=0.01)
+        self.assertEqual(session.retry.count, 0)
+        with (
+            patch.object(
+                http_session.curl_requests.Session,
+                "request",
+                side_effect=http_session.curl_requests.RequestsError("reset"),
+            ) as mock_request,
+            patch("commands.http_session.time.sleep"),
+        ):
+            with self.assertRaises(http_session.curl_requests.RequestsError):
+                session.get(self.url)
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_session_timeouts_override_caller_timeouts(self):
+        session = http_session.create_yahoo_session(connect_timeout_seconds=2, read_timeout_seconds=7)
+        with patch.object(http_session.curl_requests.Session, "request") as mock_request:
+            mock_request.return_value.status_code = 200
+            session.get(self.url, timeout=30)
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], (2.0, 7.0))
+
+
+class ConfigureHttpSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.previous_provider = market_data.get_market_data_provider()
+        self.addCleanup(market_data.set_market_data_provider, self.previous_provider)
+
+    def test_session_is_injected_into_yfinance_provider(self):
+        market_data.set_market_data_provider(YFinanceProvider())
+        sentinel = object()
+        with patch("commands.market_data.create_yahoo_session", return_value=sentinel):
+            market_data.configure_http_session(retries=1)
+
+        self.assertIs(market_data.get_market_data_provider().session, sentinel)
+        self.assertIs(market_data.HTTP_SESSION, sentinel)
+        market_data.HTTP_SESSION = None
+
+    def test_warm_reports_failure_without_raising(self):
+        provider = YFinanceProvider()
+        market_data.set_market_data_provider(provider)
+        with patch.object(provider, "get_price_snapshot", side_effect=RuntimeError("offline")):
+            self.assertFalse(market_data.warm_market_data_provider())
+
+
+if __name__ == "__main__":
+    unittest.main()
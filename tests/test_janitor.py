@@ -0,0 +1,76 @@
+import datetime as dt
+import unittest
+
+from commands.janitor import clean_up_channels, find_expired_post_channels
+from commands.post import CLOCK_EMOJI
+
+
+class FakeChannel:
+    def __init__(self, name, created_at=None):
+        self.name = name
+        self.created_at = created_at
+
+
+class Forbidden(Exception):
+    status = 403
+
+
+class FindExpiredPostChannelsTests(unittest.TestCase):
+    def test_only_post_channels_past_grace_period_oldest_first(self):
+        channels = [
+            FakeChannel(f"{CLOCK_EMOJI}-aapl-feb-5"),
+            FakeChannel("general"),
+            FakeChannel(f"{CLOCK_EMOJI}-tsla-feb-1"),
+            FakeChannel(f"{CLOCK_EMOJI}-grace-feb-8"),
+            FakeChannel(f"{CLOCK_EMOJI}-soon-feb-20"),
+        ]
+
+        expired = find_expired_post_channels(channels, today=dt.date(2026, 2, 10), grace_days=2)
+
+        self.assertEqual([channel.name for channel in expired], [f"{CLOCK_EMOJI}-tsla-feb-1", f"{CLOCK_EMOJI}-aapl-feb-5"])
+
+    def test_channels_older_than_six_months_still_expire(self):
+        created_at = dt.datetime(2026, 4, 1, 15, 0, tzinfo=dt.timezone.utc)
+        channels = [
+            FakeChannel(f"{CLOCK_EMOJI}-old-apr-10", created_at=created_at),
+            # Posted in December for a January deadline.
+            FakeChannel(f"{CLOCK_EMOJI}-next-jan-5", created_at=dt.datetime(2026, 10, 15, tzinfo=dt.timezone.utc)),
+        ]
+
+        expired = find_expired_post_channels(channels, today=dt.date(2026, 10, 18))
+
+        self.assertEqual([channel.name for channel in expired], [f"{CLOCK_EMOJI}-old-apr-10"])
+
+
+class CleanUpChannelsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_batches_pause_between_them(self):
+        events = []
+
+        async def action(channel):
+            events.append(channel.name)
+
+        async def sleep(seconds):
+            events.append(f"sleep {seconds}")
+
+        channels = [FakeChannel(f"c{index}") for index in range(5)]
+        result = await clean_up_channels(channels, action, batch_size=2, pause_seconds=3, sleep=sleep)
+
+        self.assertEqual(result, (5, 0))
+        self.assertEqual(events, ["c0", "c1", "sleep 3", "c2", "c3", "sleep 3", "c4"])
+
+    async def test_failures_are_counted_and_forbidden_stops(self):
+        async def action(channel):
+            if channel.name == "bad":
+                raise RuntimeError("boom")
+            if channel.name == "forbidden":
+                raise Forbidden()
+
+        async def sleep(_seconds):
+            pass
+
+        channels = [FakeChannel(name) for name in ("ok", "bad", "forbidden", "never")]
+        self.assertEqual(await clean_up_channels(channels, action, batch_size=10, sleep=sleep), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
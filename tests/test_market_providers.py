@@ -0,0 +1,161 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import commands.market_data as market_data
+import commands.market_providers as market_providers
+from commands.market_providers import (
+    FixtureProvider,
+    YFinanceProvider,
+    create_market_data_provider,
+    pd,
+    slice_period,
+)
+
+
+@unittest.skipIf(pd is None, "pandas not installed in test environment")
+class FixtureProviderTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        index = pd.date_range("2025-01-01", periods=40, freq="D", tz="UTC")
+        frame = pd.DataFrame(
+            {
+                "Open": [100.0 + i for i in range(40)],
+                "High": [101.0 + i for i in range(40)],
+                "Low": [99.0 + i for i in range(40)],
+                "Close": [100.5 + i for i in range(40)],
+                "Volume": [1000 + i for i in range(40)],
+            },
+            index=index,
+        )
+        frame.to_csv(os.path.join(self.temp_dir.name, "AAPL_1d.csv"))
+        with open(os.path.join(self.temp_dir.name, "companies.json"), "w", encoding="utf-8") as names_file:
+            json.dump({"aapl": "Apple Inc."}, names_file)
+        self.provider = FixtureProvider(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_ohlc_history_is_sliced_to_period(self):
+        frame = self.provider.get_ohlc_history("aapl", period="5d", interval="1d")
+        self.assertEqual(len(frame), 5)
+        self.assertEqual(float(frame["Close"].iloc[-1]), 139.5)
+
+    def test_snapshot_uses_last_two_sessions(self):
+        os.rename(
+            os.path.join(self.temp_dir.name, "AAPL_1d.csv"),
+            os.path.join(self.temp_dir.name, "AAPL.csv"),
+        )
+        self.assertEqual(self.provider.get_price_snapshot("AAPL"), (139.5, 138.5))
+        self.assertEqual(self.provider.get_latest_price("AAPL"), 139.5)
+
+    def test_unknown_ticker_returns_empty_results(self):
+        self.assertIsNone(self.provider.get_ohlc_history("ZZZZ", period="1mo", interval="1d"))
+        self.assertEqual(self.provider.get_price_snapshot("ZZZZ"), (None, None))
+        self.assertEqual(self.provider.get_company_name("ZZZZ"), (True, None))
+
+    def test_company_names_come_from_fixture_file(self):
+        self.assertEqual(self.provider.get_company_name("AAPL"), (True, "Apple Inc."))
+
+    def test_market_data_uses_configured_provider(self):
+        previous_provider = market_data.get_market_data_provider()
+        try:
+            market_data.configure_market_data_provider("fixture", fixture_dir=self.temp_dir.name)
+            timestamps, prices = market_data.get_price_history("AAPL", period="1mo", interval="1d")
+            self.assertEqual(len(timestamps), len(prices))
+            self.assertEqual(prices[-1], 139.5)
+        finally:
+            market_data.set_market_data_provider(previous_provider)
+
+
+@unittest.skipIf(pd is None, "pandas not installed in test environment")
+class SlicePeriodTests(unittest.TestCase):
+    def test_one_day_keeps_last_session_only(self):
+        index = pd.to_datetime(
+            ["2025-02-14 15:55", "2025-02-17 09:30", "2025-02-17 09:35"]
+        )
+        frame = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=index)
+        self.assertEqual(slice_period(frame, "1d")["Close"].tolist(), [2.0, 3.0])
+
+    def test_month_period_uses_calendar_offset(self):
+        index = pd.date_range("2025-01-01", "2025-04-01", freq="D")
+        frame = pd.DataFrame({"Close": range(len(index))}, index=index)
+        sliced = slice_period(frame, "1mo")
+        self.assertEqual(sliced.index[0], pd.Timestamp("2025-03-02"))
+        self.assertEqual(len(slice_period(frame, "max")), len(frame))
+
+
+def _quote_payload(symbols):
+    return {
+        "quoteResponse": {
+            "result": [
+                {"symbol": symbol, "regularMarketPrice": 2.0, "regularMarketPreviousClose": 1.0}
+                for symbol in symbols.split(",")
+                if symbol != "GONE"
+            ]
+        }
+    }
+
+
+@unittest.skipIf(market_providers.yf is None, "yfinance not installed in test environment")
+class YFinanceBulkQuoteTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("commands.market_providers.YfData")
+        self.addCleanup(patcher.stop)
+        self.data = patcher.start().return_value
+        self.data.get_raw_json.side_effect = lambda _url, params, timeout: _quote_payload(params["symbols"])
+        self.previous_provider = market_data.get_market_data_provider()
+        self.addCleanup(market_data.set_market_data_provider, self.previous_provider)
+        self.addCleanup(market_data.QUOTE_CACHE.clear)
+
+    def test_scan_makes_one_upstream_request(self):
+        from commands.rsa import np, scan_reverse_splits
+
+        if np is None:
+            self.skipTest("numpy not installed in test environment")
+        market_data.set_market_data_provider(YFinanceProvider())
+        market_data.QUOTE_CACHE.clear()
+        rows = [(f"SCAN{index}", "1:10", None) for index in range(40)] + [("GONE", "1:10", None)]
+
+        with patch("commands.market_providers.yf.download") as mock_download:
+            response = scan_reverse_splits(rows)
+
+        self.assertEqual(self.data.get_raw_json.call_count, 1)
+        mock_download.assert_not_called()
+        self.assertIn("Ranked 40 of 41 rows", response)
+
+    def test_large_batches_are_split(self):
+        snapshots = YFinanceProvider().get_price_snapshots([f"T{index}" for index in range(60)])
+
+        self.assertEqual(len(snapshots), 60)
+        self.assertEqual(snapshots["T0"], (2.0, 1.0))
+        self.assertEqual(self.data.get_raw_json.call_count, 2)
+
+    def test_quote_failure_falls_back_to_threaded_download(self):
+        self.data.get_raw_json.side_effect = RuntimeError("401")
+        with (
+            patch("commands.market_providers.yf.download", return_value=pd.DataFrame()) as mock_download,
+            self.assertLogs("commands.market_providers", "WARNING"),
+        ):
+            self.assertEqual(YFinanceProvider().get_price_snapshots(["AAPL"]), {})
+
+        self.assertTrue(mock_download.call_args.kwargs["threads"])
+
+
+class CreateProviderTests(unittest.TestCase):
+    def test_default_is_yfinance(self):
+        self.assertIsInstance(create_market_data_provider(None), YFinanceProvider)
+
+    def test_fixture_requires_directory(self):
+        with self.assertRaises(ValueError):
+            create_market_data_provider("fixture")
+
+    def test_unknown_provider_raises(self):
+        with self.assertRaises(ValueError):
+            create_market_data_provider("bloomberg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import commands.market_data as market_data
+from commands.metadata_cache import CompanyNameCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CompanyNameCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "company_names.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_snapshot_prefills_and_persisted_entries_override(self):
+        snapshot_path = os.path.join(self.temp_dir.name, "snapshot.json")
+        with open(snapshot_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump({"aapl": "Apple", "tsla": "Tesla, Inc."}, snapshot_file)
+
+        clock = FakeClock()
+        writer = CompanyNameCache(path=self.cache_path, clock=clock)
+        writer.set("AAPL", "Apple Inc.")
+
+        cache = CompanyNameCache(path=self.cache_path, clock=clock)
+        cache.load(snapshot_path=snapshot_path)
+        self.assertEqual(cache.get("AAPL"), (True, "Apple Inc."))
+        self.assertEqual(cache.get("TSLA"), (True, "Tesla, Inc."))
+
+    def test_negative_entries_use_short_ttl(self):
+        clock = FakeClock()
+        cache = CompanyNameCache(ttl_days=7, negative_ttl_seconds=60, clock=clock)
+        cache.set("ZZZZ", None)
+        cache.set("AAPL", "Apple Inc.")
+
+        self.assertEqual(cache.get("ZZZZ"), (True, None))
+        clock.now += 61
+        self.assertEqual(cache.get("ZZZZ"), (False, None))
+        self.assertEqual(cache.get("AAPL"), (True, "Apple Inc."))
+
+    def test_concurrent_saves_leave_a_complete_file(self):
+        cache = CompanyNameCache(path=self.cache_path)
+        futures = [
+            cache.refresh_in_background(f"T{index}", lambda ticker: (True, f"{ticker} Corp"))
+            for index in range(20)
+        ]
+        for future in futures:
+            future.result(timeout=5)
+
+        with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+            self.assertEqual(len(json.load(cache_file)), 20)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["company_names.json"])
+
+    def test_failed_lookup_is_not_cached(self):
+        cache = CompanyNameCache()
+        cache.refresh_in_background("AAPL", lambda _ticker: (False, None)).result(timeout=5)
+        self.assertEqual(cache.get("AAPL"), (False, None))
+
+
+class GetCompanyNameTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = CompanyNameCache()
+        patcher = patch("commands.market_data.COMPANY_NAME_CACHE", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss_returns_ticker_and_loads_in_background(self):
+        with patch.object(
+            market_data.get_market_data_provider(),
+            "get_company_name",
+            return_value=(True, "Apple Inc."),
+        ) as mock_fetch:
+            self.assertEqual(market_data.get_company_name("aapl"), "AAPL")
+            self.cache._executor.shutdown(wait=True)
+
+        mock_fetch.assert_called_once_with("AAPL")
+        self.assertEqual(market_data.get_company_name("AAPL"), "Apple Inc.")
+
+    def test_cached_unknown_ticker_falls_back_to_ticker(self):
+        self.cache.set("ZZZZ", None)
+        self.assertEqual(market_data.get_company_name("zzzz"), "ZZZZ")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import commands.metrics as metrics
+
+
+class MetricTypesTests(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = metrics.Histogram("test_seconds", "Test latency.", ("command",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "price")
+
+        lines = histogram.render()
+        self.assertIn("# TYPE test_seconds histogram", lines)
+        self.assertIn('test_seconds_bucket{command="price",le="0.1"} 2', lines)
+        self.assertIn('test_seconds_bucket{command="price",le="1.0"} 3', lines)
+        self.assertIn('test_seconds_bucket{command="price",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_count{command="price"} 4', lines)
+        self.assertIn('test_seconds_sum{command="price"} 3.65', lines)
+
+    def test_counter_is_exposed_with_total_suffix(self):
+        counter = metrics.Counter("test_timeouts", "Timeouts.", ("command",))
+        counter.inc("chart")
+        counter.inc("chart")
+        self.assertIn('test_timeouts_total{command="chart"} 2.0', counter.render())
+
+    def test_wrong_label_count_raises(self):
+        counter = metrics.Counter("test_errors", "Errors.", ("command", "kind"))
+        with self.assertRaises(ValueError):
+            counter.inc("chart")
+
+    def test_label_values_are_escaped(self):
+        gauge = metrics.Gauge("test_gauge", "Gauge.", ("name",))
+        gauge.set(1, 'a"b')
+        self.assertIn('test_gauge{name="a\\"b"} 1.0', gauge.render())
+
+
+class RegistryTests(unittest.TestCase):
+    def test_render_runs_collectors_and_ends_with_eof(self):
+        registry = metrics.MetricsRegistry()
+        gauge = registry.register(metrics.Gauge("test_value", "Value."))
+        registry.add_collector(lambda: gauge.set(7))
+
+        text = registry.render()
+        self.assertIn("test_value 7.0", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_set_cache_stats_reports_hit_ratio(self):
+        metrics.set_cache_stats("test", {"hits": 3, "misses": 1, "coalesced": 0, "size": 5})
+        self.assertEqual(metrics.CACHE_HIT_RATIO.value("test"), 0.75)
+        self.assertEqual(metrics.CACHE_ENTRIES.value("test"), 5.0)
+
+
+@unittest.skipIf(metrics.web is None, "aiohttp not installed in test environment")
+class MetricsServerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_serves_openmetrics_text(self):
+        import aiohttp
+
+        registry = metrics.MetricsRegistry()
+        registry.register(metrics.Gauge("test_up", "Up.")).set(1)
+        server = metrics.MetricsServer("127.0.0.1", 0, registry=registry)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                    body = await response.text()
+                    content_type = response.headers["Content-Type"]
+        finally:
+            await server.stop()
+
+        self.assertTrue(content_type.startswith("application/openmetrics-text"))
+        self.assertIn("test_up 1.0", body)
+
+
+if __name__ == "__main__":
+    unittest.main()
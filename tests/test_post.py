@@ -8,6 +8,8 @@ from commands.post import (
     format_buy_date_short,
     has_post_permission,
     parse_last_day_to_buy,
+    parse_post_channel_name,
+    parse_split_ratio,
 )
 
 
@@ -66,6 +68,48 @@ class PostCommandHelperTests(unittest.TestCase):
         self.assertTrue(has_post_permission(member, 12345))
         self.assertFalse(has_post_permission(member, 333))
 
+    def test_parse_post_channel_name_round_trips(self):
+        today = dt.date(2026, 2, 1)
+        channel_name = build_post_channel_name("AAPL", dt.date(2026, 2, 12))
+        self.assertEqual(parse_post_channel_name(channel_name, today), ("AAPL", dt.date(2026, 2, 12)))
+
+    def test_parse_post_channel_name_picks_nearest_year(self):
+        self.assertEqual(
+            parse_post_channel_name(f"{CLOCK_EMOJI}-tsla-jan-3", dt.date(2026, 12, 20)),
+            ("TSLA", dt.date(2027, 1, 3)),
+        )
+        self.assertEqual(
+            parse_post_channel_name(f"{CLOCK_EMOJI}-tsla-dec-30", dt.date(2027, 1, 2)),
+            ("TSLA", dt.date(2026, 12, 30)),
+        )
+
+    def test_parse_post_channel_name_rejects_other_channels(self):
+        self.assertIsNone(parse_post_channel_name("general"))
+        self.assertIsNone(parse_post_channel_name(f"{CLOCK_EMOJI}-aapl-foo-12"))
+        self.assertIsNone(parse_post_channel_name(f"{CLOCK_EMOJI}-aapl-feb-31"))
+
+    def test_parse_post_channel_name_without_a_fitting_year_returns_none(self):
+        channel_name = f"{CLOCK_EMOJI}-aapl-feb-29"
+        self.assertIsNone(parse_post_channel_name(channel_name, created_on=dt.date(2025, 3, 10)))
+        self.assertEqual(
+            parse_post_channel_name(channel_name, created_on=dt.date(2028, 3, 1)),
+            ("AAPL", dt.date(2028, 2, 29)),
+        )
+
+
+
+class ParseSplitRatioTests(unittest.TestCase):
+    def test_small_to_big_ratios_are_accepted(self):
+        self.assertEqual(parse_split_ratio("1:10"), 10.0)
+        self.assertEqual(parse_split_ratio(" 2 : 25 "), 12.5)
+
+    def test_ratios_post_used_to_accept_are_rejected(self):
+        for split_ratio in ("10:1", "1:1", "abc", "1-10", "0:10", "-1:10"):
+            with self.subTest(split_ratio=split_ratio), self.assertRaises(ValueError):
+                parse_split_ratio(split_ratio)
+        with self.assertRaises(ZeroDivisionError):
+            parse_split_ratio("1:0")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+import datetime as dt
+import unittest
+from unittest.mock import patch
+
+from commands.post import CLOCK_EMOJI
+from commands.prewarm import (
+    MIN_QUOTE_REFRESH_SECONDS,
+    collect_prewarm_tickers,
+    prewarm_quotes,
+    quote_refresh_interval,
+)
+
+
+class FakeRegistry:
+    def __init__(self, due):
+        self.due = due
+        self.calls = []
+
+    def tickers_due(self, from_date, to_date):
+        self.calls.append((from_date, to_date))
+        return self.due
+
+
+class CollectPrewarmTickersTests(unittest.TestCase):
+    def setUp(self):
+        self.today = dt.date(2026, 2, 10)
+
+    def test_merges_registry_and_channel_names_soonest_first(self):
+        registry = FakeRegistry([("AAPL", dt.date(2026, 2, 12))])
+        channel_names = [
+            f"{CLOCK_EMOJI}-tsla-feb-10",
+            f"{CLOCK_EMOJI}-aapl-feb-11",
+            f"{CLOCK_EMOJI}-past-feb-9",
+            f"{CLOCK_EMOJI}-far-mar-20",
+            "general",
+        ]
+
+        tickers = collect_prewarm_tickers(registry, channel_names, self.today, days_ahead=3)
+
+        self.assertEqual(tickers, ["TSLA", "AAPL"])
+        self.assertEqual(registry.calls, [(self.today, dt.date(2026, 2, 13))])
+
+    def test_caps_ticker_count(self):
+        channel_names = [f"{CLOCK_EMOJI}-t{index}-feb-11" for index in range(5)]
+        self.assertEqual(len(collect_prewarm_tickers(None, channel_names, self.today, max_tickers=2)), 2)
+
+
+class PrewarmQuotesTests(unittest.TestCase):
+    @patch("commands.prewarm.get_company_name")
+    @patch("commands.prewarm.get_price_snapshots", return_value={"AAPL": (1.0, 1.0)})
+    def test_one_bulk_fetch_then_company_names(self, mock_snapshots, mock_company_name):
+        self.assertEqual(prewarm_quotes(["AAPL", "TSLA"]), 1)
+
+        mock_snapshots.assert_called_once_with(["AAPL", "TSLA"], cancel_token=None, refresh=True)
+        self.assertEqual([call.args[0] for call in mock_company_name.call_args_list], ["AAPL", "TSLA"])
+
+
+    def test_quotes_are_refreshed_within_the_quote_ttl(self):
+        self.assertEqual(quote_refresh_interval(15.0), 12.0)
+        self.assertLess(quote_refresh_interval(60.0), 60.0)
+        self.assertEqual(quote_refresh_interval(1.0), MIN_QUOTE_REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import patch
+
+from commands.price import MAX_PRICE_TICKERS, get_stock_price, get_stock_prices
+
+
+class StockPriceTests(unittest.TestCase):
+    @patch("commands.price.get_price_snapshot", return_value=(110.0, 100.0))
+    def test_single_price_includes_daily_change(self, _mock_snapshot):
+        response = get_stock_price("aapl")
+        self.assertIn("**Price for AAPL**", response)
+        self.assertIn("Last Price: $110.00", response)
+        self.assertIn("Daily Change: +$10.00 (+10.00%)", response)
+
+    @patch("commands.price.get_price_snapshots")
+    def test_multiple_prices_share_one_message(self, mock_snapshots):
+        mock_snapshots.return_value = {"AAPL": (110.0, 100.0), "TSLA": (90.0, None)}
+        response = get_stock_prices(["aapl", "TSLA", "zzzz", "AAPL"])
+
+        mock_snapshots.assert_called_once_with(["AAPL", "TSLA", "ZZZZ"], cancel_token=None)
+        self.assertIn("**Prices**", response)
+        self.assertIn("- AAPL: $110.00 +$10.00 (+10.00%)", response)
+        self.assertIn("- TSLA: $90.00", response)
+        self.assertIn("- ZZZZ: unavailable", response)
+
+    @patch("commands.price.get_price_snapshots")
+    def test_too_many_tickers_returns_error(self, mock_snapshots):
+        tickers = [f"T{index}" for index in range(MAX_PRICE_TICKERS + 1)]
+        response = get_stock_prices(tickers)
+        self.assertIn("**Price Lookup Error**", response)
+        mock_snapshots.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+
+from commands.rate_limit import (
+    DEFAULT_COMMAND_COSTS,
+    FairQueue,
+    RateLimiter,
+    RateLimitExceeded,
+    parse_costs,
+    parse_rate,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ParseTests(unittest.TestCase):
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("6/60", (1, 1)), (6.0, 60.0))
+        self.assertEqual(parse_rate("bad", (1, 1)), (1, 1))
+        self.assertEqual(parse_rate("0/60", (1, 1)), (1, 1))
+        self.assertEqual(parse_rate(None, (1, 1)), (1, 1))
+
+    def test_parse_costs_overrides_defaults(self):
+        costs = parse_costs("chart=5, price=0.5, junk")
+        self.assertEqual(costs["chart"], 5.0)
+        self.assertEqual(costs["price"], 0.5)
+        self.assertEqual(costs["rsa"], DEFAULT_COMMAND_COSTS["rsa"])
+
+
+class RateLimiterTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(
+            user_rate=(6, 60),
+            channel_rate=(100, 60),
+            guild_rate=(100, 60),
+            command_costs={"chart": 3, "price": 1},
+            clock=self.clock,
+        )
+
+    def test_chart_costs_more_than_price(self):
+        self.assertEqual(self.limiter.try_acquire("chart", 1, 10, 100), 0.0)
+        self.assertEqual(self.limiter.try_acquire("chart", 1, 10, 100), 0.0)
+        # 3 tokens at 0.1 tokens/s.
+        self.assertAlmostEqual(self.limiter.try_acquire("chart", 1, 10, 100), 30.0)
+        self.assertAlmostEqual(self.limiter.try_acquire("price", 1, 10, 100), 10.0)
+
+        self.clock.now = 10.0
+        self.assertEqual(self.limiter.try_acquire("price", 1, 10, 100), 0.0)
+
+    def test_users_have_separate_buckets(self):
+        for _ in range(2):
+            self.limiter.try_acquire("chart", 1, 10, 100)
+        self.assertEqual(self.limiter.try_acquire("chart", 2, 10, 100), 0.0)
+
+    def test_refusal_does_not_spend_tokens(self):
+        limiter = RateLimiter(user_rate=(10, 60), channel_rate=(3, 60), guild_rate=(10, 60), clock=self.clock)
+        limiter.try_acquire("chart", 1, 10, 100)
+        self.assertGreater(limiter.try_acquire("chart", 2, 10, 100), 0)
+        # User 2 was refused by the channel bucket, so their own bucket is still full.
+        self.assertEqual(limiter.try_acquire("chart", 2, 11, 100), 0.0)
+
+    def test_free_commands_are_never_limited(self):
+        for _ in range(100):
+            self.assertEqual(self.limiter.try_acquire("help", 1, 10, 100), 0.0)
+
+    def test_direct_messages_skip_guild_bucket(self):
+        limiter = RateLimiter(user_rate=(10, 60), channel_rate=(10, 60), guild_rate=(1, 60), clock=self.clock)
+        self.assertEqual(limiter.try_acquire("chart", 1, 10, None), 0.0)
+        self.assertEqual(limiter.try_acquire("chart", 1, 10, None), 0.0)
+
+
+class FairQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_queued_users_take_turns(self):
+        clock = FakeClock()
+        limiter = RateLimiter(
+            user_rate=(100, 1),
+            channel_rate=(1, 0.05),
+            guild_rate=(100, 1),
+            command_costs={"chart": 1},
+            clock=clock,
+        )
+        queue = FairQueue(limiter, max_per_user=5, max_wait_seconds=5)
+        await queue.acquire("chart", "heavy", 10)
+        order = []
+
+        async def request(user_id):
+            await queue.acquire("chart", user_id, 10)
+            order.append(user_id)
+
+        tasks = [asyncio.create_task(request(user_id)) for user_id in ("heavy", "heavy", "heavy", "light")]
+        await asyncio.sleep(0)
+        for _ in range(40):
+            if all(task.done() for task in tasks):
+                break
+            clock.now += 0.05
+            await asyncio.sleep(0.06)
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(order[:2], ["heavy", "light"])
+        self.assertEqual(queue.queued_count(), 0)
+
+    async def test_per_user_queue_limit_rejects(self):
+        clock = FakeClock()
+        limiter = RateLimiter(user_rate=(1, 3600), command_costs={"chart": 1}, clock=clock)
+        queue = FairQueue(limiter, max_per_user=1, max_wait_seconds=5)
+        await queue.acquire("chart", 1, 10)
+        waiter = asyncio.create_task(queue.acquire("chart", 1, 10))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(RateLimitExceeded) as raised:
+            await queue.acquire("chart", 1, 10)
+        self.assertEqual(raised.exception.reason, "queue full")
+        waiter.cancel()
+
+    async def test_wait_longer_than_limit_is_refused(self):
+        clock = FakeClock()
+        limiter = RateLimiter(user_rate=(1, 3600), command_costs={"chart": 1}, clock=clock)
+        queue = FairQueue(limiter, max_per_user=3, max_wait_seconds=0.05)
+        await queue.acquire("chart", 1, 10)
+        with self.assertRaises(RateLimitExceeded):
+            await queue.acquire("chart", 1, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,16 @@
+import datetime
 import unittest
 from unittest.mock import patch
 
-from commands.rsa import calculate_reverse_split_arbitrage
+from commands.rsa import (
+    calculate_reverse_split_arbitrage,
+    calculate_rsa_grid,
+    np,
+    parse_rsa_options,
+    parse_scan_rows,
+    rsa_scenario_grid,
+    scan_reverse_splits,
+)
 
 
 class ReverseSplitArbitrageTests(unittest.TestCase):
@@ -35,5 +44,83 @@ class ReverseSplitArbitrageTests(unittest.TestCase):
         self.assertIn("Could not retrieve the current price", response)
 
 
+class RsaOptionsTests(unittest.TestCase):
+    def test_no_options_means_no_grid(self):
+        self.assertEqual(parse_rsa_options(()), (None, None))
+
+    def test_grid_options(self):
+        grid, error = parse_rsa_options(("--grid", "--accounts", "3", "--move=5%"))
+        self.assertIsNone(error)
+        self.assertEqual(grid, {"accounts": 3, "move_percent": 5.0})
+
+    def test_invalid_options(self):
+        self.assertIn("Unknown option", parse_rsa_options(("--fast",))[1])
+        self.assertIn("Invalid grid options", parse_rsa_options(("--grid", "--accounts"))[1])
+        self.assertIn("1-10 accounts", parse_rsa_options(("--grid", "--accounts", "50"))[1])
+
+
+@unittest.skipIf(np is None, "numpy not installed in test environment")
+class RsaGridTests(unittest.TestCase):
+    def test_grid_matches_scalar_formulas(self):
+        profits = rsa_scenario_grid(2.0, [10.0, 20.0], [-0.1, 0.0, 0.1], [1, 3])
+
+        self.assertEqual(profits.shape, (2, 2, 3, 2))
+        # Round up: price * ratio * (1 + move) - price.
+        self.assertAlmostEqual(profits[0, 0, 1, 0], 2.0 * (10.0 - 1))
+        self.assertAlmostEqual(profits[0, 1, 2, 0], 2.0 * 20.0 * 1.1 - 2.0)
+        # Cash in lieu: price * move, whatever the ratio.
+        self.assertAlmostEqual(profits[1, 0, 0, 0], -0.2)
+        self.assertAlmostEqual(profits[1, 1, 2, 1], 0.6)
+
+    @patch("commands.rsa.get_latest_price", return_value=2.5)
+    def test_grid_response_uses_one_price_fetch(self, mock_price):
+        response = calculate_rsa_grid("aapl", "1:10,1:20", accounts=2, move_percent=10)
+
+        mock_price.assert_called_once_with("AAPL", cancel_token=None)
+        self.assertIn("**Reverse Split Arbitrage Grid for AAPL**", response)
+        self.assertIn("1:20 up", response)
+        self.assertIn("1:10 cash", response)
+        self.assertIn("$45.00", response)
+
+    @patch("commands.rsa.get_latest_price", return_value=2.5)
+    def test_grid_rejects_bad_ratio_before_fetching(self, mock_price):
+        response = calculate_rsa_grid("AAPL", "1:10,5:1")
+        self.assertIn("Invalid split ratio `5:1`", response)
+        mock_price.assert_not_called()
+
+
+class RsaScanTests(unittest.TestCase):
+    def test_parse_csv_and_pasted_rows(self):
+        rows, error = parse_scan_rows("ticker,ratio,last_day_to_buy\nabc,1:10,2026-02-20\nxyz 1:5 02/20/2026\n\nlone")
+
+        self.assertIsNone(error)
+        self.assertEqual(
+            rows,
+            [
+                ("ABC", "1:10", datetime.date(2026, 2, 20)),
+                ("XYZ", "1:5", datetime.date(2026, 2, 20)),
+            ],
+        )
+
+    def test_parse_rejects_empty_and_oversized_lists(self):
+        self.assertIn("No rows found", parse_scan_rows("")[1])
+        self.assertIn("Too many rows", parse_scan_rows("\n".join(f"T{index} 1:10" for index in range(51)))[1])
+
+    @unittest.skipIf(np is None, "numpy not installed in test environment")
+    @patch("commands.rsa.get_price_snapshots")
+    def test_scan_ranks_by_profit_from_one_batch(self, mock_snapshots):
+        mock_snapshots.return_value = {"LOW": (1.0, 1.0), "HIGH": (3.0, 3.0)}
+        rows = [("LOW", "1:10", None), ("BAD", "10:1", None), ("HIGH", "1:5", None), ("GONE", "1:2", None)]
+
+        response = scan_reverse_splits(rows)
+
+        mock_snapshots.assert_called_once_with(["LOW", "HIGH", "GONE"], cancel_token=None)
+        self.assertLess(response.index("HIGH"), response.index("LOW "))
+        self.assertIn("$12.00", response)
+        self.assertIn("Ranked 2 of 4 rows", response)
+        self.assertIn("BAD (bad ratio 10:1)", response)
+        self.assertIn("GONE (no price)", response)
+
+
 if __name__ == "__main__":
     unittest.main()
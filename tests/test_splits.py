@@ -0,0 +1,77 @@
+import datetime as dt
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from commands.splits import SplitRegistry, get_splits_response
+
+
+class SplitRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "nested", "splits.sqlite3")
+        self.registry = SplitRegistry(self.path)
+        self.today = dt.date(2026, 2, 10)
+
+    def test_upcoming_is_ordered_by_buy_date_and_skips_past(self):
+        self.registry.record(1, "tsla", "1:5", dt.date(2026, 2, 20), channel_id=55)
+        self.registry.record(1, "AAPL", "1:10", dt.date(2026, 2, 12))
+        self.registry.record(1, "OLD", "1:2", dt.date(2026, 1, 5))
+        self.registry.record(2, "OTHER", "1:2", dt.date(2026, 2, 15))
+
+        splits = self.registry.upcoming(1, self.today)
+
+        self.assertEqual([split["ticker"] for split in splits], ["AAPL", "TSLA"])
+        self.assertEqual(splits[1]["buy_date"], dt.date(2026, 2, 20))
+        self.assertEqual(splits[1]["channel_id"], 55)
+
+    def test_reposting_updates_the_existing_row(self):
+        self.registry.record(1, "AAPL", "1:10", dt.date(2026, 2, 12), source_url="https://a", channel_id=1)
+        self.registry.record(1, "aapl", "1:20", dt.date(2026, 2, 12), source_url="https://b")
+
+        splits = self.registry.for_ticker(1, "AAPL")
+        self.assertEqual(len(splits), 1)
+        self.assertEqual(splits[0]["split_ratio"], "1:20")
+        self.assertEqual(splits[0]["channel_id"], 1)
+
+    def test_tickers_due_spans_guilds(self):
+        self.registry.record(1, "AAPL", "1:10", dt.date(2026, 2, 12))
+        self.registry.record(2, "AAPL", "1:10", dt.date(2026, 2, 11))
+        self.registry.record(2, "TSLA", "1:5", dt.date(2026, 2, 10))
+        self.registry.record(1, "LATER", "1:5", dt.date(2026, 3, 1))
+
+        self.assertEqual(
+            self.registry.tickers_due(self.today, dt.date(2026, 2, 13)),
+            [("TSLA", dt.date(2026, 2, 10)), ("AAPL", dt.date(2026, 2, 11))],
+        )
+
+    def test_lookups_use_indexes(self):
+        with sqlite3.connect(self.path) as connection:
+            upcoming_plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM splits WHERE guild_id = 1 AND buy_date >= '2026-01-01' ORDER BY buy_date"
+            ).fetchall()
+            ticker_plan = connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM splits WHERE guild_id = 1 AND ticker = 'AAPL' ORDER BY buy_date DESC"
+            ).fetchall()
+        self.assertIn("splits_guild_date", str(upcoming_plan))
+        self.assertIn("splits_guild_ticker_date", str(ticker_plan))
+
+    def test_splits_response(self):
+        self.registry.record(1, "AAPL", "1:10", dt.date(2026, 2, 12), channel_id=77)
+
+        upcoming = get_splits_response(self.registry, 1, today=self.today)
+        self.assertIn("**Upcoming Reverse Splits**", upcoming)
+        self.assertIn("AAPL 1:10, buy by Feb 12 in <#77>", upcoming)
+
+        history = get_splits_response(self.registry, 1, "aapl", today=self.today)
+        self.assertIn("**Reverse Splits for AAPL**", history)
+        self.assertIn("1:10, buy by Feb 12, 2026", history)
+
+        self.assertIn("No upcoming splits", get_splits_response(self.registry, 2, today=self.today))
+        self.assertIn("Usage", get_splits_response(self.registry, 1, "not a ticker!", today=self.today))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import commands.tracing as tracing
+from commands.executors import BoundedExecutor
+from commands.metrics import COMMAND_PHASE_DURATION
+
+
+class TracingTests(unittest.TestCase):
+    def tearDown(self):
+        tracing.finish_trace()
+        tracing.configure_tracing(
+            slow_command_seconds=tracing.DEFAULT_SLOW_COMMAND_SECONDS,
+            log_invocations=True,
+        )
+
+    def test_span_without_trace_is_noop(self):
+        with tracing.span("market_data.get_latest_price"):
+            pass
+        self.assertIsNone(tracing.current_trace())
+        self.assertIsNone(tracing.finish_trace())
+
+    def test_spans_are_summed_by_name(self):
+        trace = tracing.start_trace("price")
+        with patch("commands.tracing.time.perf_counter", side_effect=[1.0, 1.5, 2.0, 2.25]):
+            for _ in range(2):
+                with tracing.span("market_data.get_price_snapshot"):
+                    pass
+        self.assertEqual(trace.span_totals(), {"market_data.get_price_snapshot": 0.75})
+
+    def test_spans_cross_executor_thread_hop(self):
+        executor = BoundedExecutor("trace-test", max_workers=1, max_queue=0)
+        self.addCleanup(executor.shutdown)
+
+        @tracing.span("worker.job")
+        def job():
+            return tracing.current_trace()
+
+        trace = tracing.start_trace("chart")
+        self.assertIs(executor.submit(job).result(timeout=5), trace)
+        self.assertIn("worker.job", trace.span_totals())
+
+    def test_phase_spans_feed_phase_histogram(self):
+        before = COMMAND_PHASE_DURATION.count("trace-test", "render")
+        tracing.start_trace("trace-test")
+        with tracing.span("chart.render", phase="render"):
+            pass
+        self.assertEqual(COMMAND_PHASE_DURATION.count("trace-test", "render"), before + 1)
+
+    def test_finish_trace_logs_json_record(self):
+        tracing.start_trace("rsa", guild_id=1)
+        tracing.set_trace_status("timeout")
+        with self.assertLogs("splitbot.trace", level="INFO") as logs:
+            trace = tracing.finish_trace()
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["command"], "rsa")
+        self.assertEqual(record["status"], "timeout")
+        self.assertEqual(record["guild_id"], 1)
+        self.assertIsNotNone(trace.duration_seconds)
+        self.assertIsNone(tracing.current_trace())
+
+    def test_slow_command_warning_only_above_threshold(self):
+        tracing.configure_tracing(slow_command_seconds=0.0, log_invocations=False)
+        tracing.start_trace("chart")
+        with tracing.span("chart.render"):
+            pass
+        with self.assertLogs("splitbot.trace", level="WARNING") as logs:
+            tracing.finish_trace()
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Slow command !chart", logs.records[0].getMessage())
+        self.assertIn("chart.render=", logs.records[0].getMessage())
+
+        tracing.configure_tracing(slow_command_seconds=3600)
+        tracing.start_trace("chart")
+        with self.assertNoLogs("splitbot.trace", level="WARNING"):
+            tracing.finish_trace()
+
+
+if __name__ == "__main__":
+    unittest.main()
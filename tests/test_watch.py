@@ -0,0 +1,196 @@
+import asyncio
+import contextvars
+import unittest
+from unittest.mock import AsyncMock
+
+from commands.watch import (
+    MAX_EDITS_PER_CHANNEL_PER_TICK,
+    WatchLimitExceeded,
+    WatchManager,
+    parse_watch_tickers,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMessage:
+    def __init__(self, error=None):
+        self.contents = []
+        self.error = error
+
+    async def edit(self, content):
+        if self.error is not None:
+            raise self.error
+        self.contents.append(content)
+
+
+class NotFound(Exception):
+    status = 404
+
+
+class ServerError(Exception):
+    status = 500
+
+
+TRACE = contextvars.ContextVar("trace", default=None)
+
+
+class ParseWatchTickersTests(unittest.TestCase):
+    def test_dedupes_and_uppercases(self):
+        self.assertEqual(parse_watch_tickers(["aapl", "AAPL", " tsla "]), (["AAPL", "TSLA"], None))
+
+    def test_rejects_empty_and_too_many(self):
+        self.assertIn("at least one", parse_watch_tickers([])[1])
+        self.assertIn("Too many", parse_watch_tickers([f"T{index}" for index in range(11)])[1])
+
+
+class WatchManagerTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.prices = {"AAPL": (110.0, 100.0), "TSLA": (200.0, 210.0)}
+        self.fetch = AsyncMock(side_effect=lambda tickers: {ticker: self.prices[ticker] for ticker in tickers})
+        self.manager = WatchManager(
+            self.fetch,
+            interval_seconds=5,
+            duration_seconds=600,
+            max_per_guild=3,
+            clock=self.clock,
+        )
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+
+    def _start(self, channel_id, user_id, tickers, guild_id=1):
+        watch = self.manager.add(guild_id, channel_id, user_id, tickers)
+        message = FakeMessage()
+        self.manager.attach(watch, message, self.manager.render(watch))
+        return watch, message
+
+    async def test_one_batch_fetch_for_all_watchers(self):
+        self._start(10, 1, ["AAPL"])
+        self._start(10, 2, ["AAPL", "TSLA"])
+        self._start(20, 3, ["TSLA"])
+
+        await self.manager.tick()
+
+        self.fetch.assert_awaited_once_with(["AAPL", "TSLA"])
+
+    async def test_unchanged_content_is_not_edited(self):
+        _watch, message = self._start(10, 1, ["AAPL"])
+        await self.manager.tick()
+        self.assertEqual(len(message.contents), 1)
+        self.assertIn("AAPL: $110.00 +$10.00 (+10.00%)", message.contents[0])
+
+        await self.manager.tick()
+        self.assertEqual(len(message.contents), 1)
+
+        self.prices["AAPL"] = (111.0, 100.0)
+        await self.manager.tick()
+        self.assertEqual(len(message.contents), 2)
+
+    async def test_channel_edits_are_capped_and_deferred(self):
+        self.manager.max_per_guild = 10
+        messages = [self._start(10, user_id, ["AAPL"])[1] for user_id in range(MAX_EDITS_PER_CHANNEL_PER_TICK + 2)]
+
+        await self.manager.tick()
+        edited = [message for message in messages if message.contents]
+        self.assertEqual(len(edited), MAX_EDITS_PER_CHANNEL_PER_TICK)
+
+        self.clock.now += 5
+        await self.manager.tick()
+        self.assertTrue(all(message.contents for message in messages))
+
+    async def test_guild_cap(self):
+        for user_id in range(3):
+            self._start(10, user_id, ["AAPL"])
+        with self.assertRaises(WatchLimitExceeded):
+            self.manager.add(1, 10, 99, ["AAPL"])
+        # Other guilds are unaffected.
+        self.manager.add(2, 30, 99, ["AAPL"])
+
+    async def test_direct_message_cap(self):
+        self.manager.max_direct = 2
+        for user_id in range(2):
+            self._start(100 + user_id, user_id, ["AAPL"], guild_id=None)
+        with self.assertRaises(WatchLimitExceeded):
+            self.manager.add(None, 199, 99, ["AAPL"])
+        # A user restarting their own DM watch replaces it instead of hitting the cap.
+        self.manager.add(None, 100, 0, ["TSLA"])
+        # Guild watches are counted separately.
+        self.manager.add(1, 10, 99, ["AAPL"])
+
+    async def test_new_watch_replaces_users_previous_watch(self):
+        first, _message = self._start(10, 1, ["AAPL"])
+        self._start(10, 1, ["TSLA"])
+
+        self.assertLessEqual(first.expires_at, self.clock.now)
+        self.assertEqual(self.manager.active_count(1), 1)
+
+    async def test_expired_watch_gets_final_edit_and_is_removed(self):
+        _watch, message = self._start(10, 1, ["AAPL"])
+        self.clock.now += 601
+
+        await self.manager.tick()
+
+        self.assertIn("Watch ended: AAPL", message.contents[-1])
+        self.assertEqual(self.manager.watched_tickers(), [])
+
+    async def test_unwatch_ends_watch_on_next_tick(self):
+        _watch, message = self._start(10, 1, ["AAPL"])
+        self.assertEqual(self.manager.stop(10, 1), 1)
+        self.assertEqual(self.manager.stop(10, 1), 0)
+
+        await self.manager.tick()
+        self.assertIn("Watch ended", message.contents[-1])
+
+    async def test_deleted_message_drops_watch(self):
+        watch = self.manager.add(1, 10, 1, ["AAPL"])
+        self.manager.attach(watch, FakeMessage(error=NotFound()), "old")
+
+        await self.manager.tick()
+        self.assertEqual(self.manager.active_count(), 0)
+
+    async def test_ended_watch_is_dropped_when_final_edit_fails(self):
+        watch = self.manager.add(1, 10, 1, ["AAPL"])
+        self.manager.attach(watch, FakeMessage(error=ServerError()), "old")
+        self.clock.now += 601
+
+        await self.manager.tick()
+        self.assertEqual(self.manager.active_count(), 0)
+
+    async def test_poller_does_not_inherit_command_context(self):
+        seen = []
+        fetched = asyncio.Event()
+
+        async def fetch(tickers):
+            seen.append(TRACE.get())
+            fetched.set()
+            return {ticker: self.prices[ticker] for ticker in tickers}
+
+        self.manager.fetch_snapshots = fetch
+        self.manager.interval_seconds = 0.01
+        TRACE.set("command-trace")
+        self._start(10, 1, ["AAPL"])
+        await asyncio.wait_for(fetched.wait(), timeout=5)
+
+        self.assertIsNone(seen[0])
+
+    async def test_fetch_failure_keeps_previous_prices(self):
+        watch, message = self._start(10, 1, ["AAPL"])
+        await self.manager.tick()
+        self.fetch.side_effect = RuntimeError("offline")
+
+        await self.manager.tick()
+
+        self.assertEqual(watch.snapshots, {"AAPL": (110.0, 100.0)})
+        self.assertEqual(len(message.contents), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()